@@ -0,0 +1,457 @@
+from django.conf import settings
+from django.db.models import Count, FloatField, IntegerField, Sum
+from django.db.models.expressions import RawSQL
+from apps.responses.models import SurveyResponse
+from apps.invitations.models import SurveyInvitation
+from app_selectors import score_sql
+from app_selectors.fact_selectors import FactSelectors
+from services.score_service import ScoreService
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+GENERO_MAP = {'M': 'Masculino', 'F': 'Feminino', 'O': 'Outro', 'N': 'Não informado'}
+FAIXAS_ORDEM = ['18-24', '25-34', '35-49', '50-59', '60+']
+
+
+def _cor_por_percentual(pct_critico):
+    return 'vermelho' if pct_critico > 50 else 'laranja' if pct_critico > 25 else 'amarelo'
+
+
+def _medias_por_dimensao(somas, contagem):
+    """Converte somas acumuladas por dimensão em médias arredondadas."""
+    return {
+        dimensao: round(somas[dimensao] / contagem, 2) if contagem else 0.0
+        for dimensao in ScoreService.DIMENSOES.keys()
+    }
+
+
+class _Agrupamento:
+    """
+    Agrupa as respostas por uma chave (setor, gênero, ...) preservando a
+    ordem de primeira ocorrência e soma scores/críticos de forma vetorizada.
+    """
+
+    def __init__(self):
+        self._indices = {}
+        self._linhas = []
+        self._resultado = {}
+
+    def __contains__(self, chave):
+        return chave in self._indices
+
+    def __getitem__(self, chave):
+        return self._resultado[chave]
+
+    def adicionar(self, chave):
+        indice = self._indices.setdefault(chave, len(self._indices))
+        self._linhas.append(indice)
+
+    def consolidar(self, celulas):
+        total_grupos = len(self._indices)
+        linhas = np.asarray(self._linhas, dtype=np.intp)
+        respostas = np.bincount(linhas, weights=celulas.respostas, minlength=total_grupos)
+        criticos = np.bincount(linhas, weights=celulas.criticos, minlength=total_grupos)
+        somas = np.zeros((total_grupos, celulas.somas.shape[1]), dtype=np.float64)
+        np.add.at(somas, linhas, celulas.somas)
+
+        dimensoes = list(ScoreService.DIMENSOES.keys())
+        for chave, indice in self._indices.items():
+            self._resultado[chave] = _Grupo(
+                respostas=int(respostas[indice]),
+                somas=dict(zip(dimensoes, somas[indice].tolist())),
+                criticos=int(criticos[indice]),
+            )
+
+    def items(self):
+        return self._resultado.items()
+
+    def values(self):
+        return self._resultado.values()
+
+    def keys(self):
+        return self._resultado.keys()
+
+
+class _Grupo:
+    """Totais consolidados de um grupo de respostas."""
+
+    __slots__ = ('respostas', 'somas', 'avaliacoes', 'criticos')
+
+    def __init__(self, respostas, somas, criticos):
+        self.respostas = respostas
+        self.somas = somas
+        self.avaliacoes = respostas * len(ScoreService.DIMENSOES)
+        self.criticos = criticos
+
+
+class CampaignAggregate:
+    """
+    Resultado agregado de uma campanha, calculado em uma única passada
+    sobre as respostas. Expõe os mesmos formatos retornados pelos
+    seletores do dashboard e pelo RiskService.
+    """
+
+    def __init__(self, total_convidados, total_respondidos, dimensoes_scores,
+                 distribuicao, igrp, setores, generos, faixas, grupos):
+        self.total_convidados = total_convidados
+        self.total_respondidos = total_respondidos
+        self.dimensoes_scores = dimensoes_scores
+        self.distribuicao = distribuicao
+        self.igrp = igrp
+        self._setores = setores
+        self._generos = generos
+        self._faixas = faixas
+        self._grupos = grupos
+
+    @property
+    def metrics(self):
+        adesao = (
+            round((self.total_respondidos / self.total_convidados * 100), 2)
+            if self.total_convidados > 0 else 0
+        )
+        return {
+            'total_convidados': self.total_convidados,
+            'total_respondidos': self.total_respondidos,
+            'adesao': adesao
+        }
+
+    def top_setores_criticos(self, limit=5):
+        top_setores = []
+        for setor, data in self._setores.items():
+            pct_critico = (data.criticos / data.avaliacoes * 100) if data.avaliacoes > 0 else 0
+            top_setores.append({
+                'setor': setor,
+                'nivel_risco': round(pct_critico, 1),
+                'cor': _cor_por_percentual(pct_critico)
+            })
+
+        top_setores.sort(key=lambda x: x['nivel_risco'], reverse=True)
+        return top_setores[:limit]
+
+    @property
+    def demografico_genero(self):
+        return {
+            'labels': list(self._generos.keys()),
+            'values': [data.respostas for data in self._generos.values()]
+        }
+
+    @property
+    def demografico_faixa_etaria(self):
+        labels = [f for f in FAIXAS_ORDEM if f in self._faixas]
+        values = [self._faixas[f].respostas for f in labels]
+        return {'labels': labels, 'values': values}
+
+    @property
+    def heatmap_data(self):
+        heatmap_data = []
+        for setor, data in self._setores.items():
+            medias = _medias_por_dimensao(data.somas, data.respostas)
+            heatmap_data.append({'setor': setor, 'scores': list(medias.values())})
+
+        heatmap_data.sort(key=lambda x: sum(x['scores']), reverse=False)
+        return heatmap_data[:10]
+
+    @property
+    def scores_por_genero(self):
+        return {
+            genero: _medias_por_dimensao(data.somas, data.respostas)
+            for genero, data in self._generos.items()
+        }
+
+    @property
+    def scores_por_faixa_etaria(self):
+        return {
+            faixa: _medias_por_dimensao(data.somas, data.respostas)
+            for faixa, data in self._faixas.items()
+        }
+
+    def top_grupos_demograficos_criticos(self, limit=3):
+        top_grupos = []
+        for grupo, data in self._grupos.items():
+            if data.avaliacoes > 0:
+                pct_critico = (data.criticos / data.avaliacoes * 100)
+                top_grupos.append({
+                    'grupo': grupo,
+                    'nivel_risco': round(pct_critico, 1),
+                    'total_respostas': data.avaliacoes // len(ScoreService.DIMENSOES),
+                    'cor': _cor_por_percentual(pct_critico)
+                })
+
+        top_grupos.sort(key=lambda x: x['nivel_risco'], reverse=True)
+        return top_grupos[:limit]
+
+
+class _Celulas:
+    """
+    Totais por célula (setor × gênero × faixa etária), a menor granularidade
+    de que os widgets do dashboard precisam. Cada backend de agregação
+    produz células; a consolidação em CampaignAggregate é comum aos dois.
+    """
+
+    def __init__(self, chaves, respostas, somas, distribuicao, soma_niveis):
+        self.chaves = chaves                # [(setor_nome, genero_codigo, faixa)]
+        self.respostas = respostas          # [M] respostas por célula
+        self.somas = somas                  # [M, 7] soma dos scores por dimensão
+        self.distribuicao = distribuicao    # [M, 4] crítico, importante, moderado, aceitável
+        self.soma_niveis = soma_niveis      # [M] soma dos níveis NR
+
+    def juntar(self, outras):
+        """Células de duas fontes; chaves repetidas são somadas na consolidação."""
+        return _Celulas(
+            chaves=self.chaves + outras.chaves,
+            respostas=np.concatenate([self.respostas, outras.respostas]),
+            somas=np.concatenate([self.somas, outras.somas]),
+            distribuicao=np.concatenate([self.distribuicao, outras.distribuicao]),
+            soma_niveis=np.concatenate([self.soma_niveis, outras.soma_niveis]),
+        )
+
+    @property
+    def criticos(self):
+        return self.distribuicao[:, 0]
+
+
+class CampaignAggregator:
+    """
+    Motor de agregação do dashboard.
+
+    Produz, com uma única consulta, todos os indicadores dos widgets do
+    dashboard. Há dois backends equivalentes, escolhidos pelo setting
+    DASHBOARD_AGGREGATION_BACKEND (ou pelo argumento `backend`):
+
+    - 'postgres': o banco agrega os scores materializados das respostas
+      (app_selectors.score_sql) e só as linhas agregadas por setor × gênero
+      × faixa etária trafegam; as poucas respostas ainda sem score
+      materializado são calculadas pelo kernel Python;
+    - 'python': lê as respostas uma vez (values_list + iterator) e calcula os
+      scores com o kernel vetorizado do ScoreService;
+    - 'compare': executa os dois, registra divergências no log e retorna o
+      resultado do caminho Python.
+
+    Nos modos 'postgres' e 'python', se os fatos pré-agregados da campanha
+    estão em dia (FactSelectors.is_fresh), as células são lidas de
+    FactScoreDimensao em vez das respostas.
+    """
+
+    CHUNK_SIZE = 2000
+    BACKENDS = ('postgres', 'python', 'compare')
+
+    def __init__(self, campaign, filters=None, backend=None):
+        self.campaign = campaign
+        self.filters = filters or {}
+        self.backend = backend or getattr(settings, 'DASHBOARD_AGGREGATION_BACKEND', 'postgres')
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Backend de agregação inválido: {self.backend}")
+
+    def _filter(self, queryset):
+        if self.filters.get('unidade_id'):
+            queryset = queryset.filter(unidade_id=self.filters['unidade_id'])
+
+        if self.filters.get('setor_id'):
+            queryset = queryset.filter(setor_id=self.filters['setor_id'])
+
+        return queryset
+
+    def _responses(self):
+        return self._filter(SurveyResponse.objects.filter(campaign=self.campaign))
+
+    def run(self):
+        total_convidados = self._filter(
+            SurveyInvitation.objects.filter(campaign=self.campaign)
+        ).count()
+
+        if self.backend != 'compare' and FactSelectors.is_fresh(self.campaign):
+            return self._consolidar(total_convidados, self._celulas_fatos())
+
+        if self.backend == 'python':
+            return self._consolidar(total_convidados, self._celulas_python())
+
+        resultado = self._consolidar(total_convidados, self._celulas_postgres())
+
+        if self.backend == 'compare':
+            referencia = self._consolidar(total_convidados, self._celulas_python())
+            self._comparar(resultado, referencia)
+            return referencia
+
+        return resultado
+
+    def _celulas_python(self, responses=None):
+        if responses is None:
+            responses = self._responses()
+        rows = responses.values_list('setor__nome', 'genero', 'faixa_etaria', 'respostas')
+
+        chaves = []
+        blocos = []
+        respostas_bloco = []
+
+        for setor_nome, genero, faixa, respostas in rows.iterator(chunk_size=self.CHUNK_SIZE):
+            chaves.append((setor_nome, genero, faixa))
+            respostas_bloco.append(respostas)
+            if len(respostas_bloco) >= self.CHUNK_SIZE:
+                blocos.append(ScoreService.pack_respostas(respostas_bloco))
+                respostas_bloco = []
+
+        blocos.append(ScoreService.pack_respostas(respostas_bloco))
+        matriz = np.concatenate(blocos)
+
+        # Scores e níveis NR de todas as respostas em operações vetorizadas
+        scores = ScoreService.score_matrix(matriz)
+        niveis = ScoreService.nivel_matrix(scores)
+
+        distribuicao = np.stack([
+            (niveis >= 13).sum(axis=1),
+            ((niveis >= 9) & (niveis < 13)).sum(axis=1),
+            ((niveis >= 5) & (niveis < 9)).sum(axis=1),
+            (niveis < 5).sum(axis=1),
+        ], axis=1)
+
+        return _Celulas(
+            chaves=chaves,
+            respostas=np.ones(len(chaves), dtype=np.int64),
+            somas=scores,
+            distribuicao=distribuicao,
+            soma_niveis=niveis.sum(axis=1, dtype=np.int64),
+        )
+
+    def _celulas_postgres(self):
+        dimensoes = list(ScoreService.DIMENSOES.keys())
+        anotacoes = {
+            f'soma_{dimensao}': Sum(RawSQL(score_sql.score_sql(dimensao), (), output_field=FloatField()))
+            for dimensao in dimensoes
+        }
+        anotacoes.update({
+            'critico': Sum(RawSQL(score_sql.contagem_niveis_sql(minimo=13), (), output_field=IntegerField())),
+            'importante': Sum(RawSQL(score_sql.contagem_niveis_sql(minimo=9, maximo=12), (), output_field=IntegerField())),
+            'moderado': Sum(RawSQL(score_sql.contagem_niveis_sql(minimo=5, maximo=8), (), output_field=IntegerField())),
+            'aceitavel': Sum(RawSQL(score_sql.contagem_niveis_sql(maximo=4), (), output_field=IntegerField())),
+            'soma_niveis': Sum(RawSQL(score_sql.soma_niveis_sql(), (), output_field=IntegerField())),
+        })
+
+        linhas = list(
+            self._responses()
+            .filter(igrp_individual__isnull=False)
+            .values('setor__nome', 'genero', 'faixa_etaria')
+            .annotate(total=Count('id'), **anotacoes)
+            .order_by('setor__nome', 'genero', 'faixa_etaria')
+        )
+
+        celulas = _Celulas(
+            chaves=[(l['setor__nome'], l['genero'], l['faixa_etaria']) for l in linhas],
+            respostas=np.array([l['total'] for l in linhas], dtype=np.int64),
+            somas=np.array(
+                [[l[f'soma_{d}'] for d in dimensoes] for l in linhas], dtype=np.float64
+            ).reshape(len(linhas), len(dimensoes)),
+            distribuicao=np.array(
+                [[l['critico'], l['importante'], l['moderado'], l['aceitavel']] for l in linhas],
+                dtype=np.int64
+            ).reshape(len(linhas), 4),
+            soma_niveis=np.array([l['soma_niveis'] for l in linhas], dtype=np.int64),
+        )
+
+        pendentes = self._responses().filter(igrp_individual__isnull=True)
+        if pendentes.exists():
+            celulas = celulas.juntar(self._celulas_python(pendentes))
+        return celulas
+
+    def _celulas_fatos(self):
+        dimensoes = {dimensao: j for j, dimensao in enumerate(ScoreService.DIMENSOES.keys())}
+        linhas = FactSelectors.get_totais_por_celula(self.campaign, self.filters)
+
+        indices = {}
+        for linha in linhas:
+            indices.setdefault((linha['setor_nome'], linha['genero'], linha['faixa_etaria']), len(indices))
+
+        respostas = np.zeros(len(indices), dtype=np.int64)
+        somas = np.zeros((len(indices), len(dimensoes)), dtype=np.float64)
+        distribuicao = np.zeros((len(indices), 4), dtype=np.int64)
+        soma_niveis = np.zeros(len(indices), dtype=np.int64)
+
+        for linha in linhas:
+            indice = indices[(linha['setor_nome'], linha['genero'], linha['faixa_etaria'])]
+            # Cada dimensão repete a contagem de respostas da célula
+            respostas[indice] = linha['respostas']
+            somas[indice, dimensoes[linha['dimensao']]] = linha['soma_score']
+            distribuicao[indice] += [
+                linha['qtd_critico'], linha['qtd_importante'],
+                linha['qtd_moderado'], linha['qtd_aceitavel'],
+            ]
+            soma_niveis[indice] += linha['soma_nivel_risco']
+
+        return _Celulas(
+            chaves=list(indices.keys()),
+            respostas=respostas,
+            somas=somas,
+            distribuicao=distribuicao,
+            soma_niveis=soma_niveis,
+        )
+
+    def _consolidar(self, total_convidados, celulas):
+        setores = _Agrupamento()
+        generos = _Agrupamento()
+        faixas = _Agrupamento()
+        grupos = _Agrupamento()
+
+        for setor_nome, genero_codigo, faixa in celulas.chaves:
+            genero = GENERO_MAP.get(genero_codigo, 'Não informado')
+            setores.adicionar(setor_nome)
+            generos.adicionar(genero)
+            faixas.adicionar(faixa)
+            grupos.adicionar(f"{genero} ({faixa})")
+
+        for agrupamento in (setores, generos, faixas, grupos):
+            agrupamento.consolidar(celulas)
+
+        dimensoes = list(ScoreService.DIMENSOES.keys())
+        total_respondidos = int(celulas.respostas.sum())
+        somas_gerais = dict(zip(dimensoes, celulas.somas.sum(axis=0).tolist()))
+
+        critico, importante, moderado, aceitavel = (
+            int(v) for v in celulas.distribuicao.sum(axis=0)
+        )
+        distribuicao = {
+            'critico': critico,
+            'importante': importante,
+            'moderado': moderado,
+            'aceitavel': aceitavel,
+        }
+        total = sum(distribuicao.values())
+        distribuicao['total'] = total
+        distribuicao['percentual_alto'] = (
+            round((critico + importante) / total * 100, 2) if total > 0 else 0
+        )
+
+        igrp = round(int(celulas.soma_niveis.sum()) / total, 2) if total > 0 else 0.0
+
+        return CampaignAggregate(
+            total_convidados=total_convidados,
+            total_respondidos=total_respondidos,
+            dimensoes_scores=_medias_por_dimensao(somas_gerais, total_respondidos),
+            distribuicao=distribuicao,
+            igrp=igrp,
+            setores=setores,
+            generos=generos,
+            faixas=faixas,
+            grupos=grupos,
+        )
+
+    def _comparar(self, resultado, referencia):
+        divergencias = [
+            nome for nome, obter in (
+                ('metrics', lambda a: a.metrics),
+                ('dimensoes_scores', lambda a: a.dimensoes_scores),
+                ('distribuicao', lambda a: a.distribuicao),
+                ('igrp', lambda a: a.igrp),
+                ('heatmap_data', lambda a: sorted(a.heatmap_data, key=lambda x: x['setor'])),
+                ('scores_por_genero', lambda a: a.scores_por_genero),
+                ('scores_por_faixa_etaria', lambda a: a.scores_por_faixa_etaria),
+                ('demografico_faixa_etaria', lambda a: a.demografico_faixa_etaria),
+            )
+            if obter(resultado) != obter(referencia)
+        ]
+        if divergencias:
+            logger.warning(
+                f"Agregação da campanha {self.campaign.pk} divergiu entre postgres e python "
+                f"(filtros={self.filters}): {', '.join(divergencias)}"
+            )
@@ -1,9 +1,12 @@
 from django.db.models import Count, Avg
 from apps.responses.models import SurveyResponse
 from apps.invitations.models import SurveyInvitation
+from app_selectors.campaign_aggregator import CampaignAggregator
+from app_selectors.fact_selectors import FactSelectors
+from services.result_cache_service import cache_por_campanha
 from services.score_service import ScoreService
-from services.risk_service import RiskService
 from collections import defaultdict
+import numpy as np
 
 
 class ComparisonSelectors:
@@ -59,6 +62,7 @@ class ComparisonSelectors:
         }
 
     @staticmethod
+    @cache_por_campanha('comparison.metrics')
     def _get_campaign_metrics(campaign):
         """
         Calcula métricas de uma campanha específica.
@@ -70,11 +74,10 @@ class ComparisonSelectors:
         # Taxa de adesão
         adesao = round((total_respostas / total_convidados * 100), 2) if total_convidados > 0 else 0
 
-        # IGRP
-        igrp = RiskService.calcular_igrp(campaign)
-
-        # Distribuição de riscos
-        distribuicao = RiskService.get_distribuicao_riscos(campaign)
+        # IGRP e distribuição de riscos em uma única passada
+        aggregate = CampaignAggregator(campaign).run()
+        igrp = aggregate.igrp
+        distribuicao = aggregate.distribuicao
 
         # Percentual de risco alto/crítico (importante + crítico)
         total_avaliacoes = sum(distribuicao.values())
@@ -140,23 +143,21 @@ class ComparisonSelectors:
         return result
 
     @staticmethod
+    @cache_por_campanha('comparison.dimensoes')
     def _get_dimensoes_scores(campaign):
         """
         Calcula scores médios por dimensão para uma campanha.
         """
-        responses = SurveyResponse.objects.filter(campaign=campaign)
-
-        dimensoes_data = {dim: [] for dim in ScoreService.DIMENSOES.keys()}
+        if FactSelectors.is_fresh(campaign):
+            return FactSelectors.get_dimensoes_scores(campaign)
 
-        for response in responses:
-            for dimensao in ScoreService.DIMENSOES.keys():
-                score = ScoreService.calcular_score_dimensao(response.respostas, dimensao)
-                dimensoes_data[dimensao].append(score)
+        respostas = SurveyResponse.objects.filter(campaign=campaign).values_list('respostas', flat=True)
+        scores = ScoreService.score_matrix(respostas.iterator(chunk_size=2000))
 
         result = {}
-        for dimensao, scores in dimensoes_data.items():
-            if scores:
-                result[dimensao] = round(sum(scores) / len(scores), 2)
+        for j, dimensao in enumerate(ScoreService.DIMENSOES.keys()):
+            if scores.shape[0]:
+                result[dimensao] = round(float(scores[:, j].sum()) / scores.shape[0], 2)
             else:
                 result[dimensao] = 0.0
 
@@ -203,6 +204,7 @@ class ComparisonSelectors:
         }
 
     @staticmethod
+    @cache_por_campanha('comparison.igrp_setores')
     def _get_igrp_by_sector(campaign):
         """
         Calcula IGRP por setor para uma campanha.
@@ -210,29 +212,33 @@ class ComparisonSelectors:
         Returns:
             dict {setor_id: {'nome': str, 'igrp': float}}
         """
-        responses = SurveyResponse.objects.filter(campaign=campaign).select_related('setor')
-
-        setor_scores = defaultdict(list)
-        setor_nomes = {}
+        if FactSelectors.is_fresh(campaign):
+            return FactSelectors.get_igrp_by_sector(campaign)
 
-        for response in responses:
-            setor_id = response.setor.id
-            setor_nomes[setor_id] = response.setor.nome
+        rows = list(
+            SurveyResponse.objects.filter(campaign=campaign)
+            .values_list('setor_id', 'setor__nome', 'respostas')
+            .iterator(chunk_size=2000)
+        )
 
-            # Calcular scores de todas as dimensões
-            scores = ScoreService.processar_resposta_completa(response.respostas)
+        setor_nomes = {}
+        for setor_id, setor_nome, _ in rows:
+            setor_nomes.setdefault(setor_id, setor_nome)
 
-            # Adicionar todos os níveis de risco
-            for dimensao, data in scores.items():
-                setor_scores[setor_id].append(data['nivel'])
+        # Níveis de risco de todas as respostas em uma operação vetorizada
+        scores = ScoreService.score_matrix(respostas for _, _, respostas in rows)
+        niveis_por_resposta = ScoreService.nivel_matrix(scores).sum(axis=1, dtype=np.int64)
+        setor_ids = np.array([setor_id for setor_id, _, _ in rows], dtype=np.int64)
 
         # Calcular IGRP médio por setor
         result = {}
-        for setor_id, niveis in setor_scores.items():
-            igrp = round(sum(niveis) / len(niveis), 2) if niveis else 0
+        for setor_id, setor_nome in setor_nomes.items():
+            mascara = setor_ids == setor_id
+            total_niveis = int(niveis_por_resposta[mascara].sum())
+            total_dimensoes = int(mascara.sum()) * len(ScoreService.DIMENSOES)
             result[setor_id] = {
-                'nome': setor_nomes[setor_id],
-                'igrp': igrp
+                'nome': setor_nome,
+                'igrp': round(total_niveis / total_dimensoes, 2)
             }
 
         return result
@@ -1,8 +1,8 @@
-from django.db.models import Count, Avg
-from apps.responses.models import SurveyResponse
 from apps.invitations.models import SurveyInvitation
-from services.score_service import ScoreService
-from collections import defaultdict
+from apps.responses.models import SurveyResponse
+from app_selectors.campaign_aggregator import CampaignAggregator
+from app_selectors.fact_selectors import FactSelectors
+from services.result_cache_service import cache_por_campanha
 
 
 class DashboardSelectors:
@@ -28,17 +28,30 @@ class DashboardSelectors:
             queryset = queryset.filter(setor_id=filters['setor_id'])
 
         return queryset
-    @staticmethod
-    def get_campaign_metrics(campaign, filters=None):
-        invitations_qs = SurveyInvitation.objects.filter(campaign=campaign)
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-
-        invitations_qs = DashboardSelectors._apply_filters(invitations_qs, filters)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
 
-        total_convidados = invitations_qs.count()
-        total_respondidos = responses_qs.count()
+    @staticmethod
+    @cache_por_campanha('dashboard.aggregate')
+    def get_campaign_aggregate(campaign, filters=None):
+        """
+        Calcula, em uma única leitura das respostas, todos os indicadores
+        exibidos no dashboard. Os seletores abaixo são atalhos sobre ele;
+        views que precisam de vários indicadores devem usar este método
+        diretamente e compartilhar o resultado.
+        """
+        return CampaignAggregator(campaign, filters).run()
 
+    @staticmethod
+    @cache_por_campanha('dashboard.metrics')
+    def get_campaign_metrics(campaign, filters=None):
+        if FactSelectors.is_fresh(campaign, incluir_convites=True):
+            return FactSelectors.get_campaign_metrics(campaign, filters)
+
+        total_convidados = DashboardSelectors._apply_filters(
+            SurveyInvitation.objects.filter(campaign=campaign), filters
+        ).count()
+        total_respondidos = DashboardSelectors._apply_filters(
+            SurveyResponse.objects.filter(campaign=campaign), filters
+        ).count()
         adesao = round((total_respondidos / total_convidados * 100), 2) if total_convidados > 0 else 0
 
         return {
@@ -49,175 +62,37 @@ class DashboardSelectors:
 
     @staticmethod
     def get_dimensoes_scores(campaign, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        dimensoes_data = {dim: [] for dim in ScoreService.DIMENSOES.keys()}
-
-        for response in responses:
-            for dimensao in ScoreService.DIMENSOES.keys():
-                score = ScoreService.calcular_score_dimensao(response.respostas, dimensao)
-                dimensoes_data[dimensao].append(score)
-
-        result = {}
-        for dimensao, scores in dimensoes_data.items():
-            if scores:
-                result[dimensao] = round(sum(scores) / len(scores), 2)
-            else:
-                result[dimensao] = 0.0
-
-        return result
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).dimensoes_scores
 
     @staticmethod
     def get_top_setores_criticos(campaign, limit=5, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign).select_related('setor')
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        setor_riscos = defaultdict(lambda: {'total': 0, 'criticos': 0})
-
-        for response in responses:
-            setor_nome = response.setor.nome
-            scores = ScoreService.processar_resposta_completa(response.respostas)
-
-            for dimensao, data in scores.items():
-                setor_riscos[setor_nome]['total'] += 1
-                if data['nivel'] >= 13:
-                    setor_riscos[setor_nome]['criticos'] += 1
-
-        top_setores = []
-        for setor, data in setor_riscos.items():
-            pct_critico = (data['criticos'] / data['total'] * 100) if data['total'] > 0 else 0
-            top_setores.append({
-                'setor': setor,
-                'nivel_risco': round(pct_critico, 1),
-                'cor': 'vermelho' if pct_critico > 50 else 'laranja' if pct_critico > 25 else 'amarelo'
-            })
-
-        top_setores.sort(key=lambda x: x['nivel_risco'], reverse=True)
-        return top_setores[:limit]
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).top_setores_criticos(limit)
 
     @staticmethod
     def get_demografico_genero(campaign, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-        genero_map = {'M': 'Masculino', 'F': 'Feminino', 'O': 'Outro', 'N': 'Não informado'}
-
-        genero_count = defaultdict(int)
-        for response in responses:
-            genero = genero_map.get(response.genero, 'Não informado')
-            genero_count[genero] += 1
-
-        labels = list(genero_count.keys())
-        values = list(genero_count.values())
-
-        return {'labels': labels, 'values': values}
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).demografico_genero
 
     @staticmethod
     def get_demografico_faixa_etaria(campaign, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        faixa_count = defaultdict(int)
-        for response in responses:
-            faixa_count[response.faixa_etaria] += 1
-
-        faixas_ordem = ['18-24', '25-34', '35-49', '50-59', '60+']
-        labels = [f for f in faixas_ordem if f in faixa_count]
-        values = [faixa_count[f] for f in labels]
-
-        return {'labels': labels, 'values': values}
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).demografico_faixa_etaria
 
     @staticmethod
     def get_heatmap_data(campaign, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign).select_related('setor')
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        setor_dimensoes = defaultdict(lambda: defaultdict(list))
-
-        for response in responses:
-            setor_nome = response.setor.nome
-            for dimensao in ScoreService.DIMENSOES.keys():
-                score = ScoreService.calcular_score_dimensao(response.respostas, dimensao)
-                setor_dimensoes[setor_nome][dimensao].append(score)
-
-        heatmap_data = []
-        for setor, dimensoes_scores in setor_dimensoes.items():
-            scores = []
-            for dimensao in ScoreService.DIMENSOES.keys():
-                if dimensoes_scores[dimensao]:
-                    avg_score = round(sum(dimensoes_scores[dimensao]) / len(dimensoes_scores[dimensao]), 2)
-                else:
-                    avg_score = 0.0
-                scores.append(avg_score)
-
-            heatmap_data.append({'setor': setor, 'scores': scores})
-
-        heatmap_data.sort(key=lambda x: sum(x['scores']), reverse=False)
-        return heatmap_data[:10]
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).heatmap_data
 
     @staticmethod
     def get_scores_por_genero(campaign, filters=None):
         """
         Retorna dict com {genero: {dimensao: score_medio}}
         """
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-        genero_map = {'M': 'Masculino', 'F': 'Feminino', 'O': 'Outro', 'N': 'Não informado'}
-
-        genero_dimensoes = defaultdict(lambda: defaultdict(list))
-
-        for response in responses:
-            genero = genero_map.get(response.genero, 'Não informado')
-            for dimensao in ScoreService.DIMENSOES.keys():
-                score = ScoreService.calcular_score_dimensao(response.respostas, dimensao)
-                genero_dimensoes[genero][dimensao].append(score)
-
-        result = {}
-        for genero, dimensoes_scores in genero_dimensoes.items():
-            result[genero] = {}
-            for dimensao in ScoreService.DIMENSOES.keys():
-                if dimensoes_scores[dimensao]:
-                    avg_score = round(sum(dimensoes_scores[dimensao]) / len(dimensoes_scores[dimensao]), 2)
-                else:
-                    avg_score = 0.0
-                result[genero][dimensao] = avg_score
-
-        return result
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).scores_por_genero
 
     @staticmethod
     def get_scores_por_faixa_etaria(campaign, filters=None):
         """
         Retorna dict com {faixa: {dimensao: score_medio}}
         """
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        faixa_dimensoes = defaultdict(lambda: defaultdict(list))
-
-        for response in responses:
-            faixa = response.faixa_etaria
-            for dimensao in ScoreService.DIMENSOES.keys():
-                score = ScoreService.calcular_score_dimensao(response.respostas, dimensao)
-                faixa_dimensoes[faixa][dimensao].append(score)
-
-        result = {}
-        for faixa, dimensoes_scores in faixa_dimensoes.items():
-            result[faixa] = {}
-            for dimensao in ScoreService.DIMENSOES.keys():
-                if dimensoes_scores[dimensao]:
-                    avg_score = round(sum(dimensoes_scores[dimensao]) / len(dimensoes_scores[dimensao]), 2)
-                else:
-                    avg_score = 0.0
-                result[faixa][dimensao] = avg_score
-
-        return result
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).scores_por_faixa_etaria
 
     @staticmethod
     def get_top_grupos_demograficos_criticos(campaign, limit=3, filters=None):
@@ -225,35 +100,4 @@ class DashboardSelectors:
         Retorna TOP N grupos demográficos com maior percentual de respostas em risco crítico.
         Grupos incluem combinações de gênero e faixa etária.
         """
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = DashboardSelectors._apply_filters(responses_qs, filters)
-        responses = responses_qs
-        genero_map = {'M': 'Masculino', 'F': 'Feminino', 'O': 'Outro', 'N': 'Não informado'}
-
-        grupos_riscos = defaultdict(lambda: {'total': 0, 'criticos': 0})
-
-        for response in responses:
-            genero = genero_map.get(response.genero, 'Não informado')
-            faixa = response.faixa_etaria
-            grupo = f"{genero} ({faixa})"
-
-            scores = ScoreService.processar_resposta_completa(response.respostas)
-
-            for dimensao, data in scores.items():
-                grupos_riscos[grupo]['total'] += 1
-                if data['nivel'] >= 13:
-                    grupos_riscos[grupo]['criticos'] += 1
-
-        top_grupos = []
-        for grupo, data in grupos_riscos.items():
-            if data['total'] > 0:
-                pct_critico = (data['criticos'] / data['total'] * 100)
-                top_grupos.append({
-                    'grupo': grupo,
-                    'nivel_risco': round(pct_critico, 1),
-                    'total_respostas': data['total'] // len(ScoreService.DIMENSOES),
-                    'cor': 'vermelho' if pct_critico > 50 else 'laranja' if pct_critico > 25 else 'amarelo'
-                })
-
-        top_grupos.sort(key=lambda x: x['nivel_risco'], reverse=True)
-        return top_grupos[:limit]
+        return DashboardSelectors.get_campaign_aggregate(campaign, filters).top_grupos_demograficos_criticos(limit)
@@ -0,0 +1,241 @@
+from django.db.models import Max, Sum
+from apps.analytics.models import (
+    CampaignAnalyticsState, FactIndicadorCampanha, FactRespostaPergunta, FactScoreDimensao
+)
+from apps.invitations.models import SurveyInvitation
+from apps.responses.models import SurveyResponse
+from services.score_service import ScoreService
+
+
+class FactSelectors:
+    """
+    Leituras sobre FactScoreDimensao, pré-agregado no grão
+    tempo × estrutura × demografia × dimensão por rebuild_analytics.
+
+    As somas (soma_score, soma_nivel_risco, qtd_*) são aditivas, então
+    qualquer recorte é obtido com GROUP BY sobre poucas linhas.
+    """
+
+    @staticmethod
+    def is_fresh(campaign, incluir_convites=False):
+        """
+        True se os fatos cobrem todas as respostas da campanha: houve rebuild,
+        nenhuma resposta aguarda carga (analytics_carregada) e o total somado
+        nos fatos confere com o número real de respostas (cobre remoções).
+        Com incluir_convites, exige também que nenhum convite tenha sido
+        criado depois (necessário para a adesão de FactIndicadorCampanha).
+        """
+        state = CampaignAnalyticsState.objects.filter(campaign=campaign).first()
+        if state is None or state.rebuilt_at is None:
+            return False
+
+        respostas = SurveyResponse.objects.filter(campaign=campaign)
+        if respostas.filter(analytics_carregada=False).exists():
+            return False
+
+        if respostas.count() != state.total_respostas:
+            return False
+
+        if incluir_convites:
+            return not SurveyInvitation.objects.filter(
+                campaign=campaign, id__gt=state.last_invitation_id
+            ).exists()
+
+        return True
+
+    @staticmethod
+    def _facts(campaign, filters=None, model=FactScoreDimensao):
+        queryset = model.objects.filter(campaign=campaign)
+        filters = filters or {}
+
+        if filters.get('unidade_id'):
+            queryset = queryset.filter(dim_estrutura__unidade_id=filters['unidade_id'])
+
+        if filters.get('setor_id'):
+            queryset = queryset.filter(dim_estrutura__setor_id=filters['setor_id'])
+
+        return queryset
+
+    @staticmethod
+    def get_totais_por_celula(campaign, filters=None):
+        """
+        Totais por setor × gênero × faixa etária × dimensão.
+
+        Returns:
+            list de dicts com setor_nome, genero, faixa_etaria, dimensao,
+            respostas, soma_score, soma_nivel_risco e qtd_* (crítico,
+            importante, moderado, aceitável)
+        """
+        linhas = (
+            FactSelectors._facts(campaign, filters)
+            .values(
+                'dim_estrutura__setor_nome', 'dim_demografia__genero',
+                'dim_demografia__faixa_etaria', 'dim_hse__codigo'
+            )
+            .annotate(
+                respostas=Sum('total_respostas'),
+                soma=Sum('soma_score'),
+                soma_niveis=Sum('soma_nivel_risco'),
+                critico=Sum('qtd_critico'),
+                importante=Sum('qtd_importante'),
+                moderado=Sum('qtd_moderado'),
+                aceitavel=Sum('qtd_aceitavel'),
+            )
+            .order_by('dim_estrutura__setor_nome', 'dim_demografia__genero', 'dim_demografia__faixa_etaria')
+        )
+
+        return [
+            {
+                'setor_nome': linha['dim_estrutura__setor_nome'],
+                'genero': linha['dim_demografia__genero'],
+                'faixa_etaria': linha['dim_demografia__faixa_etaria'],
+                'dimensao': linha['dim_hse__codigo'],
+                'respostas': linha['respostas'],
+                'soma_score': float(linha['soma']),
+                'soma_nivel_risco': linha['soma_niveis'],
+                'qtd_critico': linha['critico'],
+                'qtd_importante': linha['importante'],
+                'qtd_moderado': linha['moderado'],
+                'qtd_aceitavel': linha['aceitavel'],
+            }
+            for linha in linhas
+        ]
+
+    @staticmethod
+    def get_dimensoes_scores(campaign, filters=None):
+        """Score médio por dimensão: soma dos scores / número de respostas."""
+        linhas = (
+            FactSelectors._facts(campaign, filters)
+            .values('dim_hse__codigo')
+            .annotate(respostas=Sum('total_respostas'), soma=Sum('soma_score'))
+        )
+        totais = {linha['dim_hse__codigo']: linha for linha in linhas}
+
+        result = {}
+        for dimensao in ScoreService.DIMENSOES.keys():
+            linha = totais.get(dimensao)
+            if linha and linha['respostas']:
+                result[dimensao] = round(float(linha['soma']) / linha['respostas'], 2)
+            else:
+                result[dimensao] = 0.0
+        return result
+
+    @staticmethod
+    def get_igrp_by_sector(campaign):
+        """
+        IGRP por setor: soma dos níveis NR / número de avaliações
+        (respostas × dimensões, que é a soma de total_respostas nas 7 linhas).
+
+        Returns:
+            dict {setor_id: {'nome': str, 'igrp': float}}
+        """
+        linhas = (
+            FactSelectors._facts(campaign)
+            .values('dim_estrutura__setor_id')
+            .annotate(
+                nome=Max('dim_estrutura__setor_nome'),
+                avaliacoes=Sum('total_respostas'),
+                soma_niveis=Sum('soma_nivel_risco'),
+            )
+            .order_by('dim_estrutura__setor_id')
+        )
+
+        return {
+            linha['dim_estrutura__setor_id']: {
+                'nome': linha['nome'],
+                'igrp': round(linha['soma_niveis'] / linha['avaliacoes'], 2)
+            }
+            for linha in linhas
+            if linha['avaliacoes']
+        }
+
+    @staticmethod
+    def get_indicadores(campaign, filters=None):
+        """
+        Soma os indicadores por estrutura (FactIndicadorCampanha) do recorte.
+
+        Returns:
+            dict com total_convidados, total_respondidos, critico,
+            importante, moderado, aceitavel e soma_niveis
+        """
+        totais = FactSelectors._facts(campaign, filters, FactIndicadorCampanha).aggregate(
+            total_convidados=Sum('total_convidados'),
+            total_respondidos=Sum('total_respondidos'),
+            critico=Sum('total_risco_critico'),
+            importante=Sum('total_risco_importante'),
+            moderado=Sum('total_risco_moderado'),
+            aceitavel=Sum('total_risco_aceitavel'),
+            soma_niveis=Sum('soma_nivel_risco'),
+        )
+        return {chave: valor or 0 for chave, valor in totais.items()}
+
+    @staticmethod
+    def get_campaign_metrics(campaign, filters=None):
+        """Mesmo formato de DashboardSelectors.get_campaign_metrics."""
+        indicadores = FactSelectors.get_indicadores(campaign, filters)
+        total_convidados = indicadores['total_convidados']
+        total_respondidos = indicadores['total_respondidos']
+        adesao = round((total_respondidos / total_convidados * 100), 2) if total_convidados > 0 else 0
+
+        return {
+            'total_convidados': total_convidados,
+            'total_respondidos': total_respondidos,
+            'adesao': adesao
+        }
+
+    @staticmethod
+    def get_distribuicao_riscos(campaign, filters=None):
+        """Mesmo formato de RiskService.get_distribuicao_riscos."""
+        indicadores = FactSelectors.get_indicadores(campaign, filters)
+        distribuicao = {
+            chave: indicadores[chave]
+            for chave in ('critico', 'importante', 'moderado', 'aceitavel')
+        }
+        total = sum(distribuicao.values())
+        distribuicao['total'] = total
+        distribuicao['percentual_alto'] = (
+            round((distribuicao['critico'] + distribuicao['importante']) / total * 100, 2)
+            if total > 0 else 0
+        )
+        return distribuicao
+
+    @staticmethod
+    def get_igrp(campaign, filters=None):
+        """IGRP: soma dos níveis NR / número de avaliações (respostas × dimensões)."""
+        indicadores = FactSelectors.get_indicadores(campaign, filters)
+        avaliacoes = sum(
+            indicadores[chave] for chave in ('critico', 'importante', 'moderado', 'aceitavel')
+        )
+        return round(indicadores['soma_niveis'] / avaliacoes, 2) if avaliacoes > 0 else 0.0
+
+    @staticmethod
+    def get_distribuicao_perguntas(campaign, filters=None):
+        """
+        Drill-down por item: histograma das respostas 0–4 de cada pergunta.
+
+        Returns:
+            list de dicts ordenada por número da pergunta, com numero,
+            texto, dimensao, valores [qtd_0..qtd_4], total_respostas e media
+        """
+        linhas = (
+            FactSelectors._facts(campaign, filters, FactRespostaPergunta)
+            .values('pergunta__numero', 'pergunta__texto', 'pergunta__dimensao__nome')
+            .annotate(**{
+                f'qtd_{valor}': Sum(f'qtd_valor_{valor}') for valor in range(5)
+            })
+            .order_by('pergunta__numero')
+        )
+
+        result = []
+        for linha in linhas:
+            valores = [linha[f'qtd_{valor}'] for valor in range(5)]
+            total = sum(valores)
+            result.append({
+                'numero': linha['pergunta__numero'],
+                'texto': linha['pergunta__texto'],
+                'dimensao': linha['pergunta__dimensao__nome'],
+                'valores': valores,
+                'total_respostas': total,
+                'media': round(sum(v * q for v, q in enumerate(valores)) / total, 2) if total else 0.0,
+            })
+        return result
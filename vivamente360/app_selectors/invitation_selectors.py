@@ -0,0 +1,26 @@
+from apps.invitations.models import SurveyInvitation
+
+
+class InvitationSelectors:
+    """
+    Buscas de convites por e-mail usando o índice cego (email_hash), sem
+    descriptografar email_encrypted. O e-mail é normalizado pelo próprio
+    CryptoService.blind_index (strip + minúsculas).
+    """
+
+    @staticmethod
+    def get_by_email(campaign, email, crypto_service):
+        """Convite da pessoa na campanha (ex.: reenviar o link), ou None."""
+        return SurveyInvitation.objects.filter(
+            campaign=campaign, email_hash=crypto_service.blind_index(email)
+        ).order_by('-created_at').first()
+
+    @staticmethod
+    def get_empresa_invitations_by_emails(empresa, emails, crypto_service):
+        """
+        Convites da empresa (todas as campanhas) para uma lista de e-mails,
+        ex.: aplicar uma lista de supressão.
+        """
+        return SurveyInvitation.objects.filter(
+            empresa=empresa, email_hash__in=crypto_service.blind_index_many(emails)
+        )
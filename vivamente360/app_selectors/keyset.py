@@ -0,0 +1,24 @@
+"""
+Leitura de querysets grandes em lotes por chave (id > último id do lote
+anterior), sem OFFSET: cada lote usa o índice da pk, por mais longe que
+esteja, e linhas alteradas pelo chamador entre um lote e outro (ex.: status
+ou email_hash que saem do filtro) não deslocam a paginação.
+"""
+
+
+def lotes_por_id(queryset, tamanho, ultimo_id=0, campos=None):
+    """
+    Gera listas de até `tamanho` objetos de `queryset`, em ordem de id.
+
+    Args:
+        ultimo_id: começa depois deste id (ex.: retomada de uma task)
+        campos: se informado, carrega só esses campos (only)
+    """
+    if campos:
+        queryset = queryset.only(*campos)
+    while True:
+        lote = list(queryset.filter(id__gt=ultimo_id).order_by('id')[:tamanho])
+        if not lote:
+            return
+        yield lote
+        ultimo_id = lote[-1].id
@@ -0,0 +1,44 @@
+"""
+Expressões SQL do dashboard sobre os scores HSE-IT materializados em
+SurveyResponse (score_<dimensao> e nivel_<dimensao>, gravados por
+ScoreService.campos_materializados).
+
+Cada expressão lê apenas colunas da própria linha: o banco não reavalia a
+fórmula sobre o JSON `respostas` (um regex por item, repetido em cada faixa
+de probabilidade). Respostas ainda sem score materializado
+(igrp_individual nulo: task 'response_ingested' na fila ou respostas
+antigas) ficam fora destas expressões; o CampaignAggregator as calcula com
+o kernel do ScoreService.
+"""
+from apps.responses.models import SurveyResponse
+from services.score_service import ScoreService
+
+
+def coluna_sql(campo):
+    return f'"{SurveyResponse._meta.db_table}"."{campo}"'
+
+
+def score_sql(dimensao):
+    return f"({coluna_sql(f'score_{dimensao}')})::float8"
+
+
+def nivel_sql(dimensao):
+    return coluna_sql(f'nivel_{dimensao}')
+
+
+def contagem_niveis_sql(minimo=None, maximo=None):
+    """Número de dimensões da resposta cujo nível NR está em [minimo, maximo]."""
+    termos = []
+    for dimensao in ScoreService.DIMENSOES.keys():
+        nivel = nivel_sql(dimensao)
+        condicoes = []
+        if minimo is not None:
+            condicoes.append(f"{nivel} >= {int(minimo)}")
+        if maximo is not None:
+            condicoes.append(f"{nivel} <= {int(maximo)}")
+        termos.append(f"({' AND '.join(condicoes)})::int")
+    return '(' + ' + '.join(termos) + ')'
+
+
+def soma_niveis_sql():
+    return '(' + ' + '.join(nivel_sql(dimensao) for dimensao in ScoreService.DIMENSOES.keys()) + ')'
@@ -166,7 +166,7 @@ class ExportPlanoAcaoWordView(RHRequiredMixin, View):
         campaign = get_object_or_404(Campaign, id=campaign_id)
 
         # Criar task de processamento
-        task = TaskQueue.objects.create(
+        task = TaskQueue.objects.enqueue(
             task_type='export_plano_acao',
             payload={
                 'campaign_id': campaign_id,
@@ -198,7 +198,7 @@ class ExportPlanoAcaoRichWordView(RHRequiredMixin, View):
         )
 
         # Criar task de processamento
-        task = TaskQueue.objects.create(
+        task = TaskQueue.objects.enqueue(
             task_type='export_plano_acao_rich',
             payload={
                 'plano_id': pk,
@@ -497,7 +497,7 @@ class ChecklistNR1ExportPDFView(RHRequiredMixin, View):
             progresso_geral = (total_concluidos / total_itens * 100) if total_itens > 0 else 0
 
             # Criar task de processamento com payload completo
-            task = TaskQueue.objects.create(
+            task = TaskQueue.objects.enqueue(
                 task_type='export_checklist_nr1',
                 payload={
                     'campaign_id': campaign_id,
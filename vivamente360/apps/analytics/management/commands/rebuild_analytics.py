@@ -8,16 +8,32 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--campaign', type=int, help='ID da campanha específica')
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Processar apenas respostas novas desde o último rebuild'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Número de respostas por lote de bulk_create (padrão: 2000)'
+        )
 
     def handle(self, *args, **options):
         campaign_id = options.get('campaign')
+        incremental = options['incremental']
+        batch_size = options['batch_size']
 
         if campaign_id:
             try:
                 campaign = Campaign.objects.get(pk=campaign_id)
                 self.stdout.write(f'Reconstruindo analytics para {campaign.nome}...')
-                rebuild_campaign_analytics(campaign)
-                self.stdout.write(self.style.SUCCESS(f'Concluído para {campaign.nome}'))
+                resultado = rebuild_campaign_analytics(campaign, incremental, batch_size)
+                self.stdout.write(self.style.SUCCESS(
+                    f"Concluído para {campaign.nome}: {resultado['respostas']} respostas, "
+                    f"{resultado['fatos']} fatos"
+                ))
             except Campaign.DoesNotExist:
                 self.stdout.write(self.style.ERROR(f'Campanha {campaign_id} não encontrada'))
         else:
@@ -26,6 +42,7 @@ class Command(BaseCommand):
 
             for campaign in campaigns:
                 self.stdout.write(f'Processando {campaign.nome}...')
-                rebuild_campaign_analytics(campaign)
+                resultado = rebuild_campaign_analytics(campaign, incremental, batch_size)
+                self.stdout.write(f"  {resultado['respostas']} respostas, {resultado['fatos']} fatos")
 
             self.stdout.write(self.style.SUCCESS('Concluído para todas as campanhas'))
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0003_rename_analytics_s_empresa_idx_analytics_s_empresa_93b4f0_idx_and_more"),
+        ("surveys", "0002_fatores_risco_psicossocial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignAnalyticsState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("last_response_id", models.BigIntegerField(default=0)),
+                ("last_response_created_at", models.DateTimeField(blank=True, null=True)),
+                ("total_respostas", models.IntegerField(default=0)),
+                ("rebuilt_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "campaign",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="analytics_state",
+                        to="surveys.campaign",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Estado Analytics da Campanha",
+                "verbose_name_plural": "Estados Analytics das Campanhas",
+                "db_table": "analytics_campaign_state",
+            },
+        ),
+    ]
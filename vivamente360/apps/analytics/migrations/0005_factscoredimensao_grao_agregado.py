@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+
+def limpar_fatos_por_resposta(apps, schema_editor):
+    """
+    Os fatos antigos (um por resposta × dimensão) não cabem no novo grão.
+    São removidos e a marca d'água zerada, para que o próximo
+    rebuild_analytics (mesmo --incremental) reconstrua tudo.
+    """
+    FactScoreDimensao = apps.get_model('analytics', 'FactScoreDimensao')
+    CampaignAnalyticsState = apps.get_model('analytics', 'CampaignAnalyticsState')
+    FactScoreDimensao.objects.all().delete()
+    CampaignAnalyticsState.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_campaignanalyticsstate"),
+    ]
+
+    operations = [
+        migrations.RunPython(limpar_fatos_por_resposta, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="factscoredimensao",
+            name="soma_score",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name="factscoredimensao",
+            name="soma_nivel_risco",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="factscoredimensao",
+            name="qtd_critico",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="factscoredimensao",
+            name="qtd_importante",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="factscoredimensao",
+            name="qtd_moderado",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="factscoredimensao",
+            name="qtd_aceitavel",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name="factscoredimensao",
+            constraint=models.UniqueConstraint(
+                fields=("campaign", "dim_tempo", "dim_estrutura", "dim_demografia", "dim_hse"),
+                name="unique_fact_score_dimensao_grao",
+            ),
+        ),
+    ]
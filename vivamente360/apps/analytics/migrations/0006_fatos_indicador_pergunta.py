@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0005_factscoredimensao_grao_agregado"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="factindicadorcampanha",
+            name="soma_nivel_risco",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="campaignanalyticsstate",
+            name="last_invitation_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name="factindicadorcampanha",
+            constraint=models.UniqueConstraint(
+                fields=("campaign", "dim_estrutura"),
+                name="unique_fact_indicador_campanha_estrutura",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="factrespostapergunta",
+            constraint=models.UniqueConstraint(
+                fields=("campaign", "dim_estrutura", "pergunta"),
+                name="unique_fact_resposta_pergunta_estrutura",
+            ),
+        ),
+    ]
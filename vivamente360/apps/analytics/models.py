@@ -74,6 +74,13 @@ class DimDimensaoHSE(models.Model):
 
 
 class FactScoreDimensao(TimeStampedModel):
+    """
+    Fato agregado no grão campanha × tempo × estrutura × demografia × dimensão.
+
+    Somas e contagens (soma_score, soma_nivel_risco, qtd_*) são aditivas:
+    médias, IGRP e distribuição de riscos de qualquer recorte são obtidos
+    somando as linhas, sem voltar às respostas.
+    """
     campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE)
     dim_tempo = models.ForeignKey(DimTempo, on_delete=models.CASCADE)
     dim_estrutura = models.ForeignKey(DimEstrutura, on_delete=models.CASCADE)
@@ -89,6 +96,14 @@ class FactScoreDimensao(TimeStampedModel):
 
     total_respostas = models.IntegerField()
 
+    # Medidas aditivas do grão
+    soma_score = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    soma_nivel_risco = models.IntegerField(default=0)
+    qtd_critico = models.IntegerField(default=0)
+    qtd_importante = models.IntegerField(default=0)
+    qtd_moderado = models.IntegerField(default=0)
+    qtd_aceitavel = models.IntegerField(default=0)
+
     class Meta:
         db_table = 'analytics_fact_score_dimensao'
         verbose_name = 'Fato Score Dimensão'
@@ -98,6 +113,12 @@ class FactScoreDimensao(TimeStampedModel):
             models.Index(fields=['campaign', 'dim_hse']),
             models.Index(fields=['campaign', 'classificacao']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['campaign', 'dim_tempo', 'dim_estrutura', 'dim_demografia', 'dim_hse'],
+                name='unique_fact_score_dimensao_grao'
+            )
+        ]
 
     def __str__(self):
         return f"{self.campaign.nome} - {self.dim_hse.nome}"
@@ -120,10 +141,19 @@ class FactIndicadorCampanha(TimeStampedModel):
     percentual_risco_alto = models.DecimalField(max_digits=5, decimal_places=2)
     igrp_score = models.DecimalField(max_digits=4, decimal_places=2)
 
+    # Soma dos níveis NR, para recompor o IGRP exato de vários recortes
+    soma_nivel_risco = models.IntegerField(default=0)
+
     class Meta:
         db_table = 'analytics_fact_indicador_campanha'
         verbose_name = 'Fato Indicador Campanha'
         verbose_name_plural = 'Fatos Indicadores Campanha'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['campaign', 'dim_estrutura'],
+                name='unique_fact_indicador_campanha_estrutura'
+            )
+        ]
 
     def __str__(self):
         return f"{self.campaign.nome} - Indicadores"
@@ -147,11 +177,44 @@ class FactRespostaPergunta(TimeStampedModel):
         db_table = 'analytics_fact_resposta_pergunta'
         verbose_name = 'Fato Resposta Pergunta'
         verbose_name_plural = 'Fatos Respostas Perguntas'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['campaign', 'dim_estrutura', 'pergunta'],
+                name='unique_fact_resposta_pergunta_estrutura'
+            )
+        ]
 
     def __str__(self):
         return f"{self.campaign.nome} - P{self.pergunta.numero}"
 
 
+class CampaignAnalyticsState(models.Model):
+    """
+    Marca d'água do rebuild analítico de uma campanha.
+
+    O rebuild incremental processa apenas respostas ainda não marcadas com
+    analytics_carregada; o rebuild completo substitui todos os fatos.
+    total_respostas é o número de respostas somadas nos fatos e
+    last_response_id o maior id já carregado (informativo).
+    last_invitation_id indica até onde os convites foram contados nos
+    indicadores (adesão).
+    """
+    campaign = models.OneToOneField(Campaign, on_delete=models.CASCADE, related_name='analytics_state')
+    last_response_id = models.BigIntegerField(default=0)
+    last_invitation_id = models.BigIntegerField(default=0)
+    last_response_created_at = models.DateTimeField(null=True, blank=True)
+    total_respostas = models.IntegerField(default=0)
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'analytics_campaign_state'
+        verbose_name = 'Estado Analytics da Campanha'
+        verbose_name_plural = 'Estados Analytics das Campanhas'
+
+    def __str__(self):
+        return f"{self.campaign.nome} - até resposta #{self.last_response_id}"
+
+
 class SectorAnalysis(TimeStampedModel):
     """
     Model para armazenar análises de setor geradas por IA
@@ -4,6 +4,7 @@ from .views import (
     SectorAnalysisView,
     GenerateSectorAnalysisView,
     CheckAnalysisStatusView,
+    QuestionDistributionView,
     SectorAnalysisListView,
     CampaignComparisonView,
     ExportCampaignComparisonView,
@@ -18,6 +19,7 @@ urlpatterns = [
     path('sector-analysis/<int:setor_id>/<int:campaign_id>/', SectorAnalysisView.as_view(), name='sector_analysis'),
     path('sector-analysis/generate/', GenerateSectorAnalysisView.as_view(), name='generate_sector_analysis'),
     path('sector-analysis/status/<int:task_id>/', CheckAnalysisStatusView.as_view(), name='check_analysis_status'),
+    path('question-distribution/<int:campaign_id>/', QuestionDistributionView.as_view(), name='question_distribution'),
     path('campaign-comparison/', CampaignComparisonView.as_view(), name='campaign_comparison'),
     path('campaign-comparison/export/', ExportCampaignComparisonView.as_view(), name='export_campaign_comparison'),
     path('export-pgr/<int:campaign_id>/', ExportRiskMatrixPGRView.as_view(), name='export_pgr'),
@@ -9,7 +9,8 @@ from apps.core.models import TaskQueue
 from app_selectors.campaign_selectors import CampaignSelectors
 from app_selectors.dashboard_selectors import DashboardSelectors
 from app_selectors.comparison_selectors import ComparisonSelectors
-from services.risk_service import RiskService, CLASSIFICACAO_RISCOS
+from app_selectors.fact_selectors import FactSelectors
+from services.risk_service import CLASSIFICACAO_RISCOS
 from services.sector_analysis_service import SectorAnalysisService
 from services.export_service import ExportService
 from apps.structure.models import Unidade, Setor
@@ -112,17 +113,19 @@ class DashboardView(DashboardAccessMixin, TemplateView):
         setores_disponiveis = self.filter_setores_by_permission(setores_disponiveis).order_by('nome')
 
         # Buscar dados com filtros aplicados
-        metrics = DashboardSelectors.get_campaign_metrics(campaign, filters)
-        dimensoes_scores = DashboardSelectors.get_dimensoes_scores(campaign, filters)
-        top_setores = DashboardSelectors.get_top_setores_criticos(campaign, filters=filters)
-        distribuicao = RiskService.get_distribuicao_riscos(campaign, filters)
-        igrp = RiskService.calcular_igrp(campaign, filters)
-        demografico_genero = DashboardSelectors.get_demografico_genero(campaign, filters)
-        demografico_faixa = DashboardSelectors.get_demografico_faixa_etaria(campaign, filters)
-        heatmap_data = DashboardSelectors.get_heatmap_data(campaign, filters)
-        scores_por_genero = DashboardSelectors.get_scores_por_genero(campaign, filters)
-        scores_por_faixa_etaria = DashboardSelectors.get_scores_por_faixa_etaria(campaign, filters)
-        top_grupos_criticos = DashboardSelectors.get_top_grupos_demograficos_criticos(campaign, filters=filters)
+        # Uma única leitura das respostas alimenta todos os widgets
+        aggregate = DashboardSelectors.get_campaign_aggregate(campaign, filters)
+        metrics = aggregate.metrics
+        dimensoes_scores = aggregate.dimensoes_scores
+        top_setores = aggregate.top_setores_criticos()
+        distribuicao = aggregate.distribuicao
+        igrp = aggregate.igrp
+        demografico_genero = aggregate.demografico_genero
+        demografico_faixa = aggregate.demografico_faixa_etaria
+        heatmap_data = aggregate.heatmap_data
+        scores_por_genero = aggregate.scores_por_genero
+        scores_por_faixa_etaria = aggregate.scores_por_faixa_etaria
+        top_grupos_criticos = aggregate.top_grupos_demograficos_criticos()
 
         context.update({
             'campaigns': campaigns,
@@ -330,6 +333,37 @@ class CheckAnalysisStatusView(DashboardAccessMixin, View):
             }, status=404)
 
 
+class QuestionDistributionView(DashboardAccessMixin, View):
+    """Drill-down por pergunta: histograma das respostas 0–4 (lido dos fatos analíticos)"""
+
+    def get(self, request, campaign_id):
+        campaign = get_object_or_404(Campaign, id=campaign_id)
+
+        campaigns = CampaignSelectors.get_user_campaigns(request.user)
+        if campaign not in campaigns:
+            return JsonResponse({'error': 'Você não tem permissão para acessar esta campanha.'}, status=403)
+
+        unidade_id = request.GET.get('unidade')
+        setor_id = request.GET.get('setor')
+
+        # Líderes só veem setores vinculados ao perfil, nunca o agregado da empresa
+        if hasattr(request.user, 'profile') and request.user.profile.role == 'lideranca':
+            if not setor_id or not self.get_setores_permitidos().filter(id=setor_id).exists():
+                return JsonResponse({'error': 'Selecione um setor permitido.'}, status=403)
+
+        filters = {}
+        if unidade_id:
+            filters['unidade_id'] = unidade_id
+        if setor_id:
+            filters['setor_id'] = setor_id
+
+        return JsonResponse({
+            'campaign_id': campaign.id,
+            'atualizado': FactSelectors.is_fresh(campaign),
+            'perguntas': FactSelectors.get_distribuicao_perguntas(campaign, filters),
+        })
+
+
 class SectorAnalysisListView(DashboardAccessMixin, TemplateView):
     """
     View para listar análises de setores
@@ -498,7 +532,7 @@ class ExportCampaignComparisonView(DashboardAccessMixin, TemplateView):
 
         try:
             # Criar task de processamento
-            task = TaskQueue.objects.create(
+            task = TaskQueue.objects.enqueue(
                 task_type='export_campaign_comparison',
                 payload={
                     'campaign1_id': int(campaign1_id),
@@ -656,7 +690,7 @@ class ExportRiskMatrixExcelView(DashboardAccessMixin, TemplateView):
 
         try:
             # Criar task de processamento
-            task = TaskQueue.objects.create(
+            task = TaskQueue.objects.enqueue(
                 task_type='export_risk_matrix_excel',
                 payload={
                     'campaign_id': campaign_id,
@@ -694,7 +728,7 @@ class ExportRiskMatrixPGRView(DashboardAccessMixin, TemplateView):
 
         try:
             # Criar task de processamento
-            task = TaskQueue.objects.create(
+            task = TaskQueue.objects.enqueue(
                 task_type='export_pgr_document',
                 payload={
                     'campaign_id': campaign_id,
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark do CryptoService: encrypt/decrypt escalar vs em lote vs
+em lote com pool de processos.
+
+Uso:
+    python manage.py benchmark_crypto
+    python manage.py benchmark_crypto --count 100000 --workers 4
+"""
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from services.crypto_service import CryptoService
+import base64
+import os
+import time
+
+
+def _encrypt_legado(plaintext):
+    """
+    Caminho antigo, sem cache: cada CryptoService() decodificava a chave e
+    criava o AESGCM antes de criptografar um único valor.
+    """
+    aesgcm = AESGCM(base64.b64decode(settings.ENCRYPTION_KEY))
+    nonce = os.urandom(12)
+    return base64.b64encode(nonce + aesgcm.encrypt(nonce, plaintext.encode(), None)).decode()
+
+
+class Command(BaseCommand):
+    help = 'Mede a vazão (valores/s) de criptografia de e-mails do CryptoService'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=100000,
+            help='Quantidade de valores (padrão: 100000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processos para o modo em lote paralelo (padrão: núcleos da máquina)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        workers = options['workers']
+        crypto = CryptoService()
+        emails = [f'colaborador{i}@empresa-exemplo.com.br' for i in range(count)]
+
+        self.stdout.write(f'{count} valores, {workers} processos no modo paralelo\n')
+
+        self._medir('AESGCM por valor (legado)', count, lambda: [_encrypt_legado(email) for email in emails])
+        encrypted, _ = self._medir('encrypt() escalar', count, lambda: [crypto.encrypt(email) for email in emails])
+        self._medir('encrypt_many()', count, lambda: crypto.encrypt_many(emails, workers=0))
+        self._medir(f'encrypt_many(workers={workers})', count, lambda: crypto.encrypt_many(emails, workers=workers))
+
+        self._medir('decrypt() escalar', count, lambda: [crypto.decrypt(value) for value in encrypted])
+        self._medir('decrypt_many()', count, lambda: crypto.decrypt_many(encrypted, workers=0))
+        decrypted, _ = self._medir(
+            f'decrypt_many(workers={workers})', count, lambda: crypto.decrypt_many(encrypted, workers=workers)
+        )
+
+        if decrypted != emails:
+            self.stdout.write(self.style.ERROR('Falha: valores descriptografados diferem dos originais'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Ida e volta conferida: formato compatível'))
+
+    def _medir(self, nome, count, func):
+        inicio = time.perf_counter()
+        result = func()
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(f'  {nome:<36} {duracao:8.3f}s  {count / duracao:>12,.0f} valores/s')
+        return result, duracao
@@ -0,0 +1,103 @@
+"""
+Mede a vazão de envio de e-mails contra o provedor falso local: um e-mail
+por requisição (send) vs API de lote (send_batch), serial e com
+--concurrency requisições em voo, todos com a sessão HTTP keep-alive do
+ResendEmailService.
+
+Uso:
+    python manage.py benchmark_email
+    python manage.py benchmark_email --count 5000 --latency-ms 80 --batch-size 100 --rate 0
+    python manage.py benchmark_email --concurrency 8
+"""
+from django.core.management.base import BaseCommand
+from services.email_service import ResendEmailService
+from services.fake_email_provider import FakeEmailProvider
+from services.token_bucket import TokenBucket
+import time
+
+
+class Command(BaseCommand):
+    help = 'Compara envio individual e em lote contra um provedor de e-mail falso'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=2000, help='E-mails por modo (padrão: 2000)')
+        parser.add_argument(
+            '--latency-ms',
+            type=int,
+            default=50,
+            help='Latência simulada do provedor em ms (padrão: 50)'
+        )
+        parser.add_argument('--batch-size', type=int, default=100, help='E-mails por lote (máx. 100)')
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=0,
+            help='Limite de requisições/s do token bucket (padrão: 0 = sem limite)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Requisições simultâneas no modo concorrente (padrão: 8)'
+        )
+        parser.add_argument(
+            '--single-count',
+            type=int,
+            default=None,
+            help='E-mails no modo individual (padrão: min(count, 200), pois é lento)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        single_count = options['single_count'] or min(count, 200)
+        provider = FakeEmailProvider(latency=options['latency_ms'] / 1000).start()
+
+        try:
+            service = ResendEmailService(
+                api_url=provider.url,
+                batch_size=options['batch_size'],
+                rate_limiter=TokenBucket(options['rate'])
+            )
+            messages = [
+                {'to': f'colaborador{i}@empresa-exemplo.com.br', 'subject': 'Benchmark', 'html': '<p>Olá</p>'}
+                for i in range(count)
+            ]
+
+            self.stdout.write(
+                f'Provedor falso em {provider.url}, latência {options["latency_ms"]}ms, '
+                f'limite {options["rate"] or "nenhum"} req/s\n'
+            )
+
+            inicio = time.perf_counter()
+            enviados = sum(
+                1 for message in messages[:single_count]
+                if service.send(message['to'], message['subject'], message['html'])
+            )
+            self._reportar('send() um por requisição', enviados, time.perf_counter() - inicio)
+
+            requisicoes = provider.requests
+            inicio = time.perf_counter()
+            results = service.send_batch(messages)
+            enviados = sum(1 for result in results if result['ok'])
+            self._reportar(
+                f'send_batch() lotes de {service.batch_size}', enviados, time.perf_counter() - inicio,
+                provider.requests - requisicoes
+            )
+
+            concurrency = options['concurrency']
+            requisicoes = provider.requests
+            inicio = time.perf_counter()
+            results = service.send_batch(messages, concurrency=concurrency)
+            enviados = sum(1 for result in results if result['ok'])
+            self._reportar(
+                f'send_batch() {concurrency} em voo', enviados, time.perf_counter() - inicio,
+                provider.requests - requisicoes
+            )
+        finally:
+            provider.stop()
+
+    def _reportar(self, nome, enviados, duracao, requisicoes=None):
+        extra = f'  ({requisicoes} requisições)' if requisicoes is not None else ''
+        self.stdout.write(
+            f'  {nome:<32} {enviados:>7} e-mails {duracao:8.2f}s {enviados / duracao:>10,.0f} e-mails/s{extra}'
+        )
@@ -0,0 +1,98 @@
+"""
+Worker dedicado à fila 'email' (send_email e send_notification_email) com
+envio concorrente: reivindica um lote grande de tasks e mantém até
+--concurrency requisições de lote em voo no provedor, gravando o status das
+tasks em bulk ao fim de cada lote.
+
+Uso:
+    # 8 requisições simultâneas de até 100 e-mails (lote de 800 tasks)
+    python manage.py deliver_emails --worker --concurrency 8
+
+    # Uma passada só, lote customizado
+    python manage.py deliver_emails --batch-size 2000 --concurrency 4
+
+A vazão também é limitada por EMAIL_RATE_LIMIT (requisições/s do provedor),
+um orçamento único para todos os processos que enviam e-mail quando
+EMAIL_RATE_LIMIT_BACKEND=redis; ajuste-o ao plano contratado.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from services.task_processors import TaskProcessor, TaskQueueWorker
+from services.task_queue_listener import TaskQueueListener
+import time
+
+
+class Command(BaseCommand):
+    help = 'Envia os e-mails da fila com requisições concorrentes ao provedor'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--worker',
+            action='store_true',
+            help='Executar em modo worker contínuo'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'EMAIL_CONCURRENCY', 4),
+            help='Requisições simultâneas ao provedor (padrão: EMAIL_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Tasks reivindicadas por ciclo (padrão: concorrência × EMAIL_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=10,
+            help='Espera máxima em segundos por um NOTIFY antes de consultar a fila (modo worker)'
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        batch_size = options['batch_size'] or concurrency * getattr(settings, 'EMAIL_BATCH_SIZE', 100)
+        worker_id = TaskQueueWorker.worker_id()
+
+        if not options['worker']:
+            enviados = self.ciclo(batch_size, concurrency, worker_id)
+            self.stdout.write(self.style.SUCCESS(f'{enviados} e-mails enviados'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Iniciando entrega de e-mails (lote: {batch_size}, concorrência: {concurrency})'
+        ))
+        self.stdout.write(self.style.WARNING('Pressione Ctrl+C para parar'))
+
+        listener = TaskQueueListener(['email'])
+        try:
+            while True:
+                TaskQueueWorker.recover_stuck_tasks()
+
+                inicio = time.perf_counter()
+                tasks = TaskQueueWorker.claim_tasks(limit=batch_size, worker_id=worker_id, queues=['email'])
+                enviados = TaskProcessor.process_email_batch(tasks, concurrency=concurrency)
+
+                if tasks:
+                    duracao = time.perf_counter() - inicio
+                    self.stdout.write(self.style.SUCCESS(
+                        f'[{time.strftime("%H:%M:%S")}] {enviados}/{len(tasks)} e-mails enviados '
+                        f'em {duracao:.1f}s ({enviados / duracao:.0f}/s)'
+                    ))
+
+                # Lote cheio: há mais trabalho, não esperar
+                if len(tasks) < batch_size:
+                    listener.wait(options['interval'])
+
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\nWorker interrompido pelo usuário'))
+        finally:
+            listener.close()
+            connections.close_all()
+
+    def ciclo(self, batch_size, concurrency, worker_id):
+        TaskQueueWorker.recover_stuck_tasks()
+        tasks = TaskQueueWorker.claim_tasks(limit=batch_size, worker_id=worker_id, queues=['email'])
+        return TaskProcessor.process_email_batch(tasks, concurrency=concurrency)
@@ -0,0 +1,48 @@
+"""
+Sobe o provedor de e-mail falso (services/fake_email_provider.py) para
+testar ou medir o envio sem o provedor real.
+
+Uso:
+    python manage.py fake_email_provider --port 8025 --latency-ms 80
+    RESEND_API_URL=http://127.0.0.1:8025 python manage.py process_task_queue --worker --queues email
+"""
+from django.core.management.base import BaseCommand
+from services.fake_email_provider import FakeEmailProvider
+
+
+class Command(BaseCommand):
+    help = 'Executa um servidor HTTP que imita a API de e-mail (Resend) localmente'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Endereço (padrão: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8025, help='Porta (padrão: 8025)')
+        parser.add_argument(
+            '--latency-ms',
+            type=int,
+            default=50,
+            help='Latência simulada por requisição em ms (padrão: 50)'
+        )
+        parser.add_argument(
+            '--fail-rate',
+            type=float,
+            default=0.0,
+            help='Fração de requisições que falham com HTTP 500 (padrão: 0)'
+        )
+
+    def handle(self, *args, **options):
+        provider = FakeEmailProvider(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency_ms'] / 1000,
+            fail_rate=options['fail_rate']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Provedor falso em {provider.url} (Ctrl+C para parar)'))
+
+        try:
+            provider.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(
+                self.style.WARNING(f'\n{provider.requests} requisições, {provider.emails} e-mails recebidos')
+            )
+        finally:
+            provider.stop()
@@ -1,6 +1,7 @@
 import time
 from django.core.management.base import BaseCommand
 from services.task_processors import TaskQueueWorker
+from services.task_queue_listener import TaskQueueListener
 from apps.core.models import UserNotification
 
 
@@ -11,8 +12,8 @@ class Command(BaseCommand):
         parser.add_argument(
             '--interval',
             type=int,
-            default=1,
-            help='Intervalo em segundos entre processamentos (padrão: 1s)'
+            default=30,
+            help='Espera máxima em segundos por um NOTIFY antes de consultar a fila (padrão: 30s)'
         )
         parser.add_argument(
             '--batch-size',
@@ -43,11 +44,15 @@ class Command(BaseCommand):
 
         last_cleanup = time.time()
         loop_count = 0
+        listener = TaskQueueListener()
 
         while True:
             try:
+                # Devolver à fila tasks de workers que caíram
+                TaskQueueWorker.recover_stuck_tasks()
+
                 # Processar tasks pendentes
-                processed = TaskQueueWorker.process_pending_tasks(limit=batch_size)
+                processed, claimed = TaskQueueWorker.process_pending_tasks(limit=batch_size)
 
                 if processed > 0:
                     self.stdout.write(
@@ -64,11 +69,15 @@ class Command(BaseCommand):
                         )
                     last_cleanup = current_time
 
-                time.sleep(interval)
+                # Batch cheio (mesmo com falhas): há mais trabalho, não esperar.
+                # Senão acorda com o NOTIFY do enfileiramento ou após o intervalo
+                if claimed < batch_size:
+                    listener.wait(interval)
                 loop_count += 1
 
             except KeyboardInterrupt:
                 self.stdout.write(self.style.WARNING('\nWorker interrompido'))
+                listener.close()
                 break
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f'Erro: {str(e)}'))
@@ -8,14 +8,36 @@ Uso:
     # Processar continuamente (worker mode)
     python manage.py process_task_queue --worker
 
-    # Processar com intervalo customizado
+    # Polling de segurança customizado (o worker acorda por LISTEN/NOTIFY
+    # assim que uma task é enfileirada; --interval só limita a espera)
     python manage.py process_task_queue --worker --interval 30
 
     # Processar mais tarefas por batch
     python manage.py process_task_queue --worker --batch-size 20
+
+    # 4 workers em paralelo (processos; use --pool thread para threads)
+    python manage.py process_task_queue --worker --concurrency 4
+
+    # Workers dedicados por fila: exports com pickup imediato e e-mails em massa
+    # drenando em outro processo
+    python manage.py process_task_queue --worker --queues exports,ai
+    python manage.py process_task_queue --worker --queues email --concurrency 4
+
+    # Uma fila por vez em ordem de prioridade (strict, padrão) ou por pesos
+    python manage.py process_task_queue --worker --queues exports,ai,email \
+        --scheduling weighted --weights exports=5,ai=2,email=1
+
+Vários comandos podem rodar ao mesmo tempo (inclusive em máquinas
+diferentes): as tasks são reivindicadas com SELECT ... FOR UPDATE SKIP LOCKED,
+então nenhuma task é processada por dois workers.
 """
 from django.core.management.base import BaseCommand
+from django.db import connections
 from services.task_processors import TaskQueueWorker
+from services.task_queue_listener import TaskQueueListener
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import threading
 import time
 import logging
 
@@ -35,7 +57,7 @@ class Command(BaseCommand):
             '--interval',
             type=int,
             default=10,
-            help='Intervalo em segundos entre processamentos (modo worker)'
+            help='Espera máxima em segundos por um NOTIFY antes de consultar a fila (modo worker)'
         )
         parser.add_argument(
             '--batch-size',
@@ -48,23 +70,78 @@ class Command(BaseCommand):
             action='store_true',
             help='Tentar reprocessar tarefas falhadas'
         )
+        parser.add_argument(
+            '--queues',
+            type=lambda value: [q.strip() for q in value.split(',') if q.strip()],
+            default=None,
+            help='Filas atendidas, separadas por vírgula (padrão: todas). Ex.: exports,ai,email'
+        )
+        parser.add_argument(
+            '--scheduling',
+            choices=['strict', 'weighted'],
+            default='strict',
+            help='strict: filas na ordem de --queues; weighted: lote dividido por --weights'
+        )
+        parser.add_argument(
+            '--weights',
+            type=self._parse_weights,
+            default=None,
+            help='Pesos por fila para --scheduling weighted. Ex.: exports=5,ai=2,email=1'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Número de workers em paralelo neste comando (modo worker)'
+        )
+        parser.add_argument(
+            '--pool',
+            choices=['process', 'thread'],
+            default='process',
+            help='Tipo de pool para --concurrency (padrão: process)'
+        )
+
+    @staticmethod
+    def _parse_weights(value):
+        weights = {}
+        for item in value.split(','):
+            queue, _, weight = item.partition('=')
+            weights[queue.strip()] = int(weight)
+        return weights
 
     def handle(self, *args, **options):
         worker_mode = options['worker']
         interval = options['interval']
         batch_size = options['batch_size']
         retry_failed = options['retry_failed']
+        concurrency = max(1, options['concurrency'])
+        self.stop_event = threading.Event()
+        self.scheduling = {
+            'queues': options['queues'],
+            'scheduling': options['scheduling'],
+            'weights': options['weights'],
+        }
 
         if worker_mode:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'Iniciando worker de tarefas (intervalo: {interval}s, batch: {batch_size})'
+                    f'Iniciando worker de tarefas (intervalo: {interval}s, batch: {batch_size}, '
+                    f'concorrência: {concurrency} {options["pool"]}, '
+                    f'filas: {",".join(options["queues"] or ["todas"])} ({options["scheduling"]}))'
                 )
             )
-            self.run_worker(interval, batch_size, retry_failed)
+            self.stdout.write(self.style.WARNING('Pressione Ctrl+C para parar'))
+
+            if concurrency == 1:
+                self.run_worker(interval, batch_size, retry_failed)
+            elif options['pool'] == 'thread':
+                self.run_thread_pool(concurrency, interval, batch_size, retry_failed)
+            else:
+                self.run_process_pool(concurrency, interval, batch_size, retry_failed)
         else:
             self.stdout.write('Processando tarefas pendentes...')
-            processed = TaskQueueWorker.process_pending_tasks(limit=batch_size)
+            TaskQueueWorker.recover_stuck_tasks()
+            processed, _ = TaskQueueWorker.process_pending_tasks(limit=batch_size, **self.scheduling)
             self.stdout.write(
                 self.style.SUCCESS(f'Processadas {processed} tarefas com sucesso')
             )
@@ -75,18 +152,61 @@ class Command(BaseCommand):
                     self.style.WARNING(f'{retried} tarefas falhadas marcadas para retry')
                 )
 
+    def run_process_pool(self, concurrency, interval, batch_size, retry_failed):
+        """Executa `concurrency` workers em processos filhos."""
+        # Conexões abertas não podem ser compartilhadas entre processos
+        connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=self.run_worker, args=(interval, batch_size, retry_failed))
+            for _ in range(concurrency)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            # Os filhos recebem o mesmo SIGINT e encerram sozinhos
+            for process in processes:
+                process.join()
+
+    def run_thread_pool(self, concurrency, interval, batch_size, retry_failed):
+        """Executa `concurrency` workers em threads (tasks limitadas por I/O)."""
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = [
+            executor.submit(self.run_worker, interval, batch_size, retry_failed)
+            for _ in range(concurrency)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except KeyboardInterrupt:
+            # Só a thread principal recebe o SIGINT: sinaliza as demais
+            self.stop_event.set()
+            executor.shutdown(wait=True)
+            self.stdout.write(self.style.WARNING('\nWorker interrompido pelo usuário'))
+
     def run_worker(self, interval, batch_size, retry_failed):
         """Executa worker em loop contínuo."""
-        self.stdout.write(self.style.WARNING('Pressione Ctrl+C para parar'))
+        worker_id = TaskQueueWorker.worker_id()
+        listener = TaskQueueListener(self.scheduling['queues'])
 
         try:
-            while True:
+            while not self.stop_event.is_set():
+                # Devolver à fila tasks de workers que caíram
+                TaskQueueWorker.recover_stuck_tasks()
+
                 # Processar tarefas pendentes
-                processed = TaskQueueWorker.process_pending_tasks(limit=batch_size)
+                processed, claimed = TaskQueueWorker.process_pending_tasks(
+                    limit=batch_size, worker_id=worker_id, **self.scheduling
+                )
 
                 if processed > 0:
                     self.stdout.write(
-                        self.style.SUCCESS(f'[{time.strftime("%H:%M:%S")}] Processadas {processed} tarefas')
+                        self.style.SUCCESS(f'[{time.strftime("%H:%M:%S")}] [{worker_id}] Processadas {processed} tarefas')
                     )
 
                 # Retry de tarefas falhadas (se habilitado)
@@ -97,9 +217,13 @@ class Command(BaseCommand):
                             self.style.WARNING(f'[{time.strftime("%H:%M:%S")}] {retried} tarefas marcadas para retry')
                         )
 
-                # Aguardar intervalo
-                time.sleep(interval)
+                # Batch cheio (mesmo com falhas): há mais trabalho, não esperar
+                if claimed < batch_size:
+                    listener.wait(interval)
 
         except KeyboardInterrupt:
             self.stdout.write(self.style.WARNING('\nWorker interrompido pelo usuário'))
             return
+        finally:
+            listener.close()
+            connections.close_all()
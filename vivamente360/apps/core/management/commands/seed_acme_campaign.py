@@ -941,6 +941,7 @@ class Command(BaseCommand):
     def _seed_empresa(self, Empresa, Campaign, SurveyResponse, SurveyInvitation, Unidade, Setor, Cargo, config):
         """Cria empresa, estrutura organizacional, campanha e importa respostas."""
         from apps.surveys.models import Dimensao
+        from services.score_service import ScoreService
         empresa_cnpj = config["cnpj"]
         empresa_defaults = config["defaults"]
         campaign_nome = config["campaign_nome"]
@@ -1058,6 +1059,7 @@ class Command(BaseCommand):
                     respostas=respostas,
                     lgpd_aceito=True,
                     lgpd_aceito_em=timezone.now(),
+                    **ScoreService.campos_materializados(respostas),
                 ))
                 inv_bulk.append(SurveyInvitation(
                     empresa=empresa,
@@ -102,6 +102,7 @@ class Command(BaseCommand):
         from apps.structure.models import Cargo, Setor, Unidade
         from apps.surveys.models import Campaign, Dimensao
         from apps.tenants.models import Empresa
+        from services.score_service import ScoreService
 
         total_respostas = options["respostas"]
 
@@ -238,6 +239,7 @@ class Command(BaseCommand):
             for i, perfil_nome in enumerate(perfis_pool):
                 unidade, setor = random.choice(todos_setores)
                 genero = random.choices(generos, weights=genero_pesos, k=1)[0]
+                respostas = _gerar_respostas(perfil_nome)
                 bulk.append(SurveyResponse(
                     campaign=campaign,
                     unidade=unidade,
@@ -245,9 +247,10 @@ class Command(BaseCommand):
                     faixa_etaria=random.choice(faixas),
                     tempo_empresa=random.choice(tempos),
                     genero=genero,
-                    respostas=_gerar_respostas(perfil_nome),
+                    respostas=respostas,
                     lgpd_aceito=True,
                     lgpd_aceito_em=timezone.now(),
+                    **ScoreService.campos_materializados(respostas),
                 ))
                 inv_bulk.append(SurveyInvitation(
                     empresa=empresa,
@@ -0,0 +1,50 @@
+"""
+Mostra profundidade e tempo de espera da fila de tarefas por empresa e fila.
+
+Uso:
+    python manage.py task_queue_stats
+    python manage.py task_queue_stats --window 15 --json
+"""
+from django.core.management.base import BaseCommand
+from services.task_processors import TaskQueueWorker
+import json
+
+
+class Command(BaseCommand):
+    help = 'Exibe profundidade e tempo de espera da fila de tarefas por empresa'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=60,
+            help='Janela em minutos para a espera média das tasks iniciadas (padrão: 60)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Saída em JSON'
+        )
+
+    def handle(self, *args, **options):
+        stats = TaskQueueWorker.queue_stats(janela_minutos=options['window'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(stats, ensure_ascii=False, indent=2))
+            return
+
+        if not stats:
+            self.stdout.write('Fila vazia.')
+            return
+
+        self.stdout.write(
+            f"{'Fila':<10} {'Empresa':<30} {'Pendentes':>10} {'Executando':>10} "
+            f"{'Espera atual (s)':>17} {'Iniciadas':>10} {'Espera média (s)':>17}"
+        )
+        for linha in stats:
+            espera_media = '-' if linha['espera_media_s'] is None else linha['espera_media_s']
+            self.stdout.write(
+                f"{linha['queue'] or '-':<10} {linha['empresa'][:30]:<30} {linha['pendentes']:>10} "
+                f"{linha['em_execucao']:>10} {linha['espera_atual_s']:>17} {linha['iniciadas']:>10} "
+                f"{espera_media:>17}"
+            )
@@ -0,0 +1,26 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_add_unique_constraint_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskqueue',
+            name='locked_by',
+            field=models.CharField(blank=True, help_text='Worker que está processando a task', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='taskqueue',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, help_text='Fim do lease do worker', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='taskqueue',
+            index=models.Index(fields=['status', 'locked_until'], name='core_task_q_status_lock_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated manually
+from django.db import migrations, models
+
+TASK_QUEUES = {
+    'exports': [
+        'export_plano_acao',
+        'export_plano_acao_rich',
+        'export_checklist_nr1',
+        'export_campaign_comparison',
+        'export_risk_matrix_excel',
+        'export_pgr_document',
+    ],
+    'ai': ['generate_sector_analysis'],
+    'email': ['send_email', 'send_notification_email'],
+}
+
+TASK_QUEUE_PRIORITIES = {'exports': 10, 'ai': 5, 'default': 5, 'email': 0}
+
+
+def preencher_filas(apps, schema_editor):
+    TaskQueue = apps.get_model('core', 'TaskQueue')
+    for queue, task_types in TASK_QUEUES.items():
+        TaskQueue.objects.filter(task_type__in=task_types).update(
+            queue=queue, priority=TASK_QUEUE_PRIORITIES[queue]
+        )
+    TaskQueue.objects.filter(queue='').update(queue='default', priority=TASK_QUEUE_PRIORITIES['default'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_taskqueue_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskqueue',
+            name='queue',
+            field=models.CharField(blank=True, help_text='Fila (lane); derivada do task_type se vazia', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='taskqueue',
+            name='priority',
+            field=models.SmallIntegerField(blank=True, help_text='Maior = reivindicada antes; padrão da fila se vazia', null=True),
+        ),
+        migrations.RunPython(preencher_filas, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='taskqueue',
+            index=models.Index(fields=['status', 'queue', '-priority', 'created_at'], name='core_task_q_queue_prio_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated manually
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_taskqueue_queue_priority'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskqueue',
+            name='run_after',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Não processar antes deste horário'),
+        ),
+        migrations.AddIndex(
+            model_name='taskqueue',
+            index=models.Index(
+                condition=models.Q(status='pending'),
+                fields=['queue', 'empresa', '-priority', 'created_at', 'run_after'],
+                name='core_task_q_pending_due_idx',
+            ),
+        ),
+    ]
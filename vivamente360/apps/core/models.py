@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import connection, models, transaction
 from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class TimeStampedModel(models.Model):
@@ -10,6 +13,87 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+TASK_QUEUE_CHANNEL = 'task_queue'
+
+# Filas (lanes) por tipo de task. Workers podem atender só algumas filas
+# (process_task_queue --queues), para que o envio em massa de e-mails não
+# atrase exports interativos.
+TASK_QUEUES = {
+    'exports': [
+        'export_plano_acao',
+        'export_plano_acao_rich',
+        'export_checklist_nr1',
+        'export_campaign_comparison',
+        'export_risk_matrix_excel',
+        'export_pgr_document',
+    ],
+    'ai': ['generate_sector_analysis'],
+    'email': ['send_email', 'send_notification_email'],
+    'responses': ['response_ingested'],
+}
+DEFAULT_TASK_QUEUE = 'default'
+
+# Prioridade padrão de cada fila (maior = reivindicada antes)
+TASK_QUEUE_PRIORITIES = {
+    'exports': 10,
+    'ai': 5,
+    'default': 5,
+    'responses': 5,
+    'email': 0,
+}
+
+
+def queue_for_task_type(task_type):
+    for queue, task_types in TASK_QUEUES.items():
+        if task_type in task_types:
+            return queue
+    return DEFAULT_TASK_QUEUE
+
+
+def channel_for_queue(queue):
+    """Canal de LISTEN/NOTIFY de uma fila."""
+    return f'{TASK_QUEUE_CHANNEL}_{queue}'
+
+
+class TaskQueueManager(models.Manager):
+    """Manager da fila: enfileira tasks e acorda os workers via NOTIFY."""
+
+    def enqueue(self, **fields):
+        """Cria a task (como create) e avisa os workers da fila que há trabalho."""
+        task = self.create(**fields)
+        self.notify(task.queue)
+        return task
+
+    def bulk_enqueue(self, tasks, batch_size=None):
+        """
+        bulk_create de tasks (que não passa por save()) com fila e prioridade
+        preenchidas, seguido de um NOTIFY por fila envolvida.
+        """
+        for task in tasks:
+            task.preencher_fila()
+        created = self.bulk_create(tasks, batch_size=batch_size)
+        for queue in {task.queue for task in tasks}:
+            self.notify(queue)
+        return created
+
+    def notify(self, queue=DEFAULT_TASK_QUEUE):
+        """
+        Emite NOTIFY no canal da fila (PostgreSQL). Dentro de uma transação o
+        aviso só é entregue no COMMIT, então o worker nunca acorda antes de a
+        task estar visível. Use após bulk_create.
+        """
+        if connection.vendor != 'postgresql':
+            return
+        try:
+            # Savepoint: uma falha do pg_notify (ex.: fila de NOTIFY cheia)
+            # desfaz só o aviso, sem abortar a transação de quem enfileirou
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute('SELECT pg_notify(%s, %s)', [channel_for_queue(queue), queue])
+        except Exception as e:
+            # O worker também faz polling: a falha do aviso só atrasa a task
+            logger.warning(f"Falha ao notificar a fila de tarefas: {e}")
+
+
 class TaskQueue(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pendente'),
@@ -19,6 +103,8 @@ class TaskQueue(models.Model):
     ]
 
     task_type = models.CharField(max_length=50)
+    queue = models.CharField(max_length=30, blank=True, help_text='Fila (lane); derivada do task_type se vazia')
+    priority = models.SmallIntegerField(null=True, blank=True, help_text='Maior = reivindicada antes; padrão da fila se vazia')
     payload = models.JSONField()
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pending')
     attempts = models.IntegerField(default=0)
@@ -42,17 +128,46 @@ class TaskQueue(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    # A task só é reivindicada a partir deste instante (retries com backoff)
+    run_after = models.DateTimeField(default=timezone.now, help_text='Não processar antes deste horário')
+
+    # Lease do worker que reivindicou a task: vencido o prazo sem conclusão,
+    # a task é devolvida à fila (worker caiu no meio do processamento)
+    locked_by = models.CharField(max_length=100, blank=True, help_text='Worker que está processando a task')
+    locked_until = models.DateTimeField(null=True, blank=True, help_text='Fim do lease do worker')
+
+    objects = TaskQueueManager()
+
     class Meta:
         indexes = [
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['user', 'status']),
             models.Index(fields=['empresa', 'status']),
+            models.Index(fields=['status', 'locked_until'], name='core_task_q_status_lock_idx'),
+            models.Index(fields=['status', 'queue', '-priority', 'created_at'], name='core_task_q_queue_prio_idx'),
+            # Claim: só linhas pendentes, filtradas por run_after <= agora
+            models.Index(
+                fields=['queue', 'empresa', '-priority', 'created_at', 'run_after'],
+                name='core_task_q_pending_due_idx',
+                condition=models.Q(status='pending'),
+            ),
         ]
         db_table = 'core_task_queue'
 
     def __str__(self):
         return f"{self.task_type} - {self.status}"
 
+    def save(self, *args, **kwargs):
+        self.preencher_fila()
+        super().save(*args, **kwargs)
+
+    def preencher_fila(self):
+        """Deriva fila e prioridade do task_type quando não informadas."""
+        if not self.queue:
+            self.queue = queue_for_task_type(self.task_type)
+        if self.priority is None:
+            self.priority = TASK_QUEUE_PRIORITIES.get(self.queue, 0)
+
     @property
     def is_file_task(self):
         """Retorna True se a task gera um arquivo."""
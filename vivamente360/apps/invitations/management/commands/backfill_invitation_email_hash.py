@@ -0,0 +1,74 @@
+"""
+Preenche SurveyInvitation.email_hash (índice cego HMAC) para convites
+criados antes da coluna existir (ou recalcula todos com --all, ex.: após
+trocar BLIND_INDEX_KEY).
+
+Uso:
+    python manage.py backfill_invitation_email_hash
+    python manage.py backfill_invitation_email_hash --campaign 12 --batch-size 5000
+    python manage.py backfill_invitation_email_hash --all
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.invitations.models import SurveyInvitation
+from app_selectors.keyset import lotes_por_id
+from services.crypto_service import CryptoService
+
+
+class Command(BaseCommand):
+    help = 'Calcula o índice cego (email_hash) dos convites existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--campaign',
+            type=int,
+            help='ID da campanha (padrão: todas)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Número de convites por lote de bulk_update (padrão: 2000)'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recalcular também convites que já possuem email_hash'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        crypto_service = CryptoService()
+
+        queryset = SurveyInvitation.objects.all()
+        if options['campaign']:
+            queryset = queryset.filter(campaign_id=options['campaign'])
+        if not options['all']:
+            queryset = queryset.filter(email_hash='')
+
+        total = 0
+        falhas = 0
+
+        for lote in lotes_por_id(queryset, batch_size, campos=['id', 'email_encrypted']):
+            emails = crypto_service.decrypt_many(
+                [invitation.email_encrypted for invitation in lote], ignore_errors=True
+            )
+            atualizar = []
+            for invitation, email in zip(lote, emails):
+                if email is None:
+                    falhas += 1
+                    continue
+                invitation.email_hash = crypto_service.blind_index(email)
+                atualizar.append(invitation)
+
+            with transaction.atomic():
+                SurveyInvitation.objects.bulk_update(atualizar, ['email_hash'])
+
+            total += len(atualizar)
+            self.stdout.write(f'  {total} convites processados...')
+
+        if falhas:
+            self.stdout.write(self.style.WARNING(
+                f'{falhas} convite(s) não puderam ser descriptografados (chave diferente?)'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Concluído! {total} convite(s) atualizado(s).'))
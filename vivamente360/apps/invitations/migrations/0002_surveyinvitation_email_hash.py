@@ -0,0 +1,25 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invitations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveyinvitation',
+            name='email_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='surveyinvitation',
+            index=models.Index(fields=['campaign', 'email_hash'], name='invitations_campaig_29f6fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='surveyinvitation',
+            index=models.Index(fields=['empresa', 'email_hash'], name='invitations_empresa_3a0ecb_idx'),
+        ),
+    ]
@@ -16,6 +16,8 @@ class SurveyInvitation(TimeStampedModel):
 
     hash_token = models.UUIDField(default=uuid.uuid4, unique=True, db_index=True)
     email_encrypted = models.TextField()
+    # HMAC do e-mail normalizado (CryptoService.blind_index): busca sem descriptografar
+    email_hash = models.CharField(max_length=64, blank=True, default='')
     nome_encrypted = models.TextField(blank=True)
 
     empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE)
@@ -36,6 +38,8 @@ class SurveyInvitation(TimeStampedModel):
         indexes = [
             models.Index(fields=['hash_token']),
             models.Index(fields=['campaign', 'status']),
+            models.Index(fields=['campaign', 'email_hash']),
+            models.Index(fields=['empresa', 'email_hash']),
         ]
 
     def __str__(self):
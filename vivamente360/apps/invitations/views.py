@@ -1,14 +1,13 @@
 from django.views.generic import ListView, View
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.utils import timezone
-from cryptography.exceptions import InvalidTag
+from django.db import transaction
 from apps.core.mixins import RHRequiredMixin
 from apps.invitations.models import SurveyInvitation
 from apps.surveys.models import Campaign
 from apps.core.models import TaskQueue
-from services.crypto_service import CryptoService
 from services.import_service import ImportService
+from services.task_file_storage import TaskFileStorage
 from services.audit_service import AuditService
 import logging
 
@@ -69,8 +68,8 @@ class ImportCSVView(RHRequiredMixin, View):
             messages.error(request, 'Nenhum arquivo foi enviado.')
             return redirect('invitations:import', campaign_id=campaign_id)
 
-        content = csv_file.read().decode('utf-8')
-        valid, error, rows = ImportService.validate_csv(content)
+        # Validação em streaming: cabeçalho e contagem de linhas
+        valid, error, total_rows = ImportService.validate_csv_file(csv_file)
 
         if not valid:
             if is_ajax:
@@ -78,13 +77,17 @@ class ImportCSVView(RHRequiredMixin, View):
             messages.error(request, error)
             return redirect('invitations:import', campaign_id=campaign_id)
 
+        # O CSV vai para um arquivo; a task guarda só a referência
+        csv_path = TaskFileStorage.save_task_upload(csv_file, 'import_csv')
+
         # Enfileirar tarefa de importação no banco de dados
-        task = TaskQueue.objects.create(
+        task = TaskQueue.objects.enqueue(
             task_type='import_csv',
             payload={
                 'campaign_id': campaign_id,
                 'empresa_id': campaign.empresa.id,
-                'rows': rows,
+                'csv_file': csv_path,
+                'rows_count': total_rows,
                 'user_id': request.user.id
             }
         )
@@ -93,7 +96,7 @@ class ImportCSVView(RHRequiredMixin, View):
             request.user,
             campaign.empresa,
             'import_csv',
-            f'Importação de {len(rows)} registros enfileirada (Task #{task.id})',
+            f'Importação de {total_rows} registros enfileirada (Task #{task.id})',
             request
         )
 
@@ -101,7 +104,7 @@ class ImportCSVView(RHRequiredMixin, View):
         if is_ajax:
             return JsonResponse({
                 'task_id': task.id,
-                'message': f'Importação de {len(rows)} registros iniciada. Você será notificado quando concluir.',
+                'message': f'Importação de {total_rows} registros iniciada. Você será notificado quando concluir.',
                 'status_url': f'/api/tasks/{task.id}/',
                 'redirect_url': f'/invitations/{campaign_id}/manage/'
             })
@@ -109,7 +112,7 @@ class ImportCSVView(RHRequiredMixin, View):
         # Caso contrário, comportamento legacy com messages
         messages.success(
             request,
-            f'Importação de {len(rows)} registros enfileirada com sucesso. '
+            f'Importação de {total_rows} registros enfileirada com sucesso. '
             f'Você será notificado quando concluir.'
         )
         return redirect('invitations:manage', campaign_id=campaign_id)
@@ -117,73 +120,45 @@ class ImportCSVView(RHRequiredMixin, View):
 
 class DispatchEmailsView(RHRequiredMixin, View):
     def post(self, request, campaign_id):
-        campaign = get_object_or_404(Campaign, id=campaign_id)
-        invitations = SurveyInvitation.objects.filter(
-            campaign=campaign, status='pending'
-        ).select_related('campaign', 'empresa')
-
-        crypto_service = CryptoService()
-        count = 0
-        failed_count = 0
-
-        for invitation in invitations:
-            try:
-                email = crypto_service.decrypt(invitation.email_encrypted)
-                magic_link = f"{request.scheme}://{request.get_host()}/survey/{invitation.hash_token}/"
-
-                html_body = f"""
-                <h2>Pesquisa de Clima Organizacional - {campaign.empresa.nome_app}</h2>
-                <p>Você foi convidado(a) a participar da pesquisa {campaign.nome}.</p>
-                <p><a href="{magic_link}">Clique aqui para responder</a></p>
-                <p>Este link expira em 48 horas e só pode ser usado uma vez.</p>
-                """
-
-                TaskQueue.objects.create(
-                    task_type='send_email',
-                    payload={
-                        'to': email,
-                        'subject': f'Pesquisa {campaign.nome} - {campaign.empresa.nome}',
-                        'html': html_body,
-                        'invitation_id': invitation.id
-                    }
-                )
-
-                # Atualizar status do convite para 'sent'
-                invitation.status = 'sent'
-                invitation.sent_at = timezone.now()
-                invitation.save(update_fields=['status', 'sent_at', 'updated_at'])
-
-                count += 1
+        from django.http import JsonResponse
 
-            except InvalidTag:
-                failed_count += 1
-                logger.error(
-                    f"Erro de descriptografia para convite ID {invitation.id}. "
-                    f"O email pode ter sido criptografado com uma chave diferente."
-                )
-                messages.warning(
-                    request,
-                    f"Convite ID {invitation.id}: Não foi possível descriptografar o email. "
-                    f"O convite pode ter sido criado com uma chave de criptografia diferente."
-                )
+        is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Erro ao processar convite ID {invitation.id}: {str(e)}")
-                messages.warning(
-                    request,
-                    f"Convite ID {invitation.id}: Erro ao processar - {str(e)}"
+        # Um disparo por vez por campanha: o lock na linha da campanha
+        # serializa a verificação e o enfileiramento de cliques simultâneos
+        with transaction.atomic():
+            campaign = get_object_or_404(Campaign.objects.select_for_update(), id=campaign_id)
+            task = TaskQueue.objects.filter(
+                task_type='dispatch_invitations',
+                payload__campaign_id=campaign.id,
+                status__in=['pending', 'processing']
+            ).first()
+
+            if task is None:
+                # O fan-out (tasks send_email + status dos convites) roda no worker
+                task = TaskQueue.objects.enqueue(
+                    task_type='dispatch_invitations',
+                    payload={
+                        'campaign_id': campaign.id,
+                        'base_url': f"{request.scheme}://{request.get_host()}",
+                    },
+                    user=request.user,
+                    empresa=campaign.empresa,
+                    progress_message='Preparando disparo dos convites...'
                 )
+                AuditService.log(request.user, campaign.empresa, 'disparo_email',
+                                 f'Disparo de convites enfileirado (Task #{task.id})', request)
+                message = 'Disparo de convites iniciado. Você será notificado quando concluir.'
+            else:
+                message = f'Já existe um disparo em andamento para esta campanha (Task #{task.id}).'
 
-        if count > 0:
-            messages.success(request, f'{count} e-mails enfileirados para envio.')
-            AuditService.log(request.user, campaign.empresa, 'disparo_email',
-                             f'Disparados {count} e-mails', request)
-
-        if failed_count > 0:
-            messages.error(
-                request,
-                f'{failed_count} convites falharam. Verifique os logs para mais detalhes.'
-            )
+        if is_ajax:
+            return JsonResponse({
+                'task_id': task.id,
+                'message': message,
+                'status_url': f'/api/tasks/{task.id}/',
+                'redirect_url': f'/invitations/{campaign_id}/manage/'
+            })
 
+        messages.success(request, message)
         return redirect('invitations:manage', campaign_id=campaign_id)
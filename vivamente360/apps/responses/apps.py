@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ResponsesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.responses'
+    verbose_name = 'Respostas'
+
+    def ready(self):
+        from apps.responses import signals  # noqa: F401
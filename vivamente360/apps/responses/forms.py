@@ -0,0 +1,43 @@
+from django import forms
+from apps.responses.models import SurveyResponse
+
+
+ESCALA = [(0, 'Nunca'), (1, 'Raramente'), (2, 'Às vezes'), (3, 'Frequentemente'), (4, 'Sempre')]
+
+
+class SurveySubmissionForm(forms.Form):
+    """
+    Questionário completo em um único POST (modo página única): aceite LGPD,
+    dados demográficos e um campo `q_<numero>` por pergunta ativa.
+
+    Todas as perguntas são obrigatórias; cleaned_data['respostas'] fica no
+    mesmo formato do fluxo por etapas ({"1": "3", ...}).
+    """
+    lgpd_aceito = forms.BooleanField(required=True)
+    faixa_etaria = forms.ChoiceField(choices=SurveyResponse.FAIXA_ETARIA_CHOICES)
+    tempo_empresa = forms.ChoiceField(choices=SurveyResponse.TEMPO_EMPRESA_CHOICES)
+    genero = forms.ChoiceField(choices=SurveyResponse.GENERO_CHOICES)
+
+    def __init__(self, perguntas, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.perguntas = perguntas
+        for pergunta in perguntas:
+            self.fields[self.field_name(pergunta)] = forms.TypedChoiceField(
+                choices=ESCALA,
+                coerce=int,
+                label=pergunta.texto,
+                error_messages={'required': 'Responda esta pergunta.'}
+            )
+
+    @staticmethod
+    def field_name(pergunta):
+        return f'q_{pergunta.numero}'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        cleaned_data['respostas'] = {
+            str(pergunta.numero): str(cleaned_data[self.field_name(pergunta)])
+            for pergunta in self.perguntas
+            if self.field_name(pergunta) in cleaned_data
+        }
+        return cleaned_data
@@ -0,0 +1,68 @@
+"""
+Preenche as colunas de score materializadas de SurveyResponse para respostas
+gravadas antes da materialização (ou reprocessa todas com --all).
+
+Uso:
+    python manage.py backfill_response_scores
+    python manage.py backfill_response_scores --campaign 12 --batch-size 5000
+    python manage.py backfill_response_scores --all
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.responses.models import SurveyResponse
+from app_selectors.keyset import lotes_por_id
+from services.score_service import ScoreService
+
+
+class Command(BaseCommand):
+    help = 'Calcula e grava os scores materializados das respostas existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--campaign',
+            type=int,
+            help='ID da campanha (padrão: todas)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Número de respostas por lote de bulk_update (padrão: 2000)'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recalcular também respostas que já possuem scores'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        queryset = SurveyResponse.objects.all()
+        if options['campaign']:
+            queryset = queryset.filter(campaign_id=options['campaign'])
+        if not options['all']:
+            queryset = queryset.filter(igrp_individual__isnull=True)
+
+        campos = [f'score_{d}' for d in ScoreService.DIMENSOES] + \
+                 [f'nivel_{d}' for d in ScoreService.DIMENSOES] + \
+                 ['igrp_individual']
+
+        total = 0
+
+        for lote in lotes_por_id(queryset, batch_size, campos=['id', 'respostas']):
+            scores = ScoreService.score_matrix(lote)
+            niveis = ScoreService.nivel_matrix(scores)
+            valores = ScoreService.campos_materializados_matriz(scores, niveis)
+
+            for response, campos_response in zip(lote, valores):
+                for campo, valor in campos_response.items():
+                    setattr(response, campo, valor)
+
+            with transaction.atomic():
+                SurveyResponse.objects.bulk_update(lote, campos)
+
+            total += len(lote)
+            self.stdout.write(f'  {total} respostas processadas...')
+
+        self.stdout.write(self.style.SUCCESS(f'Concluído! {total} resposta(s) atualizada(s).'))
@@ -0,0 +1,273 @@
+"""
+Teste de carga do questionário: cria N convites na campanha de demonstração
+(seed_demo) e percorre o fluxo completo de cada um em paralelo pelo Django
+test client (threads, cada uma com sua conexão ao banco), como no dia da
+pesquisa. Ao final mostra, por etapa, vazão, latências (p50/p95/p99/máx.)
+e consultas ao banco por requisição.
+
+Modos:
+    etapas: SurveyFormView (LGPD → demografia → uma página por pergunta)
+    pagina: SurveySinglePageView (um GET e um POST)
+
+Os convites, as respostas e as tasks 'response_ingested' criados são
+removidos ao final (exceto com --keep). Grava no banco configurado: use em
+desenvolvimento/homologação (fora de DEBUG exige --force).
+
+Uso:
+    python manage.py loadtest_survey
+    python manage.py loadtest_survey --respondents 500 --concurrency 32
+    python manage.py loadtest_survey --mode pagina --respondents 2000 --concurrency 64
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core import management
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import math
+import random
+import threading
+import time
+
+CAMPANHA_DEMO = "Campanha Demo 2025 – Saúde Psicossocial"
+CNPJ_DEMO = "12.345.678/0001-99"
+
+
+def _percentil(valores, p):
+    """Percentil por posição (nearest-rank) de uma lista ordenada."""
+    if not valores:
+        return 0.0
+    return valores[max(0, math.ceil(p / 100 * len(valores)) - 1)]
+
+
+class _Medicoes:
+    """Latências e consultas por etapa, acumuladas pelas threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.etapas = {}
+        self.excecoes = {}
+
+    def registrar(self, etapa, segundos, consultas, ok):
+        with self._lock:
+            medicao = self.etapas.setdefault(etapa, {'latencias': [], 'consultas': 0, 'erros': 0})
+            medicao['latencias'].append(segundos)
+            medicao['consultas'] += consultas
+            if not ok:
+                medicao['erros'] += 1
+
+    def registrar_excecao(self, erro):
+        with self._lock:
+            tipo = f'{type(erro).__name__}: {erro}'[:200]
+            self.excecoes[tipo] = self.excecoes.get(tipo, 0) + 1
+
+
+class _FalhaNoFluxo(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Teste de carga do fluxo de resposta do questionário (vazão, latência e consultas por etapa)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--respondents', type=int, default=100, help='Convites/fluxos (padrão: 100)')
+        parser.add_argument('--concurrency', type=int, default=16, help='Respondentes simultâneos (padrão: 16)')
+        parser.add_argument(
+            '--mode',
+            choices=['etapas', 'pagina'],
+            default='etapas',
+            help='etapas: SurveyFormView; pagina: SurveySinglePageView'
+        )
+        parser.add_argument('--host', default='localhost', help='Host das requisições (ALLOWED_HOSTS)')
+        parser.add_argument('--keep', action='store_true', help='Mantém convites, respostas e tasks criados')
+        parser.add_argument('--force', action='store_true', help='Permite rodar com DEBUG=False')
+
+    def handle(self, *args, **options):
+        from apps.surveys.models import Campaign
+        from services.question_catalog import QuestionCatalog
+
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG=False: o teste grava no banco configurado. Use --force para confirmar.')
+
+        respondents = options['respondents']
+        concurrency = options['concurrency']
+
+        campaign = Campaign.objects.filter(empresa__cnpj=CNPJ_DEMO, nome=CAMPANHA_DEMO).first()
+        if campaign is None:
+            self.stdout.write('Campanha de demonstração não encontrada; executando seed_demo...')
+            management.call_command('seed_demo', respostas=0, verbosity=0)
+            campaign = Campaign.objects.get(empresa__cnpj=CNPJ_DEMO, nome=CAMPANHA_DEMO)
+
+        total_perguntas = QuestionCatalog.get().total
+        if not total_perguntas:
+            raise CommandError("Nenhuma pergunta ativa. Execute 'python manage.py populate_hse' primeiro.")
+
+        inicio_teste = timezone.now()
+        convites = self._criar_convites(campaign, respondents)
+        self.stdout.write(
+            f'{len(convites)} convites criados na campanha "{campaign.nome}"; '
+            f'modo {options["mode"]}, {total_perguntas} perguntas, {concurrency} simultâneos\n'
+        )
+
+        medicoes = _Medicoes()
+        fluxo = self._fluxo_etapas if options['mode'] == 'etapas' else self._fluxo_pagina
+
+        def executar(indice_token):
+            indice, token = indice_token
+            client = Client(REMOTE_ADDR=self._ip(indice), HTTP_HOST=options['host'])
+            try:
+                fluxo(client, token, total_perguntas, medicoes)
+                return True
+            except _FalhaNoFluxo:
+                return False
+            except Exception as e:
+                # Exceção da view (o test client a propaga): conta como erro
+                # do fluxo em vez de interromper o teste
+                medicoes.registrar_excecao(e)
+                return False
+            finally:
+                connection.close()
+
+        try:
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                concluidos = sum(executor.map(executar, enumerate(convites)))
+            duracao = time.perf_counter() - inicio
+
+            self._reportar(medicoes, duracao, concluidos, len(convites))
+        finally:
+            if not options['keep']:
+                self._limpar(campaign, convites, inicio_teste)
+
+    def _criar_convites(self, campaign, total):
+        from apps.invitations.models import SurveyInvitation
+        from apps.structure.models import Cargo, Setor
+        from services.crypto_service import CryptoService
+
+        setores = list(Setor.objects.filter(unidade__empresa=campaign.empresa).select_related('unidade'))
+        cargos = list(Cargo.objects.filter(empresa=campaign.empresa))
+        if not setores or not cargos:
+            raise CommandError('A empresa da campanha de demonstração não tem setores/cargos.')
+
+        crypto_service = CryptoService()
+        emails = [f'loadtest_{campaign.id}_{i}@example.com' for i in range(total)]
+        cifrados = crypto_service.encrypt_many(emails)
+        hashes = crypto_service.blind_index_many(emails)
+        expires_at = timezone.now() + timedelta(hours=48)
+
+        convites = []
+        for i in range(total):
+            setor = random.choice(setores)
+            convites.append(SurveyInvitation(
+                empresa=campaign.empresa,
+                campaign=campaign,
+                unidade=setor.unidade,
+                setor=setor,
+                cargo=random.choice(cargos),
+                email_encrypted=cifrados[i],
+                email_hash=hashes[i],
+                expires_at=expires_at,
+                status='sent',
+                sent_at=timezone.now(),
+            ))
+        SurveyInvitation.objects.bulk_create(convites, batch_size=1000)
+        return [convite.hash_token for convite in convites]
+
+    @staticmethod
+    def _ip(indice):
+        # Um IP por respondente: o rate limit do questionário é por IP
+        return f'10.{(indice >> 16) & 255}.{(indice >> 8) & 255}.{indice & 255}'
+
+    @staticmethod
+    def _requisicao(medicoes, etapa, chamada, esperado=(200, 302)):
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            response = chamada()
+            segundos = time.perf_counter() - inicio
+        ok = response.status_code in esperado
+        medicoes.registrar(etapa, segundos, len(consultas), ok)
+        if not ok:
+            raise _FalhaNoFluxo(f'{etapa}: HTTP {response.status_code}')
+        return response
+
+    @staticmethod
+    def _demografia():
+        return {
+            'faixa_etaria': random.choice(['18-24', '25-34', '35-49', '50-59', '60+']),
+            'tempo_empresa': random.choice(['0-1', '1-3', '3-5', '5-10', '10+']),
+            'genero': random.choice(['M', 'F', 'O', 'N']),
+        }
+
+    def _fluxo_etapas(self, client, token, total_perguntas, medicoes):
+        url = f'/survey/{token}/'
+        req = self._requisicao
+
+        req(medicoes, 'lgpd GET', lambda: client.get(url, {'step': 'lgpd'}), (200,))
+        req(medicoes, 'lgpd POST', lambda: client.post(url, {'step': 'lgpd', 'lgpd_aceito': 'on'}), (302,))
+        req(medicoes, 'demografia GET', lambda: client.get(url, {'step': 'demographics'}), (200,))
+        req(medicoes, 'demografia POST', lambda: client.post(url, {'step': 'demographics', **self._demografia()}), (302,))
+
+        for numero in range(1, total_perguntas + 1):
+            dados = {'step': str(numero), 'valor': str(random.randint(0, 4))}
+            req(medicoes, 'pergunta GET', lambda: client.get(url, {'step': str(numero)}), (200,))
+            if numero < total_perguntas:
+                req(medicoes, 'pergunta POST', lambda: client.post(url, dados), (302,))
+            else:
+                req(medicoes, 'envio final POST', lambda: client.post(url, dados), (200,))
+
+    def _fluxo_pagina(self, client, token, total_perguntas, medicoes):
+        from services.question_catalog import QuestionCatalog
+
+        url = f'/survey/{token}/completo/'
+        dados = {'lgpd_aceito': 'on', **self._demografia()}
+        for pergunta in QuestionCatalog.get().perguntas:
+            dados[f'q_{pergunta.numero}'] = str(random.randint(0, 4))
+
+        self._requisicao(medicoes, 'página GET', lambda: client.get(url), (200,))
+        self._requisicao(medicoes, 'envio POST', lambda: client.post(url, dados), (200,))
+
+    def _reportar(self, medicoes, duracao, concluidos, total):
+        self.stdout.write(
+            f'{"etapa":<20} {"req":>7} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} '
+            f'{"p99 ms":>8} {"máx ms":>8} {"consultas":>10} {"erros":>6}'
+        )
+        for etapa, medicao in medicoes.etapas.items():
+            latencias = sorted(medicao['latencias'])
+            n = len(latencias)
+            self.stdout.write(
+                f'{etapa:<20} {n:>7} {n / duracao:>9.1f} '
+                f'{_percentil(latencias, 50) * 1000:>8.1f} {_percentil(latencias, 95) * 1000:>8.1f} '
+                f'{_percentil(latencias, 99) * 1000:>8.1f} {latencias[-1] * 1000:>8.1f} '
+                f'{medicao["consultas"] / n:>10.1f} {medicao["erros"]:>6}'
+            )
+
+        for erro, quantidade in medicoes.excecoes.items():
+            self.stdout.write(self.style.ERROR(f'{quantidade}× exceção: {erro}'))
+
+        requisicoes = sum(len(medicao['latencias']) for medicao in medicoes.etapas.values())
+        estilo = self.style.SUCCESS if concluidos == total else self.style.WARNING
+        self.stdout.write(estilo(
+            f'\n{concluidos}/{total} fluxos concluídos em {duracao:.1f}s: '
+            f'{concluidos / duracao:.1f} respondentes/s, {requisicoes / duracao:.1f} req/s'
+        ))
+
+    def _limpar(self, campaign, tokens, inicio_teste):
+        from apps.core.models import TaskQueue
+        from apps.invitations.models import SurveyInvitation
+        from apps.responses.models import SurveyResponse
+        from tasks.analytics_tasks import rebuild_campaign_analytics
+
+        # Respostas não têm vínculo com o convite (blind-drop): remove as da
+        # campanha gravadas durante o teste
+        respostas, _ = SurveyResponse.objects.filter(campaign=campaign, created_at__gte=inicio_teste).delete()
+        TaskQueue.objects.filter(
+            task_type='response_ingested', payload__campaign_id=campaign.id, created_at__gte=inicio_teste
+        ).delete()
+        convites, _ = SurveyInvitation.objects.filter(hash_token__in=tokens).delete()
+
+        # Os fatos analíticos podem ter somado as respostas removidas
+        rebuild_campaign_analytics(campaign)
+        self.stdout.write(f'Limpeza: {convites} convites e {respostas} respostas removidos')
@@ -0,0 +1,92 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('responses', '0004_remove_surveyresponse_comentario_livre'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_demandas',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_controle',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_apoio_chefia',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_apoio_colegas',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_relacionamentos',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_cargo',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='score_comunicacao_mudancas',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_demandas',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_controle',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_apoio_chefia',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_apoio_colegas',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_relacionamentos',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_cargo',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='nivel_comunicacao_mudancas',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='igrp_individual',
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                help_text='Média dos níveis de risco (NR) das 7 dimensões desta resposta',
+                max_digits=4,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated manually
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def marcar_respostas_carregadas(apps, schema_editor):
+    """
+    Marca as respostas já somadas nos fatos: as que estão até a marca
+    d'água (last_response_id) de campanhas com rebuild registrado.
+    """
+    SurveyResponse = apps.get_model('responses', 'SurveyResponse')
+    CampaignAnalyticsState = apps.get_model('analytics', 'CampaignAnalyticsState')
+
+    marca = CampaignAnalyticsState.objects.filter(
+        campaign_id=OuterRef('campaign_id'), rebuilt_at__isnull=False
+    ).values('last_response_id')
+    SurveyResponse.objects.filter(id__lte=Subquery(marca)).update(analytics_carregada=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('responses', '0005_surveyresponse_materialized_scores'),
+        ('analytics', '0006_fatos_indicador_pergunta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='analytics_carregada',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(marcar_respostas_carregadas, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='surveyresponse',
+            index=models.Index(
+                condition=models.Q(analytics_carregada=False),
+                fields=['campaign'],
+                name='resp_analytics_pend_idx',
+            ),
+        ),
+    ]
@@ -46,6 +46,34 @@ class SurveyResponse(TimeStampedModel):
 
     respostas = models.JSONField()
 
+    # Scores HSE-IT materializados (ScoreService.campos_materializados) pela
+    # task 'response_ingested' logo após a gravação. Nulos enquanto a task
+    # está na fila ou para respostas antigas ainda não processadas por
+    # `manage.py backfill_response_scores`.
+    score_demandas = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    score_controle = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    score_apoio_chefia = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    score_apoio_colegas = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    score_relacionamentos = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    score_cargo = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    score_comunicacao_mudancas = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+
+    nivel_demandas = models.SmallIntegerField(null=True, blank=True)
+    nivel_controle = models.SmallIntegerField(null=True, blank=True)
+    nivel_apoio_chefia = models.SmallIntegerField(null=True, blank=True)
+    nivel_apoio_colegas = models.SmallIntegerField(null=True, blank=True)
+    nivel_relacionamentos = models.SmallIntegerField(null=True, blank=True)
+    nivel_cargo = models.SmallIntegerField(null=True, blank=True)
+    nivel_comunicacao_mudancas = models.SmallIntegerField(null=True, blank=True)
+
+    igrp_individual = models.DecimalField(
+        max_digits=4,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Média dos níveis de risco (NR) das 7 dimensões desta resposta"
+    )
+
     # Análise de sentimento (preenchido pela IA)
     sentimento_score = models.DecimalField(
         max_digits=3,
@@ -63,6 +91,11 @@ class SurveyResponse(TimeStampedModel):
     lgpd_aceito = models.BooleanField(default=False)
     lgpd_aceito_em = models.DateTimeField()
 
+    # Marcada pelo rebuild analítico quando a resposta entra nos fatos; o
+    # incremental busca as não marcadas (uma resposta pode ser confirmada
+    # fora da ordem dos ids)
+    analytics_carregada = models.BooleanField(default=False)
+
     class Meta:
         db_table = 'responses_survey_response'
         verbose_name = 'Resposta'
@@ -71,6 +104,11 @@ class SurveyResponse(TimeStampedModel):
             models.Index(fields=['campaign', 'created_at']),
             models.Index(fields=['campaign', 'unidade']),
             models.Index(fields=['campaign', 'setor']),
+            models.Index(
+                fields=['campaign'],
+                name='resp_analytics_pend_idx',
+                condition=models.Q(analytics_carregada=False),
+            ),
         ]
 
     def __str__(self):
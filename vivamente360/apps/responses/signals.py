@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.responses.models import SurveyResponse
+from services.result_cache_service import ResultCacheService
+
+
+@receiver(post_save, sender=SurveyResponse)
+@receiver(post_delete, sender=SurveyResponse)
+def invalidar_resultados_da_campanha(sender, instance, **kwargs):
+    """Nova resposta (ou alteração) torna obsoletos os agregados em cache da campanha."""
+    ResultCacheService.invalidate(instance.campaign_id)
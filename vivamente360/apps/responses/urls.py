@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import SurveyFormView
+from .views import SurveyFormView, SurveySinglePageView
 
 app_name = 'responses'
 
 urlpatterns = [
     path('<uuid:token>/', SurveyFormView.as_view(), name='survey'),
+    path('<uuid:token>/completo/', SurveySinglePageView.as_view(), name='survey_single_page'),
 ]
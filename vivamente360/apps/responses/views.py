@@ -1,16 +1,25 @@
 from django.views import View
+from django.db import transaction
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django_ratelimit.decorators import ratelimit
 from apps.invitations.models import SurveyInvitation
 from apps.responses.models import SurveyResponse
-from apps.surveys.models import Pergunta
+from apps.responses.forms import SurveySubmissionForm, ESCALA
 from services.token_service import TokenService
-from services.notification_service import NotificationService
+from services.response_ingestion_service import ResponseIngestionService
+from services.survey_draft_service import SurveyDraftService
+from services.question_catalog import QuestionCatalog
 
 
 class SurveyFormView(View):
+    """
+    Questionário por etapas (LGPD, dados demográficos e uma pergunta por
+    página). O progresso fica no SurveyDraftService, não na sessão, e vira
+    SurveyResponse uma única vez ao final.
+    """
+
     @method_decorator(ratelimit(key='ip', rate='100/h', method='POST', block=True))
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
@@ -37,15 +46,16 @@ class SurveyFormView(View):
 
         elif step == 'feedback':
             # Etapa de feedback removida - processar diretamente
-            demographics = request.session.get(f'survey_{token}', {})
-            respostas = request.session.get(f'respostas_{token}', {})
+            draft = SurveyDraftService.get(token)
+            demographics = draft['demografia']
+            respostas = draft['respostas']
 
             if not demographics or not demographics.get('faixa_etaria'):
                 return redirect(f'/survey/{token}/?step=demographics')
             if not respostas:
                 return redirect(f'/survey/{token}/?step=1')
 
-            SurveyResponse.objects.create(
+            survey_response = SurveyResponse.objects.create(
                 campaign=invitation.campaign,
                 unidade=invitation.unidade,
                 setor=invitation.setor,
@@ -56,24 +66,27 @@ class SurveyFormView(View):
                 lgpd_aceito=True,
                 lgpd_aceito_em=timezone.now()
             )
+            ResponseIngestionService.enqueue(survey_response)
             TokenService.invalidate_token(invitation)
-            request.session.pop(f'survey_{token}', None)
-            request.session.pop(f'respostas_{token}', None)
+            transaction.on_commit(lambda: SurveyDraftService.discard(token))
             return render(request, 'survey/step_success.html')
 
         else:
-            perguntas = Pergunta.objects.filter(ativo=True).order_by('numero')
+            catalogo = QuestionCatalog.get()
             current_question = int(step) if step.isdigit() else 1
 
-            if current_question > perguntas.count():
+            if current_question > catalogo.total:
                 # Após a última pergunta, redirecionar para feedback
                 return redirect(f'/survey/{token}/?step=feedback')
 
-            pergunta = perguntas[current_question - 1]
+            pergunta = catalogo.pergunta(current_question)
+            if pergunta is None:
+                return redirect(f'/survey/{token}/?step=1')
+
             return render(request, 'survey/step_question.html', {
                 'pergunta': pergunta,
                 'current': current_question,
-                'total': perguntas.count(),
+                'total': catalogo.total,
                 'dimensao': pergunta.dimensao,
                 'escala': [(0, 'Nunca'), (1, 'Raramente'), (2, 'Às vezes'), (3, 'Frequentemente'), (4, 'Sempre')]
             })
@@ -92,11 +105,11 @@ class SurveyFormView(View):
                 return redirect(f'/survey/{token}/?step=demographics')
 
         elif step == 'demographics':
-            request.session[f'survey_{token}'] = {
+            SurveyDraftService.save_demografia(invitation, {
                 'faixa_etaria': request.POST.get('faixa_etaria'),
                 'tempo_empresa': request.POST.get('tempo_empresa'),
                 'genero': request.POST.get('genero')
-            }
+            })
             return redirect(f'/survey/{token}/?step=1')
 
         elif step == 'feedback':
@@ -105,17 +118,12 @@ class SurveyFormView(View):
 
         elif step.isdigit():
             current = int(step)
-            if f'respostas_{token}' not in request.session:
-                request.session[f'respostas_{token}'] = {}
-
-            request.session[f'respostas_{token}'][step] = request.POST.get('valor')
-            request.session.modified = True
+            draft = SurveyDraftService.save_resposta(invitation, step, request.POST.get('valor'))
 
-            perguntas = Pergunta.objects.filter(ativo=True).count()
-            if current >= perguntas:
+            if current >= QuestionCatalog.get().total:
                 # Última pergunta: criar resposta e finalizar
-                demographics = request.session.get(f'survey_{token}', {})
-                respostas = request.session.get(f'respostas_{token}', {})
+                demographics = draft['demografia']
+                respostas = draft['respostas']
 
                 if not demographics or not demographics.get('faixa_etaria'):
                     return redirect(f'/survey/{token}/?step=demographics')
@@ -132,15 +140,96 @@ class SurveyFormView(View):
                     lgpd_aceito_em=timezone.now()
                 )
 
-                NotificationService.enviar_resultado_individual(survey_response)
-                NotificationService.alerta_risco_critico(survey_response)
+                # Scores, agregados e alertas ficam para o worker, após o commit
+                ResponseIngestionService.enqueue(survey_response)
                 TokenService.invalidate_token(invitation)
-
-                request.session.pop(f'survey_{token}', None)
-                request.session.pop(f'respostas_{token}', None)
+                # Descartado só após o commit: se a transação falhar, o
+                # respondente reenvia a última etapa com o rascunho intacto
+                transaction.on_commit(lambda: SurveyDraftService.discard(token))
 
                 return render(request, 'survey/step_success.html')
 
             return redirect(f'/survey/{token}/?step={current + 1}')
 
         return redirect(f'/survey/{token}/')
+
+
+class SurveySinglePageView(View):
+    """
+    Modo alternativo do questionário: todas as perguntas ativas em uma
+    página, com o rascunho mantido no navegador (localStorage), e um único
+    POST com aceite LGPD, dados demográficos e respostas.
+
+    Um GET e um POST por respondente, sem escrita na sessão. As garantias de
+    anonimato são as do fluxo por etapas: a SurveyResponse não referencia o
+    convite e o token é invalidado na mesma transação em que a resposta é
+    criada (com o convite bloqueado, um segundo envio concorrente encontra o
+    token já usado).
+    """
+
+    @method_decorator(ratelimit(key='ip', rate='100/h', method='POST', block=True))
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    @staticmethod
+    def _perguntas():
+        return QuestionCatalog.get().perguntas
+
+    def _render(self, request, invitation, perguntas, form, status=200):
+        return render(request, 'survey/single_page.html', {
+            'campaign': invitation.campaign,
+            'empresa': invitation.empresa,
+            'token': invitation.hash_token,
+            'form': form,
+            'perguntas': [(pergunta, SurveySubmissionForm.field_name(pergunta)) for pergunta in perguntas],
+            'faixa_etaria_choices': SurveyResponse.FAIXA_ETARIA_CHOICES,
+            'tempo_empresa_choices': SurveyResponse.TEMPO_EMPRESA_CHOICES,
+            'genero_choices': SurveyResponse.GENERO_CHOICES,
+            'escala': ESCALA
+        }, status=status)
+
+    def get(self, request, token):
+        invitation = get_object_or_404(
+            SurveyInvitation.objects.select_related('campaign', 'empresa'), hash_token=token
+        )
+        valid, error_msg = TokenService.validate_token(invitation)
+
+        if not valid:
+            return render(request, 'survey/error.html', {'message': error_msg})
+
+        perguntas = self._perguntas()
+        return self._render(request, invitation, perguntas, SurveySubmissionForm(perguntas))
+
+    def post(self, request, token):
+        with transaction.atomic():
+            invitation = get_object_or_404(
+                SurveyInvitation.objects.select_for_update(of=('self',)).select_related('campaign', 'empresa'),
+                hash_token=token
+            )
+            valid, error_msg = TokenService.validate_token(invitation)
+
+            if not valid:
+                return render(request, 'survey/error.html', {'message': error_msg})
+
+            perguntas = self._perguntas()
+            form = SurveySubmissionForm(perguntas, request.POST)
+            if not form.is_valid():
+                return self._render(request, invitation, perguntas, form, status=400)
+
+            respostas = form.cleaned_data['respostas']
+            survey_response = SurveyResponse.objects.create(
+                campaign=invitation.campaign,
+                unidade_id=invitation.unidade_id,
+                setor_id=invitation.setor_id,
+                faixa_etaria=form.cleaned_data['faixa_etaria'],
+                tempo_empresa=form.cleaned_data['tempo_empresa'],
+                genero=form.cleaned_data['genero'],
+                respostas=respostas,
+                lgpd_aceito=True,
+                lgpd_aceito_em=timezone.now()
+            )
+
+            ResponseIngestionService.enqueue(survey_response)
+            TokenService.invalidate_token(invitation)
+
+        return render(request, 'survey/step_success.html', {'draft_key': f'survey_draft_{token}'})
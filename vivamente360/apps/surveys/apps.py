@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SurveysConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.surveys'
+    verbose_name = 'Pesquisas'
+
+    def ready(self):
+        from apps.surveys import signals  # noqa: F401
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.surveys.models import Dimensao, Pergunta
+from services.question_catalog import QuestionCatalog
+
+
+@receiver(post_save, sender=Pergunta)
+@receiver(post_delete, sender=Pergunta)
+@receiver(post_save, sender=Dimensao)
+@receiver(post_delete, sender=Dimensao)
+def invalidar_catalogo(sender, instance, **kwargs):
+    """Edição de pergunta ou dimensão troca o carimbo do catálogo (após o commit)."""
+    transaction.on_commit(QuestionCatalog.invalidate)
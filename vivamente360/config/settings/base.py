@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import base64
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -130,15 +131,139 @@ if not _encryption_key_env or _encryption_key_env in ['your-base64-encryption-ke
 else:
     ENCRYPTION_KEY = _encryption_key_env
 
+# CryptoService.encrypt_many/decrypt_many: processos para lotes grandes
+# (0 = sempre no processo atual)
+CRYPTO_PARALLEL_WORKERS = int(os.environ.get('CRYPTO_PARALLEL_WORKERS', 0))
+
+# Chave (base64) do HMAC do índice cego de e-mails (SurveyInvitation.email_hash).
+# Vazia = derivada de ENCRYPTION_KEY; ao trocá-la, rode backfill_invitation_email_hash --all
+BLIND_INDEX_KEY = os.environ.get('BLIND_INDEX_KEY', '')
+
 EMAIL_PROVIDER = os.environ.get('EMAIL_PROVIDER', 'resend')
 RESEND_API_KEY = os.environ.get('RESEND_API_KEY', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@sistema-gestao-riscos.com.br')
 
+# Cliente HTTP de e-mail (services.email_service.ResendEmailService): URL da API
+# (aponte para `manage.py fake_email_provider` em testes de carga), e-mails por
+# requisição de lote (máx. 100), limite de requisições/s do provedor (token
+# bucket por processo; 0 = sem limite), requisições simultâneas por worker
+# (deliver_emails) e conexões keep-alive no pool
+RESEND_API_URL = os.environ.get('RESEND_API_URL', 'https://api.resend.com')
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 100))
+EMAIL_RATE_LIMIT = float(os.environ.get('EMAIL_RATE_LIMIT', 2))
+EMAIL_RATE_BURST = None
+# Onde fica o saldo do limite: 'local' (padrão; um por processo, o limite
+# efetivo é EMAIL_RATE_LIMIT × número de processos de envio) ou 'redis'
+# (único para todos os processos; padrão em produção)
+EMAIL_RATE_LIMIT_BACKEND = os.environ.get('EMAIL_RATE_LIMIT_BACKEND', 'local')
+EMAIL_RATE_LIMIT_LOCATION = os.environ.get('EMAIL_RATE_LIMIT_LOCATION', 'redis://localhost:6379/3')
+EMAIL_CONCURRENCY = int(os.environ.get('EMAIL_CONCURRENCY', 4))
+EMAIL_HTTP_POOL_SIZE = int(os.environ.get('EMAIL_HTTP_POOL_SIZE', 10))
+EMAIL_HTTP_TIMEOUT = 30
+
 # OpenRouter API Configuration
 OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
 OPENROUTER_MODEL = os.environ.get('OPENROUTER_MODEL', 'openai/gpt-4o')
 OPENROUTER_BASE_URL = os.environ.get('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
 
+# Backend de agregação do dashboard (app_selectors.campaign_aggregator):
+# 'postgres' (fórmula HSE-IT no banco), 'python' (kernel NumPy) ou
+# 'compare' (executa ambos e registra divergências no log)
+DASHBOARD_AGGREGATION_BACKEND = os.environ.get('DASHBOARD_AGGREGATION_BACKEND', 'postgres')
+
+# Cache de resultados analíticos por campanha (services.result_cache_service):
+# 'locmem' (LRU por processo), 'file' (diretório compartilhado) ou 'redis'.
+# No Redis a evicção LRU vem da política do servidor (maxmemory-policy allkeys-lru).
+ANALYTICS_CACHE_BACKEND = os.environ.get('ANALYTICS_CACHE_BACKEND', 'locmem')
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 900))
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYTICS_CACHE_MAX_ENTRIES', 1000))
+
+_ANALYTICS_CACHES = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'analytics',
+        'OPTIONS': {'MAX_ENTRIES': ANALYTICS_CACHE_MAX_ENTRIES},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('ANALYTICS_CACHE_LOCATION', str(BASE_DIR / 'cache' / 'analytics')),
+        'OPTIONS': {'MAX_ENTRIES': ANALYTICS_CACHE_MAX_ENTRIES},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('ANALYTICS_CACHE_LOCATION', 'redis://localhost:6379/1'),
+    },
+}
+
+# Rascunhos do questionário por etapas (services.survey_draft_service): um
+# item por convite, expirando junto com o token. Precisa de um backend
+# compartilhado entre os processos web e que não descarte itens antes do
+# prazo: 'redis' (com maxmemory-policy noeviction ou volatile-*), exigido
+# em produção (config.settings.production). 'locmem', o padrão, só serve em
+# desenvolvimento e testes, com um único processo. O FileBasedCache não é
+# aceito: a cada set ele lista o diretório e, em MAX_ENTRIES, apaga um terço
+# dos rascunhos ao acaso
+SURVEY_DRAFT_CACHE_BACKEND = os.environ.get('SURVEY_DRAFT_CACHE_BACKEND', 'locmem')
+
+_SURVEY_DRAFT_CACHES = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'survey_drafts',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('SURVEY_DRAFT_CACHE_LOCATION', 'redis://localhost:6379/2'),
+    },
+}
+
+if SURVEY_DRAFT_CACHE_BACKEND not in _SURVEY_DRAFT_CACHES:
+    raise ImproperlyConfigured(
+        f"SURVEY_DRAFT_CACHE_BACKEND={SURVEY_DRAFT_CACHE_BACKEND!r}: use 'redis' "
+        "(ou 'locmem' em desenvolvimento, com um único processo)"
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analytics': {
+        **_ANALYTICS_CACHES[ANALYTICS_CACHE_BACKEND],
+        'TIMEOUT': ANALYTICS_CACHE_TIMEOUT,
+        'KEY_PREFIX': 'vivamente360',
+    },
+    'survey_drafts': {
+        **_SURVEY_DRAFT_CACHES[SURVEY_DRAFT_CACHE_BACKEND],
+        'KEY_PREFIX': 'vivamente360',
+    },
+}
+
+# Cache onde fica o carimbo do catálogo de perguntas
+# (services.question_catalog); precisa ser compartilhado entre processos
+# para que edições no admin cheguem a todos, como o de rascunhos
+QUESTION_CATALOG_CACHE = os.environ.get('QUESTION_CATALOG_CACHE', 'survey_drafts')
+
+# Fila de tarefas (services.task_processors.TaskQueueWorker): prazo do lease
+# de uma task reivindicada; vencido, a task volta para a fila. Importações e
+# disparos prorrogam o lease a cada lote (heartbeat); tasks sem progresso
+# intermediário que podem passar do prazo têm um lease próprio por task_type
+TASK_QUEUE_LEASE_SECONDS = int(os.environ.get('TASK_QUEUE_LEASE_SECONDS', 900))
+TASK_QUEUE_LEASE_SECONDS_BY_TYPE = {
+    'generate_sector_analysis': 1800,
+    'export_pgr_document': 1800,
+}
+
+# Escalonamento justo entre empresas: máximo de tasks simultâneas em
+# 'processing' por empresa (0 = sem limite), com exceções e pesos por
+# empresa_id, ex.: TASK_QUEUE_TENANT_CAPS = {12: 8}, TASK_QUEUE_TENANT_WEIGHTS = {12: 2}
+TASK_QUEUE_TENANT_MAX_CONCURRENCY = int(os.environ.get('TASK_QUEUE_TENANT_MAX_CONCURRENCY', 0))
+TASK_QUEUE_TENANT_CAPS = {}
+TASK_QUEUE_TENANT_WEIGHTS = {}
+
+# Retries com backoff exponencial e jitter: segundos da 1ª espera e teto por
+# task_type ('default' para os demais). None usa services.retry_backoff.DEFAULT_POLICIES
+TASK_RETRY_BACKOFF = None
+
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/'
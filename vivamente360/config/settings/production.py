@@ -2,6 +2,13 @@ from .base import *
 
 DEBUG = False
 
+# Com vários processos web o rascunho do questionário precisa estar no Redis
+if SURVEY_DRAFT_CACHE_BACKEND != 'redis':
+    raise ImproperlyConfigured('Em produção SURVEY_DRAFT_CACHE_BACKEND deve ser redis')
+
+# Vários processos enviam e-mail: o limite do provedor é um saldo único no Redis
+EMAIL_RATE_LIMIT_BACKEND = os.environ.get('EMAIL_RATE_LIMIT_BACKEND', 'redis')
+
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '').split(',')
 
 SECURE_SSL_REDIRECT = True
@@ -73,8 +73,8 @@ class AICommentAnalysisService:
 
         if respostas_setor.exists():
             # Calcular média dos scores de todas as respostas
-            from apps.surveys.models import Dimensao
-            dimensoes = Dimensao.objects.filter(ativo=True)
+            from services.question_catalog import QuestionCatalog
+            dimensoes = QuestionCatalog.get().dimensoes
 
             for dimensao in dimensoes:
                 scores_lista = []
@@ -1,43 +1,166 @@
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import hmac
 import os
 import base64
 from django.conf import settings
 
 
-class CryptoService:
-    def __init__(self):
-        key_b64 = settings.ENCRYPTION_KEY
-        if isinstance(key_b64, str):
-            try:
-                self.key = base64.b64decode(key_b64)
-            except Exception as e:
-                raise ValueError(
-                    f"Invalid ENCRYPTION_KEY in settings. The key must be a valid base64-encoded string. "
-                    f"Generate a valid key with: python -c 'import base64, os; print(base64.b64encode(os.urandom(32)).decode())' "
-                    f"Error: {str(e)}"
-                )
-        else:
-            self.key = key_b64
-
-        # Validate key length (must be 32 bytes for AES-256)
-        if len(self.key) != 32:
+@lru_cache(maxsize=4)
+def _load_key(key_b64):
+    """Decodifica e valida a chave uma vez por processo."""
+    if isinstance(key_b64, str):
+        try:
+            key = base64.b64decode(key_b64)
+        except Exception as e:
             raise ValueError(
-                f"Invalid ENCRYPTION_KEY length. Expected 32 bytes, got {len(self.key)} bytes. "
-                f"Generate a valid key with: python -c 'import base64, os; print(base64.b64encode(os.urandom(32)).decode())'"
+                f"Invalid ENCRYPTION_KEY in settings. The key must be a valid base64-encoded string. "
+                f"Generate a valid key with: python -c 'import base64, os; print(base64.b64encode(os.urandom(32)).decode())' "
+                f"Error: {str(e)}"
             )
+    else:
+        key = key_b64
+
+    # Validate key length (must be 32 bytes for AES-256)
+    if len(key) != 32:
+        raise ValueError(
+            f"Invalid ENCRYPTION_KEY length. Expected 32 bytes, got {len(key)} bytes. "
+            f"Generate a valid key with: python -c 'import base64, os; print(base64.b64encode(os.urandom(32)).decode())'"
+        )
+    return key
+
+
+@lru_cache(maxsize=4)
+def _blind_index_key(key, blind_key_b64):
+    """
+    Chave do HMAC do índice cego: BLIND_INDEX_KEY se configurada, senão
+    derivada da chave de criptografia (nunca a mesma chave para os dois usos).
+    """
+    if blind_key_b64:
+        return base64.b64decode(blind_key_b64)
+    return hmac.new(key, b'vivamente360:blind-index:v1', hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=4)
+def _cipher(key):
+    """AESGCM compartilhado pelo processo (é stateless e thread-safe)."""
+    return AESGCM(key)
+
+
+def _encrypt(aesgcm, plaintext):
+    if not plaintext:
+        return ''
+    nonce = os.urandom(12)
+    ciphertext = aesgcm.encrypt(nonce, plaintext.encode(), None)
+    return base64.b64encode(nonce + ciphertext).decode()
+
+
+def _decrypt(aesgcm, encrypted):
+    if not encrypted:
+        return ''
+    data = base64.b64decode(encrypted)
+    nonce, ciphertext = data[:12], data[12:]
+    return aesgcm.decrypt(nonce, ciphertext, None).decode()
+
+
+def _decrypt_or_none(aesgcm, encrypted):
+    try:
+        return _decrypt(aesgcm, encrypted)
+    except Exception:
+        return None
+
+
+# Funções de módulo (picklable) executadas nos processos do pool
+def _encrypt_chunk(key, values):
+    aesgcm = _cipher(key)
+    return [_encrypt(aesgcm, value) for value in values]
+
+
+def _decrypt_chunk(key, values, ignore_errors):
+    aesgcm = _cipher(key)
+    decrypt = _decrypt_or_none if ignore_errors else _decrypt
+    return [decrypt(aesgcm, value) for value in values]
 
-        self.aesgcm = AESGCM(self.key)
+
+class CryptoService:
+    # Lotes menores que isso não compensam o custo de subir processos
+    PARALLEL_THRESHOLD = 20000
+
+    def __init__(self):
+        self.key = _load_key(settings.ENCRYPTION_KEY)
+        self.aesgcm = _cipher(self.key)
+        self.blind_key = _blind_index_key(self.key, getattr(settings, 'BLIND_INDEX_KEY', ''))
 
     def encrypt(self, plaintext: str) -> str:
-        if not plaintext:
-            return ''
-        nonce = os.urandom(12)
-        ciphertext = self.aesgcm.encrypt(nonce, plaintext.encode(), None)
-        return base64.b64encode(nonce + ciphertext).decode()
+        return _encrypt(self.aesgcm, plaintext)
 
     def decrypt(self, encrypted: str) -> str:
-        if not encrypted:
+        return _decrypt(self.aesgcm, encrypted)
+
+    def blind_index(self, value: str) -> str:
+        """
+        HMAC-SHA256 (hex) do valor normalizado (strip + minúsculas).
+
+        Determinístico, ao contrário de encrypt(): permite buscar e deduplicar
+        e-mails por igualdade (SurveyInvitation.email_hash) sem descriptografar.
+        """
+        if not value:
             return ''
-        data = base64.b64decode(encrypted)
-        nonce, ciphertext = data[:12], data[12:]
-        return self.aesgcm.decrypt(nonce, ciphertext, None).decode()
+        return hmac.new(self.blind_key, value.strip().lower().encode(), hashlib.sha256).hexdigest()
+
+    def blind_index_many(self, values) -> list:
+        return [self.blind_index(value) for value in values]
+
+    def encrypt_many(self, values, workers=None) -> list:
+        """
+        Criptografa uma lista de valores, no mesmo formato de encrypt()
+        (base64 de nonce || ciphertext).
+
+        Args:
+            values: lista de strings
+            workers: processos para lotes grandes (padrão:
+                settings.CRYPTO_PARALLEL_WORKERS; 0/1 = no processo atual)
+        """
+        values = list(values)
+        if self._use_pool(values, workers):
+            return self._map_pool(_encrypt_chunk, values, workers)
+
+        aesgcm = self.aesgcm
+        return [_encrypt(aesgcm, value) for value in values]
+
+    def decrypt_many(self, values, workers=None, ignore_errors=False) -> list:
+        """
+        Descriptografa uma lista de valores gerados por encrypt()/encrypt_many().
+
+        Args:
+            workers: ver encrypt_many
+            ignore_errors: devolve None no lugar de valores que não
+                descriptografam (ex.: chave diferente) em vez de levantar
+                a exceção
+        """
+        values = list(values)
+        if self._use_pool(values, workers):
+            return self._map_pool(_decrypt_chunk, values, workers, ignore_errors)
+
+        aesgcm = self.aesgcm
+        decrypt = _decrypt_or_none if ignore_errors else _decrypt
+        return [decrypt(aesgcm, value) for value in values]
+
+    def _use_pool(self, values, workers):
+        if workers is None:
+            workers = getattr(settings, 'CRYPTO_PARALLEL_WORKERS', 0)
+        return workers > 1 and len(values) >= self.PARALLEL_THRESHOLD
+
+    def _map_pool(self, func, values, workers, *args):
+        workers = workers or getattr(settings, 'CRYPTO_PARALLEL_WORKERS', 0)
+        chunk_size = -(-len(values) // workers)
+        chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(func, self.key, chunk, *args) for chunk in chunks]
+            result = []
+            for future in futures:
+                result.extend(future.result())
+        return result
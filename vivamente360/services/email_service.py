@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from services.token_bucket import RedisTokenBucket, TokenBucket
+import hashlib
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,41 +14,209 @@ class EmailServiceBase(ABC):
     def send(self, to: str, subject: str, html_body: str) -> bool:
         pass
 
-    @abstractmethod
+    def send_batch(self, messages: list, concurrency=1) -> list:
+        """
+        Envia vários e-mails. Cada mensagem é um dict com to, subject e html
+        (ou html_body, formato das notificações) e, opcionalmente,
+        idempotency_key (estável entre tentativas, p.ex. o id da task).
+
+        Args:
+            concurrency: máximo de requisições simultâneas ao provedor
+
+        Returns:
+            lista alinhada com `messages` de dicts {'ok': bool, 'id': str,
+            'error': str}
+        """
+        def enviar(message):
+            ok = self.send(message['to'], message['subject'], _html(message))
+            return {'ok': ok, 'id': '', 'error': '' if ok else 'Falha no envio'}
+
+        return _map_concorrente(enviar, messages, concurrency)
+
     def send_bulk(self, emails: list) -> dict:
-        pass
+        results = self.send_batch(emails)
+        success = sum(1 for result in results if result['ok'])
+        return {"success": success, "failed": len(results) - success}
+
+
+def _html(message):
+    return message.get('html') or message.get('html_body') or ''
+
+
+def _map_concorrente(func, items, concurrency):
+    """map() com até `concurrency` chamadas em paralelo (threads), preservando a ordem."""
+    if concurrency <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+# Sessão HTTP por processo (conexões keep-alive reaproveitadas entre envios)
+# e limitador de requisições/s. Com EMAIL_RATE_LIMIT_BACKEND='redis' o
+# orçamento é único para todos os processos que enviam e-mail
+# (process_task_queue, deliver_emails, process_email_queue, Celery); com
+# 'local' cada processo tem o seu e o limite se multiplica pelo número deles
+_session = None
+_rate_limiter = None
+_lock = threading.Lock()
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                # Uma conexão por requisição em voo (EMAIL_CONCURRENCY)
+                pool_size = max(
+                    getattr(settings, 'EMAIL_HTTP_POOL_SIZE', 10),
+                    getattr(settings, 'EMAIL_CONCURRENCY', 1)
+                )
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                _session = session
+    return _session
+
+
+def _get_rate_limiter():
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _lock:
+            if _rate_limiter is None:
+                rate = getattr(settings, 'EMAIL_RATE_LIMIT', 2)
+                burst = getattr(settings, 'EMAIL_RATE_BURST', None)
+                if getattr(settings, 'EMAIL_RATE_LIMIT_BACKEND', 'local') == 'redis':
+                    import redis
+
+                    _rate_limiter = RedisTokenBucket(
+                        redis.Redis.from_url(settings.EMAIL_RATE_LIMIT_LOCATION),
+                        'vivamente360:email-rate-limit',
+                        rate,
+                        burst
+                    )
+                else:
+                    _rate_limiter = TokenBucket(rate, burst)
+    return _rate_limiter
 
 
 class ResendEmailService(EmailServiceBase):
-    def __init__(self):
+    """
+    Cliente da API HTTP do Resend: POST /emails para um e-mail e
+    POST /emails/batch para até EMAIL_BATCH_SIZE (máx. 100) por requisição.
+    RESEND_API_URL permite apontar para o provedor falso
+    (services/fake_email_provider.py) em benchmarks.
+    """
+
+    MAX_BATCH_SIZE = 100
+
+    def __init__(self, api_url=None, batch_size=None, rate_limiter=None):
         self.api_key = settings.RESEND_API_KEY
         self.from_email = settings.DEFAULT_FROM_EMAIL
+        self.api_url = (api_url or getattr(settings, 'RESEND_API_URL', 'https://api.resend.com')).rstrip('/')
+        self.batch_size = min(batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 100), self.MAX_BATCH_SIZE)
+        self.timeout = getattr(settings, 'EMAIL_HTTP_TIMEOUT', 30)
+        self.rate_limiter = rate_limiter or _get_rate_limiter()
+
+    def _post(self, path, body, idempotency_key=None):
+        self.rate_limiter.acquire()
+        headers = {'Authorization': f'Bearer {self.api_key}'}
+        if idempotency_key:
+            headers['Idempotency-Key'] = idempotency_key
+        response = _get_session().post(
+            f"{self.api_url}{path}",
+            json=body,
+            headers=headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _message(self, message):
+        return {
+            "from": self.from_email,
+            "to": message['to'],
+            "subject": message['subject'],
+            "html": _html(message),
+        }
 
     def send(self, to: str, subject: str, html_body: str) -> bool:
         try:
-            import resend
-            resend.api_key = self.api_key
-
-            resend.Emails.send({
-                "from": self.from_email,
-                "to": to,
-                "subject": subject,
-                "html": html_body,
-            })
+            self._post('/emails', self._message({'to': to, 'subject': subject, 'html': html_body}))
             return True
         except Exception as e:
             logger.error(f"Erro ao enviar email: {e}")
             return False
 
-    def send_bulk(self, emails: list) -> dict:
-        success = 0
-        failed = 0
-        for email in emails:
-            if self.send(email['to'], email['subject'], email['html']):
-                success += 1
-            else:
-                failed += 1
-        return {"success": success, "failed": failed}
+    @staticmethod
+    def _chave_lote(chunk):
+        """
+        Idempotency-Key do lote, derivada das chaves das mensagens (o id da
+        task): reenviar o mesmo lote não duplica e-mails no provedor.
+        """
+        chaves = [message.get('idempotency_key') for message in chunk]
+        if not all(chaves):
+            return None
+        return 'lote-' + hashlib.sha256('|'.join(chaves).encode()).hexdigest()
+
+    @staticmethod
+    def _erro_de_validacao(erro):
+        """4xx do provedor (exceto 409/429): o lote foi recusado pelo conteúdo."""
+        status = getattr(getattr(erro, 'response', None), 'status_code', None)
+        return status is not None and 400 <= status < 500 and status not in (409, 429)
+
+    def _send_one(self, message):
+        """Envia uma mensagem por /emails (fallback de um lote recusado)."""
+        try:
+            data = self._post('/emails', self._message(message), message.get('idempotency_key'))
+            return {'ok': True, 'id': data.get('id', ''), 'error': ''}
+        except Exception as e:
+            logger.error(f"Erro ao enviar email: {e}")
+            return {'ok': False, 'id': '', 'error': str(e)}
+
+    def _send_chunk(self, chunk):
+        """
+        Envia um lote por /emails/batch com Idempotency-Key. Timeout, erro
+        de conexão, 5xx ou 429 repetem o lote uma vez com a mesma chave (o
+        provedor descarta a duplicata se o primeiro envio chegou). Um 4xx de
+        validação recusa o lote inteiro por causa de uma mensagem; nesse caso
+        cada uma é reenviada por /emails e recebe o seu próprio resultado.
+        """
+        chave = self._chave_lote(chunk)
+        body = [self._message(message) for message in chunk]
+        erro = None
+        for _ in range(2):
+            try:
+                data = self._post('/emails/batch', body, chave)
+                ids = [item.get('id', '') for item in data.get('data', [])]
+                if len(ids) != len(chunk):
+                    raise ValueError(f"Resposta do lote com {len(ids)} itens para {len(chunk)} mensagens")
+                return [{'ok': True, 'id': id_, 'error': ''} for id_ in ids]
+            except Exception as e:
+                erro = e
+                if self._erro_de_validacao(e) or isinstance(e, ValueError) or not chave:
+                    break
+
+        if self._erro_de_validacao(erro):
+            logger.warning(f"Lote de {len(chunk)} emails recusado ({erro}); enviando um a um")
+            return [self._send_one(message) for message in chunk]
+
+        logger.error(f"Erro ao enviar lote de {len(chunk)} emails: {erro}")
+        return [{'ok': False, 'id': '', 'error': str(erro)} for _ in chunk]
+
+    def send_batch(self, messages: list, concurrency=1) -> list:
+        """
+        Divide `messages` em lotes de batch_size e envia até `concurrency`
+        lotes ao mesmo tempo (cada um uma requisição /emails/batch).
+        """
+        chunks = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+        return [
+            result
+            for results in _map_concorrente(self._send_chunk, chunks, concurrency)
+            for result in results
+        ]
 
 
 def get_email_service() -> EmailServiceBase:
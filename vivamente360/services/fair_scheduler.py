@@ -0,0 +1,72 @@
+"""
+Divisão justa dos slots de um ciclo de claim entre empresas (tenants).
+
+Deficit round-robin ponderado: a cada rodada toda empresa com tasks
+pendentes recebe `peso` créditos; as de maior crédito são atendidas
+primeiro e cada task reivindicada consome um crédito. O crédito não usado
+é carregado para o próximo ciclo (por isso uma empresa que perdeu a vez
+passa à frente no ciclo seguinte) e é zerado quando a empresa esvazia a
+fila. Limites de concorrência por empresa (tasks em 'processing') cortam a
+alocação.
+
+Módulo sem dependência do Django, usado por TaskQueueWorker.claim_tasks.
+"""
+from collections import defaultdict
+import threading
+
+
+class FairScheduler:
+
+    def __init__(self):
+        self._deficits = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def alocar(self, quantidade, pendentes, em_execucao=None, pesos=None, limites=None, chave=None):
+        """
+        Distribui `quantidade` slots entre as empresas.
+
+        Args:
+            quantidade: total de tasks a reivindicar
+            pendentes: dict empresa_id -> tasks pendentes
+            em_execucao: dict empresa_id -> tasks já em 'processing'
+            pesos: dict empresa_id -> peso (padrão 1)
+            limites: dict empresa_id -> máximo em 'processing' (None/0 = sem limite)
+            chave: separa os créditos por fila (ex.: nome da fila)
+
+        Returns:
+            dict empresa_id -> número de tasks a reivindicar
+        """
+        em_execucao = em_execucao or {}
+        pesos = pesos or {}
+        limites = limites or {}
+        alocacao = defaultdict(int)
+
+        def disponivel(empresa):
+            livres = pendentes[empresa] - alocacao[empresa]
+            limite = limites.get(empresa)
+            if limite:
+                livres = min(livres, limite - em_execucao.get(empresa, 0) - alocacao[empresa])
+            return max(0, livres)
+
+        with self._lock:
+            # Empresas que saíram da fila perdem o crédito acumulado
+            for (fila, empresa) in list(self._deficits):
+                if fila == chave and not pendentes.get(empresa):
+                    del self._deficits[(fila, empresa)]
+
+            ativas = [empresa for empresa in pendentes if disponivel(empresa) > 0]
+            while quantidade > 0 and ativas:
+                for empresa in ativas:
+                    self._deficits[(chave, empresa)] += max(pesos.get(empresa, 1), 0.1)
+
+                for empresa in sorted(ativas, key=lambda e: self._deficits[(chave, e)], reverse=True):
+                    if quantidade == 0:
+                        break
+                    slots = min(int(self._deficits[(chave, empresa)]), quantidade, disponivel(empresa))
+                    alocacao[empresa] += slots
+                    self._deficits[(chave, empresa)] -= slots
+                    quantidade -= slots
+
+                ativas = [empresa for empresa in ativas if disponivel(empresa) > 0]
+
+        return {empresa: slots for empresa, slots in alocacao.items() if slots}
@@ -0,0 +1,85 @@
+"""
+Provedor de e-mail falso, compatível com os endpoints usados pelo
+ResendEmailService (POST /emails e POST /emails/batch), para medir a vazão
+do envio sem rede nem cota do provedor real.
+
+Cada requisição espera `latency` segundos (simulando o round-trip) e falha
+com HTTP 500 com probabilidade `fail_rate`. Iniciado pelos comandos
+fake_email_provider e benchmark_email.
+
+Módulo sem dependência do Django.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+import uuid
+
+
+class FakeEmailProvider:
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.05, fail_rate=0.0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.emails = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+                time.sleep(provider.latency)
+
+                if self.path not in ('/emails', '/emails/batch'):
+                    return self._reply(404, {'message': 'Not found'})
+
+                if provider.fail_rate and random.random() < provider.fail_rate:
+                    return self._reply(500, {'message': 'Falha simulada'})
+
+                mensagens = body if self.path == '/emails/batch' else [body]
+                with provider._lock:
+                    provider.requests += 1
+                    provider.emails += len(mensagens)
+
+                ids = [{'id': str(uuid.uuid4())} for _ in mensagens]
+                self._reply(200, {'data': ids} if self.path == '/emails/batch' else ids[0])
+
+            def _reply(self, status, data):
+                content = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Atende em uma thread em background."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,5 +1,8 @@
 import csv
 from io import StringIO
+from itertools import islice
+from django.db import transaction
+from django.utils import timezone
 from apps.structure.models import Unidade, Setor, Cargo
 from apps.invitations.models import SurveyInvitation
 from services.token_service import TokenService
@@ -8,6 +11,9 @@ from services.token_service import TokenService
 class ImportService:
     REQUIRED_COLUMNS = ['unidade', 'setor', 'cargo', 'email']
 
+    # Linhas por lote: uma transação, um bulk_create e um save de progresso
+    CHUNK_SIZE = 2000
+
     @classmethod
     def validate_csv(cls, file_content: str):
         try:
@@ -26,40 +32,177 @@ class ImportService:
         except Exception as e:
             return False, f"Erro ao processar CSV: {str(e)}", []
 
+    @staticmethod
+    def iter_csv(file):
+        """
+        Lê o CSV linha a linha de um arquivo binário (upload ou
+        default_storage.open), sem carregar o arquivo inteiro em memória.
+        """
+        return csv.DictReader(line.decode('utf-8') for line in file)
+
+    @classmethod
+    def validate_csv_file(cls, file):
+        """
+        Valida cabeçalho e conta as linhas de um CSV em streaming.
+
+        Returns:
+            (valido, erro, total_linhas)
+        """
+        try:
+            reader = cls.iter_csv(file)
+            headers = reader.fieldnames or []
+
+            missing = [col for col in cls.REQUIRED_COLUMNS if col not in headers]
+            if missing:
+                return False, f"Colunas faltando: {', '.join(missing)}", 0
+
+            total = sum(1 for _ in reader)
+            if not total:
+                return False, "Arquivo vazio", 0
+
+            return True, "", total
+        except Exception as e:
+            return False, f"Erro ao processar CSV: {str(e)}", 0
+
     @classmethod
-    def process_import(cls, empresa, campaign, rows: list, crypto_service) -> dict:
+    def process_import(cls, empresa, campaign, rows, crypto_service, progress_callback=None) -> dict:
+        """
+        Importa convites em lotes de CHUNK_SIZE linhas.
+
+        A estrutura da empresa é carregada uma vez em dicionários; por lote,
+        Unidade/Setor/Cargo que faltam são criados com bulk_create, os
+        e-mails são criptografados juntos e os convites gravados com um
+        bulk_create, tudo na mesma transação.
+
+        Duplicatas são detectadas pelo índice cego (email_hash), com uma
+        consulta por lote: e-mail repetido no arquivo é reportado como erro;
+        e-mail que já tem convite na campanha atualiza a estrutura do convite
+        se ele ainda está pendente e é ignorado caso contrário.
+
+        Args:
+            rows: iterável de dicts (lista ou leitor em streaming, ver iter_csv)
+            progress_callback: chamado após cada lote com (linhas_lidas, criados)
+        """
         created = 0
+        updated = 0
+        skipped = 0
         errors = []
+        lidas = 0
+        vistos = set()
+
+        unidades = {u.nome: u for u in Unidade.objects.filter(empresa=empresa)}
+        setores = {(s.unidade_id, s.nome): s for s in Setor.objects.filter(unidade__empresa=empresa)}
+        cargos = {c.nome: c for c in Cargo.objects.filter(empresa=empresa)}
+        expires_at = TokenService.get_expiry()
+
+        linhas = enumerate(rows, start=2)
+        while True:
+            lote = list(islice(linhas, cls.CHUNK_SIZE))
+            if not lote:
+                break
+            lidas += len(lote)
 
-        for i, row in enumerate(rows, start=2):
-            try:
-                unidade, _ = Unidade.objects.get_or_create(
-                    empresa=empresa,
-                    nome=row['unidade'].strip()
+            validas = []
+            for i, row in lote:
+                campos = {col: (row.get(col) or '').strip() for col in cls.REQUIRED_COLUMNS}
+                vazios = [col for col, valor in campos.items() if not valor]
+                if vazios:
+                    errors.append(f"Linha {i}: campos vazios: {', '.join(vazios)}")
+                    continue
+                campos['email'] = campos['email'].lower()
+                campos['email_hash'] = crypto_service.blind_index(campos['email'])
+                if campos['email_hash'] in vistos:
+                    errors.append(f"Linha {i}: e-mail repetido no arquivo")
+                    continue
+                vistos.add(campos['email_hash'])
+                validas.append(campos)
+
+            existentes = {
+                invitation.email_hash: invitation
+                for invitation in SurveyInvitation.objects.filter(
+                    campaign=campaign, email_hash__in=[c['email_hash'] for c in validas]
+                ).only('id', 'email_hash', 'status', 'unidade_id', 'setor_id', 'cargo_id')
+            }
+
+            with transaction.atomic():
+                cls._criar_faltantes(
+                    unidades, {c['unidade'] for c in validas},
+                    lambda nome: Unidade(empresa=empresa, nome=nome),
+                    lambda nomes: Unidade.objects.filter(empresa=empresa, nome__in=nomes),
+                    lambda u: u.nome
                 )
-                setor, _ = Setor.objects.get_or_create(
-                    unidade=unidade,
-                    nome=row['setor'].strip()
+                cls._criar_faltantes(
+                    setores, {(unidades[c['unidade']].id, c['setor']) for c in validas},
+                    lambda chave: Setor(unidade_id=chave[0], nome=chave[1]),
+                    lambda chaves: Setor.objects.filter(
+                        unidade_id__in={u for u, _ in chaves}, nome__in={n for _, n in chaves}
+                    ),
+                    lambda s: (s.unidade_id, s.nome)
                 )
-                cargo, _ = Cargo.objects.get_or_create(
-                    empresa=empresa,
-                    nome=row['cargo'].strip()
+                cls._criar_faltantes(
+                    cargos, {c['cargo'] for c in validas},
+                    lambda nome: Cargo(empresa=empresa, nome=nome),
+                    lambda nomes: Cargo.objects.filter(empresa=empresa, nome__in=nomes),
+                    lambda c: c.nome
                 )
 
-                email_encrypted = crypto_service.encrypt(row['email'].strip().lower())
+                novos = [c for c in validas if c['email_hash'] not in existentes]
+                emails = crypto_service.encrypt_many([c['email'] for c in novos])
+
+                convites = []
+                for campos, email_encrypted in zip(novos, emails):
+                    unidade = unidades[campos['unidade']]
+                    convites.append(SurveyInvitation(
+                        empresa=empresa,
+                        campaign=campaign,
+                        unidade=unidade,
+                        setor=setores[(unidade.id, campos['setor'])],
+                        cargo=cargos[campos['cargo']],
+                        email_encrypted=email_encrypted,
+                        email_hash=campos['email_hash'],
+                        expires_at=expires_at
+                    ))
+                SurveyInvitation.objects.bulk_create(convites, batch_size=cls.CHUNK_SIZE)
+                created += len(convites)
 
-                SurveyInvitation.objects.create(
-                    empresa=empresa,
-                    campaign=campaign,
-                    unidade=unidade,
-                    setor=setor,
-                    cargo=cargo,
-                    email_encrypted=email_encrypted,
-                    expires_at=TokenService.get_expiry()
+                # Reimportação: convites pendentes recebem a estrutura nova
+                atualizar = []
+                now = timezone.now()
+                for campos in validas:
+                    invitation = existentes.get(campos['email_hash'])
+                    if invitation is None:
+                        continue
+                    if invitation.status != 'pending':
+                        skipped += 1
+                        continue
+                    unidade = unidades[campos['unidade']]
+                    invitation.unidade = unidade
+                    invitation.setor = setores[(unidade.id, campos['setor'])]
+                    invitation.cargo = cargos[campos['cargo']]
+                    invitation.updated_at = now
+                    atualizar.append(invitation)
+                SurveyInvitation.objects.bulk_update(
+                    atualizar, ['unidade', 'setor', 'cargo', 'updated_at'], batch_size=cls.CHUNK_SIZE
                 )
-                created += 1
+                updated += len(atualizar)
+
+            if progress_callback:
+                progress_callback(lidas, created)
+
+        return {"created": created, "updated": updated, "skipped": skipped, "errors": errors}
 
-            except Exception as e:
-                errors.append(f"Linha {i}: {str(e)}")
+    @staticmethod
+    def _criar_faltantes(cache, chaves, novo, buscar, chave_de):
+        """
+        Cria em lote os registros de `chaves` que não estão no cache e
+        recarrega-os (ignore_conflicts cobre imports concorrentes; as pks
+        vêm da releitura).
+        """
+        faltantes = [chave for chave in chaves if chave not in cache]
+        if not faltantes:
+            return
 
-        return {"created": created, "errors": errors}
+        model = type(novo(faltantes[0]))
+        model.objects.bulk_create([novo(chave) for chave in faltantes], ignore_conflicts=True)
+        for obj in buscar(faltantes):
+            cache.setdefault(chave_de(obj), obj)
@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.utils import timezone
+from apps.core.models import TaskQueue
+from apps.invitations.models import SurveyInvitation
+from app_selectors.keyset import lotes_por_id
+from services.crypto_service import CryptoService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InvitationDispatchService:
+    """
+    Fan-out do disparo de convites: percorre os convites pendentes da
+    campanha por chave (id) e, a cada lote, cria as tasks send_email e marca
+    os convites como enviados na mesma transação. Executado em background
+    pela task 'dispatch_invitations' (TaskProcessor).
+    """
+
+    # Convites por lote: uma transação com um bulk_create e um bulk_update
+    CHUNK_SIZE = 1000
+
+    @staticmethod
+    def build_email(campaign, invitation, email, base_url):
+        """Payload da task send_email de um convite."""
+        magic_link = f"{base_url}/survey/{invitation.hash_token}/"
+
+        html_body = f"""
+                <h2>Pesquisa de Clima Organizacional - {campaign.empresa.nome_app}</h2>
+                <p>Você foi convidado(a) a participar da pesquisa {campaign.nome}.</p>
+                <p><a href="{magic_link}">Clique aqui para responder</a></p>
+                <p>Este link expira em 48 horas e só pode ser usado uma vez.</p>
+                """
+
+        return {
+            'to': email,
+            'subject': f'Pesquisa {campaign.nome} - {campaign.empresa.nome}',
+            'html': html_body,
+            'invitation_id': invitation.id
+        }
+
+    @classmethod
+    def dispatch(cls, campaign, base_url, ultimo_id=0, progress_callback=None):
+        """
+        Enfileira o e-mail de todos os convites pendentes da campanha.
+
+        Args:
+            base_url: esquema + host para o link (ex.: https://app.exemplo.com)
+            ultimo_id: retoma a partir deste id (retry da task)
+            progress_callback: chamado após cada lote com
+                (ultimo_id, processados, total, enviados)
+
+        Returns:
+            dict com enviados, falhas e falhas_ids (até 10 convites cujo
+            e-mail não pôde ser descriptografado)
+        """
+        crypto_service = CryptoService()
+        pendentes = SurveyInvitation.objects.filter(campaign=campaign, status='pending')
+        total = pendentes.filter(id__gt=ultimo_id).count()
+
+        enviados = 0
+        falhas = 0
+        falhas_ids = []
+
+        lotes = lotes_por_id(
+            pendentes, cls.CHUNK_SIZE, ultimo_id, campos=['id', 'hash_token', 'email_encrypted']
+        )
+        for lote in lotes:
+            emails = crypto_service.decrypt_many(
+                [invitation.email_encrypted for invitation in lote], ignore_errors=True
+            )
+
+            now = timezone.now()
+            tasks = []
+            convites = []
+            for invitation, email in zip(lote, emails):
+                if email is None:
+                    falhas += 1
+                    if len(falhas_ids) < 10:
+                        falhas_ids.append(invitation.id)
+                    logger.error(
+                        f"Erro de descriptografia para convite ID {invitation.id}. "
+                        f"O email pode ter sido criptografado com uma chave diferente."
+                    )
+                    continue
+
+                tasks.append(TaskQueue(
+                    task_type='send_email',
+                    payload=cls.build_email(campaign, invitation, email, base_url),
+                    empresa=campaign.empresa
+                ))
+                invitation.status = 'sent'
+                invitation.sent_at = now
+                invitation.updated_at = now
+                convites.append(invitation)
+
+            with transaction.atomic():
+                TaskQueue.objects.bulk_enqueue(tasks, batch_size=cls.CHUNK_SIZE)
+                SurveyInvitation.objects.bulk_update(
+                    convites, ['status', 'sent_at', 'updated_at'], batch_size=cls.CHUNK_SIZE
+                )
+
+            enviados += len(convites)
+            ultimo_id = lote[-1].id
+            if progress_callback:
+                progress_callback(ultimo_id, enviados + falhas, total, enviados)
+
+        return {'enviados': enviados, 'falhas': falhas, 'falhas_ids': falhas_ids}
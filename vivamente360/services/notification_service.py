@@ -49,7 +49,7 @@ class NotificationService:
         if task_metadata:
             payload['metadata'] = task_metadata
 
-        task = TaskQueue.objects.create(
+        task = TaskQueue.objects.enqueue(
             task_type='send_notification_email',
             payload=payload,
             status='pending'
@@ -236,6 +236,120 @@ class NotificationService:
             logger.error(f"Erro ao enviar alerta de risco crítico: {str(e)}", exc_info=True)
             return []
 
+    @staticmethod
+    def novas_respostas(campaign, total):
+        """
+        Versão em lote de enviar_resultado_individual: uma notificação in-app
+        ao gestor da campanha para `total` respostas recebidas.
+        """
+        if not campaign.created_by:
+            return None
+
+        from apps.core.models import UserNotification
+        try:
+            return UserNotification.objects.create(
+                user=campaign.created_by,
+                empresa=campaign.empresa,
+                notification_type='info',
+                title=f'Nova resposta - {campaign.nome}' if total == 1 else f'{total} novas respostas - {campaign.nome}',
+                message=(
+                    f'Uma nova resposta foi registrada na campanha {campaign.nome}.' if total == 1
+                    else f'{total} novas respostas foram registradas na campanha {campaign.nome}.'
+                ),
+                link_url=f'/dashboard/?campaign={campaign.id}',
+                link_text='Ver Dashboard',
+            )
+        except Exception as e:
+            logger.error(f"Erro ao notificar novas respostas: {str(e)}", exc_info=True)
+            return None
+
+    @staticmethod
+    def _dimensoes_criticas(survey_response):
+        """Dimensões em atenção (nível >= 9) ou crítico (>= 13), pelos níveis materializados."""
+        from services.score_service import ScoreService
+
+        dimensoes = []
+        for dimensao in ScoreService.DIMENSOES:
+            nivel = getattr(survey_response, f'nivel_{dimensao}')
+            if nivel is None or nivel < 9:
+                continue
+            dimensoes.append({
+                'dimensao': dimensao,
+                'score': float(getattr(survey_response, f'score_{dimensao}')),
+                'nivel': 'crítico' if nivel >= 13 else 'atenção'
+            })
+        return dimensoes
+
+    @staticmethod
+    def alertas_risco_critico_lote(survey_responses):
+        """
+        Versão em lote de alerta_risco_critico, a partir dos scores
+        materializados: um alerta por campanha e setor com as respostas em
+        risco crítico do lote (mesmo critério: alguma dimensão crítica ou
+        três ou mais em atenção).
+
+        NOTA DE ANONIMIDADE: como no alerta individual, apenas o setor e as
+        dimensões são informados; o score de cada dimensão é a média das
+        respostas em risco do grupo.
+
+        Returns:
+            list: tarefas de e-mail enfileiradas
+        """
+        grupos = {}
+        for survey_response in survey_responses:
+            dimensoes_criticas = NotificationService._dimensoes_criticas(survey_response)
+            tem_risco_critico = any(
+                d['nivel'] == 'crítico' for d in dimensoes_criticas
+            ) or len(dimensoes_criticas) >= 3
+            if not tem_risco_critico:
+                continue
+
+            grupo = grupos.setdefault((survey_response.campaign_id, survey_response.setor_id), {
+                'campaign': survey_response.campaign,
+                'setor': survey_response.setor,
+                'total': 0,
+                'dimensoes': {},
+            })
+            grupo['total'] += 1
+            for d in dimensoes_criticas:
+                acumulado = grupo['dimensoes'].setdefault(d['dimensao'], {'scores': [], 'nivel': 'atenção'})
+                acumulado['scores'].append(d['score'])
+                if d['nivel'] == 'crítico':
+                    acumulado['nivel'] = 'crítico'
+
+        tasks = []
+        for grupo in grupos.values():
+            campaign = grupo['campaign']
+            if not (campaign.created_by and campaign.created_by.email):
+                continue
+            try:
+                dimensoes_criticas = [
+                    {'dimensao': dimensao, 'score': sum(d['scores']) / len(d['scores']), 'nivel': d['nivel']}
+                    for dimensao, d in grupo['dimensoes'].items()
+                ]
+                html_body = render_to_string('emails/alerta_risco_critico.html', {
+                    'campaign': campaign,
+                    'dimensoes_criticas': dimensoes_criticas,
+                    'empresa': campaign.empresa,
+                    'setor': grupo['setor'],
+                    'total_respostas': grupo['total'],
+                })
+                tasks.append(NotificationService._enfileirar_email(
+                    to_email=campaign.created_by.email,
+                    subject=f"Alerta: Risco critico detectado - {campaign.nome}",
+                    html_body=html_body,
+                    task_metadata={
+                        'tipo': 'alerta_risco_critico',
+                        'campaign_id': campaign.id,
+                        'dimensoes_criticas': len(dimensoes_criticas),
+                        'respostas': grupo['total'],
+                    }
+                ))
+            except Exception as e:
+                logger.error(f"Erro ao enviar alerta de risco crítico: {str(e)}", exc_info=True)
+
+        return tasks
+
     @staticmethod
     def alerta_prazo_vencendo(plano_acao, dias_antecedencia=7):
         """
@@ -0,0 +1,95 @@
+"""
+Cache em processo do catálogo do questionário (perguntas e dimensões ativas).
+
+O catálogo HSE-IT quase nunca muda, mas era relido a cada etapa do
+questionário e a cada relatório. Aqui ele é carregado uma vez por processo
+em um snapshot imutável (tuplas ordenadas, com a dimensão de cada pergunta
+já carregada) e reaproveitado até o carimbo do catálogo mudar.
+
+O carimbo fica no cache compartilhado QUESTION_CATALOG_CACHE e é trocado
+pelo post_save/post_delete de Pergunta e Dimensao (apps.surveys.signals),
+após o commit. Cada processo confere o carimbo no máximo a cada
+CHECK_INTERVAL segundos, então uma edição no admin chega aos demais
+processos nesse prazo; no processo que editou, é imediata.
+
+Os objetos do snapshot são compartilhados entre requisições: somente
+leitura.
+"""
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import caches
+import threading
+import time
+import uuid
+
+
+@dataclass(frozen=True)
+class Catalogo:
+    carimbo: str
+    perguntas: tuple
+    dimensoes: tuple
+
+    @property
+    def total(self):
+        return len(self.perguntas)
+
+    def pergunta(self, posicao):
+        """Pergunta na posição `posicao` (1-based, ordem do questionário) ou None."""
+        if 1 <= posicao <= len(self.perguntas):
+            return self.perguntas[posicao - 1]
+        return None
+
+
+class QuestionCatalog:
+    CHAVE_CARIMBO = 'question-catalog:carimbo'
+    CHECK_INTERVAL = 5
+
+    _catalogo = None
+    _conferido_em = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, 'QUESTION_CATALOG_CACHE', 'default')]
+
+    @classmethod
+    def _carimbo(cls):
+        cache = cls._cache()
+        carimbo = cache.get(cls.CHAVE_CARIMBO)
+        if carimbo is None:
+            cache.add(cls.CHAVE_CARIMBO, uuid.uuid4().hex, timeout=None)
+            carimbo = cache.get(cls.CHAVE_CARIMBO)
+        return carimbo
+
+    @staticmethod
+    def _carregar(carimbo):
+        from apps.surveys.models import Dimensao, Pergunta
+
+        perguntas = Pergunta.objects.filter(ativo=True).select_related('dimensao').order_by('numero', 'id')
+        return Catalogo(
+            carimbo=carimbo,
+            perguntas=tuple(perguntas),
+            dimensoes=tuple(Dimensao.objects.filter(ativo=True))
+        )
+
+    @classmethod
+    def get(cls):
+        """Snapshot atual do catálogo; consulta o banco só quando o carimbo muda."""
+        catalogo = cls._catalogo
+        agora = time.monotonic()
+        if catalogo is not None and agora - cls._conferido_em < cls.CHECK_INTERVAL:
+            return catalogo
+
+        with cls._lock:
+            carimbo = cls._carimbo()
+            if cls._catalogo is None or cls._catalogo.carimbo != carimbo:
+                cls._catalogo = cls._carregar(carimbo)
+            cls._conferido_em = agora
+            return cls._catalogo
+
+    @classmethod
+    def invalidate(cls):
+        """Troca o carimbo (todos os processos recarregam) e descarta o snapshot local."""
+        cls._cache().set(cls.CHAVE_CARIMBO, uuid.uuid4().hex, timeout=None)
+        with cls._lock:
+            cls._catalogo = None
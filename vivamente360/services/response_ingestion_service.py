@@ -0,0 +1,100 @@
+from django.db import transaction
+from apps.core.models import TaskQueue
+from apps.responses.models import SurveyResponse
+from services.score_service import ScoreService
+from services.notification_service import NotificationService
+from tasks.analytics_tasks import rebuild_campaign_analytics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseIngestionService:
+    """
+    Pós-processamento das respostas do questionário, fora da requisição do
+    respondente: a view grava a SurveyResponse e, após o commit, enfileira
+    uma task leve 'response_ingested'. O worker reúne essas tasks em lotes
+    (TaskProcessor.process_ingestion_batch) e, para cada lote:
+
+    1. materializa os scores das respostas ainda sem score (um bulk_update);
+    2. atualiza os fatos analíticos das campanhas (rebuild incremental);
+    3. avisa o gestor das novas respostas e decide os alertas de risco
+       crítico, agrupados por campanha e setor.
+
+    Se a task se perder (processo encerrado entre o commit e o enqueue), os
+    comandos backfill_response_scores e rebuild_analytics recuperam os
+    passos 1 e 2.
+    """
+
+    CAMPOS_SCORE = (
+        [f'score_{dimensao}' for dimensao in ScoreService.DIMENSOES]
+        + [f'nivel_{dimensao}' for dimensao in ScoreService.DIMENSOES]
+        + ['igrp_individual']
+    )
+
+    @staticmethod
+    def enqueue(survey_response):
+        """Enfileira a task da resposta quando a transação atual confirmar."""
+        payload = {'response_id': survey_response.id, 'campaign_id': survey_response.campaign_id}
+        empresa_id = survey_response.campaign.empresa_id
+
+        transaction.on_commit(lambda: TaskQueue.objects.enqueue(
+            task_type='response_ingested',
+            payload=payload,
+            empresa_id=empresa_id
+        ))
+
+    @classmethod
+    def _materializar_scores(cls, respostas):
+        pendentes = [response for response in respostas if response.igrp_individual is None]
+        if not pendentes:
+            return 0
+
+        scores = ScoreService.score_matrix(pendentes)
+        valores = ScoreService.campos_materializados_matriz(scores, ScoreService.nivel_matrix(scores))
+        for response, campos in zip(pendentes, valores):
+            for campo, valor in campos.items():
+                setattr(response, campo, valor)
+
+        SurveyResponse.objects.bulk_update(pendentes, cls.CAMPOS_SCORE)
+        return len(pendentes)
+
+    @classmethod
+    def ingest(cls, response_ids):
+        """
+        Processa um lote de respostas (ids de payloads 'response_ingested').
+
+        Returns:
+            dict com respostas, pontuadas, campanhas e alertas
+        """
+        respostas = list(
+            SurveyResponse.objects.filter(id__in=set(response_ids))
+            .select_related('campaign__empresa', 'campaign__created_by', 'setor')
+            .order_by('id')
+        )
+        if not respostas:
+            return {'respostas': 0, 'pontuadas': 0, 'campanhas': 0, 'alertas': 0}
+
+        pontuadas = cls._materializar_scores(respostas)
+
+        por_campanha = {}
+        for response in respostas:
+            por_campanha.setdefault(response.campaign_id, []).append(response)
+
+        for respostas_campanha in por_campanha.values():
+            campaign = respostas_campanha[0].campaign
+            rebuild_campaign_analytics(campaign, incremental=True)
+            NotificationService.novas_respostas(campaign, len(respostas_campanha))
+
+        alertas = NotificationService.alertas_risco_critico_lote(respostas)
+
+        logger.info(
+            f"Ingestão de {len(respostas)} respostas: {pontuadas} pontuadas, "
+            f"{len(por_campanha)} campanhas, {len(alertas)} alertas"
+        )
+        return {
+            'respostas': len(respostas),
+            'pontuadas': pontuadas,
+            'campanhas': len(por_campanha),
+            'alertas': len(alertas)
+        }
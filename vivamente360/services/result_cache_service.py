@@ -0,0 +1,139 @@
+"""
+Cache de resultados analíticos por campanha.
+
+Os agregados do dashboard, do RiskService e da comparação são guardados no
+cache 'analytics' (locmem, arquivo ou Redis, ver settings.CACHES) com chave
+versionada por:
+
+- campanha, nome do resultado e argumentos (filtros);
+- número de respostas e data da última resposta da campanha — respostas
+  gravadas por bulk_create (seeds, importações) mudam a versão sem sinais;
+- número de convites, maior id e última alteração de convite — total de
+  convidados e adesão mudam com importações e remoções de convites, também
+  em campanhas encerradas;
+- geração da campanha, incrementada pelo post_save/post_delete de
+  SurveyResponse (apps.responses.signals), que cobre também atualizações
+  de respostas existentes.
+
+Campanhas encerradas não recebem mais respostas: seus resultados ficam no
+cache sem expiração (sujeitos apenas à evicção LRU do backend).
+"""
+from functools import wraps
+from django.core.cache import caches
+from django.db.models import Count, Max
+import hashlib
+import json
+
+CACHE_ALIAS = 'analytics'
+
+
+class ResultCacheService:
+    PREFIXO = 'campaign-results'
+
+    @staticmethod
+    def _cache():
+        return caches[CACHE_ALIAS]
+
+    @classmethod
+    def _chave_geracao(cls, campaign_id):
+        return f'{cls.PREFIXO}:{campaign_id}:geracao'
+
+    @classmethod
+    def _geracao(cls, campaign_id):
+        cache = cls._cache()
+        chave = cls._chave_geracao(campaign_id)
+        geracao = cache.get(chave)
+        if geracao is None:
+            cache.add(chave, 0, timeout=None)
+            geracao = cache.get(chave, 0)
+        return geracao
+
+    @staticmethod
+    def _versao_respostas(campaign):
+        from apps.responses.models import SurveyResponse
+
+        versao = SurveyResponse.objects.filter(campaign_id=campaign.pk).aggregate(
+            total=Count('id'), ultima=Max('created_at')
+        )
+        ultima = versao['ultima'].isoformat() if versao['ultima'] else '-'
+        return f"{versao['total']}:{ultima}"
+
+    @staticmethod
+    def _versao_convites(campaign):
+        from apps.invitations.models import SurveyInvitation
+
+        versao = SurveyInvitation.objects.filter(campaign_id=campaign.pk).aggregate(
+            total=Count('id'), ultimo=Max('id'), alterado=Max('updated_at')
+        )
+        alterado = versao['alterado'].isoformat() if versao['alterado'] else '-'
+        return f"{versao['total']}:{versao['ultimo'] or 0}:{alterado}"
+
+    @staticmethod
+    def _hash_argumentos(args, kwargs):
+        conteudo = json.dumps([args, kwargs], sort_keys=True, default=str)
+        return hashlib.md5(conteudo.encode()).hexdigest()
+
+    @classmethod
+    def chave(cls, nome, campaign, args=(), kwargs=None):
+        return ':'.join([
+            cls.PREFIXO,
+            str(campaign.pk),
+            str(cls._geracao(campaign.pk)),
+            cls._versao_respostas(campaign),
+            cls._versao_convites(campaign),
+            nome,
+            cls._hash_argumentos(args, kwargs or {}),
+        ])
+
+    @classmethod
+    def get_or_compute(cls, nome, campaign, calcular, args=(), kwargs=None):
+        """
+        Retorna o resultado em cache ou o calcula com `calcular()` e o guarda.
+
+        Args:
+            nome: identificador do resultado (ex.: 'dashboard.aggregate')
+            campaign: Campanha a que o resultado pertence
+            calcular: função sem argumentos que produz o resultado
+            args, kwargs: demais argumentos que distinguem o resultado (filtros)
+        """
+        cache = cls._cache()
+        chave = cls.chave(nome, campaign, args, kwargs)
+
+        resultado = cache.get(chave)
+        if resultado is not None:
+            return resultado
+
+        resultado = calcular()
+        # None como timeout = sem expiração
+        timeout = None if campaign.status == 'closed' else cache.default_timeout
+        cache.set(chave, resultado, timeout=timeout)
+        return resultado
+
+    @classmethod
+    def invalidate(cls, campaign_id):
+        """Descarta todos os resultados da campanha (muda a geração da chave)."""
+        cache = cls._cache()
+        chave = cls._chave_geracao(campaign_id)
+        try:
+            cache.incr(chave)
+        except ValueError:
+            cache.set(chave, 1, timeout=None)
+
+
+def cache_por_campanha(nome):
+    """
+    Decorator para seletores cujo primeiro argumento é a campanha; os demais
+    argumentos (filtros) entram na chave.
+
+        @staticmethod
+        @cache_por_campanha('risk.igrp')
+        def calcular_igrp(campaign, filters=None): ...
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(campaign, *args, **kwargs):
+            return ResultCacheService.get_or_compute(
+                nome, campaign, lambda: func(campaign, *args, **kwargs), args, kwargs
+            )
+        return wrapper
+    return decorator
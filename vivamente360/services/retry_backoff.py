@@ -0,0 +1,38 @@
+"""
+Backoff exponencial com jitter para novas tentativas de tasks da fila.
+
+A n-ésima falha reagenda a task para daqui a
+    aleatório(base × 2^(n-1) / 2, base × 2^(n-1)), limitado a `max`
+segundos ("equal jitter"): o atraso cresce a cada falha e os retries de
+muitas tasks que falharam juntas (ex.: provedor de e-mail fora do ar) se
+espalham no tempo em vez de baterem no provedor ao mesmo tempo.
+
+Módulo sem dependência do Django; as políticas vêm de
+settings.TASK_RETRY_BACKOFF (ver TaskQueueWorker.schedule_retry).
+"""
+import random
+
+# Segundos por tipo de task: base do primeiro retry e teto
+DEFAULT_POLICIES = {
+    'default': {'base': 30, 'max': 3600},
+    'send_email': {'base': 60, 'max': 1800},
+    'send_notification_email': {'base': 60, 'max': 1800},
+    'generate_sector_analysis': {'base': 120, 'max': 7200},
+}
+
+
+def calcular_atraso(task_type, tentativa, politicas=None, rng=random):
+    """
+    Atraso em segundos antes da próxima tentativa.
+
+    Args:
+        task_type: tipo da task (escolhe a política; cai em 'default')
+        tentativa: número de tentativas já feitas (1 = primeira falha)
+        politicas: dict como DEFAULT_POLICIES (None = padrão)
+        rng: fonte de aleatoriedade (injetável em testes)
+    """
+    politicas = politicas or DEFAULT_POLICIES
+    politica = politicas.get(task_type) or politicas.get('default') or DEFAULT_POLICIES['default']
+
+    teto = min(politica['max'], politica['base'] * 2 ** max(0, tentativa - 1))
+    return rng.uniform(teto / 2, teto)
@@ -141,11 +141,11 @@ class RiskAssessmentService:
         cnae = getattr(empresa, 'cnae', None)
 
         # Calcular scores apenas do setor
-        from apps.surveys.models import Dimensao
         from apps.responses.models import SurveyResponse
         from services.score_service import ScoreService
+        from services.question_catalog import QuestionCatalog
 
-        dimensoes = Dimensao.objects.filter(ativo=True)
+        dimensoes = QuestionCatalog.get().dimensoes
         respostas_setor = SurveyResponse.objects.filter(
             campaign=campaign,
             setor=setor
@@ -15,6 +15,7 @@ from apps.surveys.models import (
     Dimensao
 )
 from app_selectors.dashboard_selectors import DashboardSelectors
+from services.question_catalog import QuestionCatalog
 
 
 class RiskCalculationService:
@@ -353,7 +354,7 @@ class RiskCalculationService:
 
         # Obter scores das dimensões
         scores = DashboardSelectors.get_dimensoes_scores(campaign)
-        dimensoes = Dimensao.objects.filter(ativo=True)
+        dimensoes = QuestionCatalog.get().dimensoes
 
         resultado = {
             'campaign': campaign,
@@ -1,6 +1,6 @@
-from django.db.models import Avg, Count
-from apps.responses.models import SurveyResponse
-from services.score_service import ScoreService
+from app_selectors.campaign_aggregator import CampaignAggregator
+from app_selectors.fact_selectors import FactSelectors
+from services.result_cache_service import cache_por_campanha
 
 
 # Classificação de Riscos conforme NR-1
@@ -100,58 +100,15 @@ class RiskService:
         return queryset
 
     @staticmethod
+    @cache_por_campanha('risk.igrp')
     def calcular_igrp(campaign, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = RiskService._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        if not responses.exists():
-            return 0.0
-
-        total_score = 0
-        total_dimensoes = 0
-
-        for response in responses:
-            scores = ScoreService.processar_resposta_completa(response.respostas)
-            for dimensao, data in scores.items():
-                total_score += data['nivel']
-                total_dimensoes += 1
-
-        if total_dimensoes == 0:
-            return 0.0
-
-        return round(total_score / total_dimensoes, 2)
+        if FactSelectors.is_fresh(campaign):
+            return FactSelectors.get_igrp(campaign, filters)
+        return CampaignAggregator(campaign, filters).run().igrp
 
     @staticmethod
+    @cache_por_campanha('risk.distribuicao')
     def get_distribuicao_riscos(campaign, filters=None):
-        responses_qs = SurveyResponse.objects.filter(campaign=campaign)
-        responses_qs = RiskService._apply_filters(responses_qs, filters)
-        responses = responses_qs
-
-        critico = 0
-        importante = 0
-        moderado = 0
-        aceitavel = 0
-
-        for response in responses:
-            scores = ScoreService.processar_resposta_completa(response.respostas)
-            for dimensao, data in scores.items():
-                nr = data['nivel']
-                if nr >= 13:
-                    critico += 1
-                elif nr >= 9:
-                    importante += 1
-                elif nr >= 5:
-                    moderado += 1
-                else:
-                    aceitavel += 1
-
-        total = critico + importante + moderado + aceitavel
-        return {
-            'critico': critico,
-            'importante': importante,
-            'moderado': moderado,
-            'aceitavel': aceitavel,
-            'total': total,
-            'percentual_alto': round((critico + importante) / total * 100, 2) if total > 0 else 0
-        }
+        if FactSelectors.is_fresh(campaign):
+            return FactSelectors.get_distribuicao_riscos(campaign, filters)
+        return CampaignAggregator(campaign, filters).run().distribuicao
@@ -1,3 +1,15 @@
+from decimal import Decimal
+import numpy as np
+
+
+def _matriz_membros(dimensoes: dict, total_perguntas: int) -> np.ndarray:
+    """Matriz [perguntas, dimensões] com 1 onde o item pertence à dimensão."""
+    membros = np.zeros((total_perguntas, len(dimensoes)), dtype=np.int16)
+    for j, itens in enumerate(dimensoes.values()):
+        membros[[i - 1 for i in itens], j] = 1
+    return membros
+
+
 class ScoreService:
     DIMENSOES = {
         "demandas": [3, 6, 9, 12, 16, 18, 20, 22],
@@ -11,6 +23,13 @@ class ScoreService:
 
     DIMENSOES_NEGATIVAS = ["demandas", "relacionamentos"]
 
+    TOTAL_PERGUNTAS = 35
+
+    # Estruturas do kernel vetorizado (colunas na ordem de DIMENSOES)
+    _MEMBROS = _matriz_membros(DIMENSOES, TOTAL_PERGUNTAS)
+    _ITENS_POR_DIMENSAO = _MEMBROS.sum(axis=0).astype(np.float64)
+    _EH_NEGATIVA = np.isin(list(DIMENSOES), DIMENSOES_NEGATIVAS)
+
     @staticmethod
     def _to_int(value):
         """Converte valor para int de forma segura"""
@@ -83,3 +102,81 @@ class ScoreService:
                 **nivel
             }
         return resultado
+
+    @classmethod
+    def pack_respostas(cls, responses) -> np.ndarray:
+        """
+        Empacota as respostas de N questionários em uma matriz int8 [N, 35].
+
+        Aceita dicts de respostas ({"1": "3", ...}) ou objetos com atributo
+        `respostas`. Itens ausentes ou inválidos valem 0, como no caminho escalar.
+        """
+        linhas = []
+        for response in responses:
+            respostas = getattr(response, 'respostas', response)
+            linhas.append([
+                cls._to_int(respostas.get(str(i), 0))
+                for i in range(1, cls.TOTAL_PERGUNTAS + 1)
+            ])
+        if not linhas:
+            return np.zeros((0, cls.TOTAL_PERGUNTAS), dtype=np.int8)
+        return np.array(linhas, dtype=np.int8)
+
+    @classmethod
+    def score_matrix(cls, responses) -> np.ndarray:
+        """
+        Calcula os scores das 7 dimensões para N respostas de uma vez.
+
+        Args:
+            responses: matriz int8 [N, 35] já empacotada ou iterável aceito
+                por pack_respostas
+
+        Returns:
+            ndarray float64 [N, 7], colunas na ordem de DIMENSOES, com os
+            mesmos valores de calcular_score_dimensao
+        """
+        if not isinstance(responses, np.ndarray):
+            responses = cls.pack_respostas(responses)
+        somas = responses.astype(np.int16) @ cls._MEMBROS
+        return np.round(somas / cls._ITENS_POR_DIMENSAO, 2)
+
+    @classmethod
+    def probabilidade_matrix(cls, scores: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de classificar_risco()['probabilidade'] para [N, 7]."""
+        negativa = (
+            1 + (scores >= 1.1).astype(np.int8) + (scores >= 2.1) + (scores >= 3.1)
+        )
+        positiva = (
+            1 + (scores <= 3.0).astype(np.int8) + (scores <= 2.0) + (scores <= 1.0)
+        )
+        return np.where(cls._EH_NEGATIVA, negativa, positiva).astype(np.int8)
+
+    @classmethod
+    def nivel_matrix(cls, scores: np.ndarray, severidade_base: int = 4) -> np.ndarray:
+        """Versão vetorizada do nível de risco NR (probabilidade × severidade)."""
+        return cls.probabilidade_matrix(scores) * np.int8(severidade_base)
+
+    @classmethod
+    def campos_materializados(cls, respostas: dict, severidade_base: int = 4) -> dict:
+        """
+        Valores das colunas materializadas de SurveyResponse
+        (score_<dimensao>, nivel_<dimensao> e igrp_individual).
+        """
+        scores = cls.score_matrix([respostas])
+        return cls.campos_materializados_matriz(scores, cls.nivel_matrix(scores, severidade_base))[0]
+
+    @classmethod
+    def campos_materializados_matriz(cls, scores: np.ndarray, niveis: np.ndarray) -> list:
+        """Versão em lote de campos_materializados, a partir de score_matrix/nivel_matrix."""
+        dimensoes = list(cls.DIMENSOES.keys())
+        igrps = niveis.sum(axis=1, dtype=np.int64) / len(dimensoes)
+
+        resultado = []
+        for scores_linha, niveis_linha, igrp in zip(scores.tolist(), niveis.tolist(), igrps.tolist()):
+            campos = {}
+            for dimensao, score, nivel in zip(dimensoes, scores_linha, niveis_linha):
+                campos[f'score_{dimensao}'] = Decimal(f'{score:.2f}')
+                campos[f'nivel_{dimensao}'] = nivel
+            campos['igrp_individual'] = Decimal(f'{round(igrp, 2):.2f}')
+            resultado.append(campos)
+        return resultado
@@ -0,0 +1,61 @@
+"""
+Rascunho do questionário por etapas, guardado no cache 'survey_drafts'
+(ver settings.CACHES) com chave pelo token do convite.
+
+Substitui as chaves survey_<token> e respostas_<token> da sessão: com o
+backend de sessão em banco, cada clique regravava o blob inteiro da sessão.
+Aqui cada etapa grava um item pequeno no cache, que expira junto com o
+token (invitation.expires_at). O rascunho só vira SurveyResponse uma vez,
+na última etapa, e é descartado após o commit. O backend precisa ser
+compartilhado e não descartar itens antes do prazo (Redis; ver
+SURVEY_DRAFT_CACHE_BACKEND).
+"""
+from django.core.cache import caches
+from django.utils import timezone
+
+CACHE_ALIAS = 'survey_drafts'
+
+
+class SurveyDraftService:
+    PREFIXO = 'survey-draft'
+
+    @staticmethod
+    def _cache():
+        return caches[CACHE_ALIAS]
+
+    @classmethod
+    def _chave(cls, token):
+        return f'{cls.PREFIXO}:{token}'
+
+    @staticmethod
+    def _timeout(invitation):
+        """Segundos até o token expirar (mínimo 1: 0 no cache = não guardar)."""
+        return max(1, int((invitation.expires_at - timezone.now()).total_seconds()))
+
+    @classmethod
+    def get(cls, token):
+        """Rascunho do convite: {'demografia': {...}, 'respostas': {"1": "3", ...}}."""
+        draft = cls._cache().get(cls._chave(token))
+        return draft or {'demografia': {}, 'respostas': {}}
+
+    @classmethod
+    def _save(cls, invitation, draft):
+        cls._cache().set(cls._chave(invitation.hash_token), draft, timeout=cls._timeout(invitation))
+
+    @classmethod
+    def save_demografia(cls, invitation, demografia):
+        draft = cls.get(invitation.hash_token)
+        draft['demografia'] = demografia
+        cls._save(invitation, draft)
+        return draft
+
+    @classmethod
+    def save_resposta(cls, invitation, numero, valor):
+        draft = cls.get(invitation.hash_token)
+        draft['respostas'][str(numero)] = valor
+        cls._save(invitation, draft)
+        return draft
+
+    @classmethod
+    def discard(cls, token):
+        cls._cache().delete(cls._chave(token))
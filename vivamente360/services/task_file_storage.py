@@ -92,6 +92,23 @@ class TaskFileStorage:
             logger.error(f"Erro ao salvar arquivo da task {task_id}: {str(e)}")
             raise
 
+    @staticmethod
+    def save_task_upload(uploaded_file, task_type):
+        """
+        Grava um arquivo enviado pelo usuário (ex.: CSV de importação) como
+        entrada de task, copiando em chunks sem carregá-lo inteiro.
+
+        Returns:
+            Caminho relativo do arquivo (abrir com default_storage.open)
+        """
+        now = datetime.now()
+        file_ext = Path(uploaded_file.name).suffix
+        relative_path = f"task_files/inputs/{now.year}/{now.month:02d}/{task_type}/{uuid.uuid4().hex}{file_ext}"
+
+        saved_path = default_storage.save(relative_path, uploaded_file)
+        logger.info(f"Upload de task salvo: {saved_path} ({uploaded_file.size} bytes)")
+        return saved_path
+
     @staticmethod
     def get_file_url(file_path):
         """
@@ -159,6 +176,14 @@ class TaskFileStorage:
                 task.save(update_fields=['file_path'])
                 deleted_count += 1
 
+        # Entradas de tasks que falharam de vez (as concluídas já apagam a sua)
+        for file_path in TaskQueue.objects.filter(
+            completed_at__lt=cutoff_date,
+            payload__has_key='csv_file'
+        ).values_list('payload__csv_file', flat=True):
+            if TaskFileStorage.delete_task_file(file_path):
+                deleted_count += 1
+
         logger.info(f"Limpeza de arquivos antigos: {deleted_count} arquivos removidos")
         return deleted_count
 
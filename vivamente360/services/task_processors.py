@@ -6,48 +6,79 @@ Tipos de tasks suportadas:
 - send_email: Envio de e-mails (convites, notificações)
 - generate_sector_analysis: Análise de setor por IA (GPT-4o)
 - import_csv: Importação de dados CSV
+- dispatch_invitations: Disparo dos convites de uma campanha (gera tasks send_email)
+- response_ingested: Pós-processamento de uma resposta do questionário (em lote)
 - export_plano_acao: Exportação de planos de ação (Word)
 - export_plano_acao_rich: Exportação de plano de ação detalhado (Word)
 - export_checklist_nr1: Exportação de checklist NR-1 (PDF)
 - export_campaign_comparison: Comparação de campanhas (Word)
 - export_risk_matrix_excel: Matriz de risco (Excel)
 """
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
 from django.utils import timezone
-from django.db.models import F
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Min, Q
 from apps.core.models import TaskQueue
 from services.export_service import ExportService
 from services.import_service import ImportService
 from services.crypto_service import CryptoService
 from services.task_file_storage import TaskFileStorage
+from services.fair_scheduler import FairScheduler
+from services.retry_backoff import calcular_atraso
 from apps.surveys.models import Campaign
+from contextlib import contextmanager
 from io import BytesIO
 import logging
+import os
+import socket
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Créditos do deficit round-robin entre empresas, por processo
+_fair_scheduler = FairScheduler()
+
+# Tasks de e-mail: enviadas em lote pela API de batch do provedor
+EMAIL_TASK_TYPES = ('send_email', 'send_notification_email')
+
+# Tasks processadas em lote em vez de uma a uma (process_pending_tasks)
+BATCH_TASK_TYPES = EMAIL_TASK_TYPES + ('response_ingested',)
+
 
 class TaskProcessor:
     """Processador base para tarefas do sistema."""
 
     @staticmethod
-    def process_task(task):
+    def process_task(task, claimed=False):
         """
         Processa uma tarefa baseada no task_type.
         Retorna True se processou com sucesso, False caso contrário.
+
+        Args:
+            task: TaskQueue a processar
+            claimed: True se a task já foi reivindicada por
+                TaskQueueWorker.claim_tasks (status/attempts/lease já gravados)
         """
-        task.status = 'processing'
-        task.started_at = timezone.now()
-        task.attempts += 1
-        task.save()
+        if not claimed:
+            task.status = 'processing'
+            task.started_at = timezone.now()
+            task.attempts += 1
+            task.save(update_fields=['status', 'started_at', 'attempts'])
 
         try:
             # Dispatch baseado no tipo de tarefa
-            if task.task_type == 'send_email':
+            if task.task_type in EMAIL_TASK_TYPES:
                 result = TaskProcessor._process_send_email(task)
             elif task.task_type == 'generate_sector_analysis':
                 result = TaskProcessor._process_sector_analysis(task)
             elif task.task_type == 'import_csv':
                 result = TaskProcessor._process_import_csv(task)
+            elif task.task_type == 'dispatch_invitations':
+                result = TaskProcessor._process_dispatch_invitations(task)
+            elif task.task_type == 'response_ingested':
+                result = TaskProcessor._process_response_ingested(task)
             elif task.task_type == 'export_plano_acao':
                 result = TaskProcessor._process_export_plano_acao(task)
             elif task.task_type == 'export_plano_acao_rich':
@@ -64,7 +95,8 @@ class TaskProcessor:
                 logger.warning(f"Tipo de tarefa desconhecido: {task.task_type}")
                 task.status = 'failed'
                 task.error_message = f"Tipo de tarefa não suportado: {task.task_type}"
-                task.save()
+                task.locked_until = None
+                task.save(update_fields=['status', 'error_message', 'locked_until'])
                 return False
 
             # Marcar como concluída
@@ -73,7 +105,10 @@ class TaskProcessor:
             task.progress = 100
             task.progress_message = 'Concluído'
             task.payload['result'] = result
-            task.save()
+            task.locked_until = None
+            task.save(update_fields=[
+                'status', 'completed_at', 'progress', 'progress_message', 'payload', 'locked_until'
+            ])
 
             # Criar notificação de sucesso
             TaskProcessor._create_completion_notification(task, result)
@@ -83,10 +118,13 @@ class TaskProcessor:
 
         except Exception as e:
             logger.error(f"Erro ao processar tarefa {task.id} ({task.task_type}): {str(e)}")
-            task.status = 'failed'
-            task.error_message = str(e)
             task.progress_message = 'Erro no processamento'
-            task.save()
+
+            # Ainda há tentativas: volta para a fila com backoff
+            retry = TaskQueueWorker.schedule_retry(task, str(e))
+            task.save(update_fields=TaskQueueWorker.RETRY_FIELDS + ['progress_message'])
+            if retry:
+                return False
 
             # Criar notificação de falha
             TaskProcessor._create_failure_notification(task, str(e))
@@ -105,7 +143,7 @@ class TaskProcessor:
         success = email_service.send(
             to=payload['to'],
             subject=payload['subject'],
-            html_body=payload['html']
+            html_body=payload.get('html') or payload.get('html_body')
         )
 
         if not success:
@@ -119,6 +157,127 @@ class TaskProcessor:
 
         return {'success': True, 'email_sent': True}
 
+    @staticmethod
+    def process_email_batch(tasks, concurrency=None):
+        """
+        Envia tasks de e-mail já reivindicadas (status 'processing') com uma
+        chamada send_batch e grava o resultado de cada mensagem na sua task:
+        as enviadas são concluídas com um UPDATE, as que falharam voltam
+        para a fila com backoff (ou falham de vez) com um bulk_update.
+
+        Args:
+            concurrency: requisições simultâneas ao provedor (padrão:
+                settings.EMAIL_CONCURRENCY)
+
+        Returns:
+            número de e-mails enviados
+        """
+        from services.email_service import get_email_service
+        from apps.invitations.models import SurveyInvitation
+
+        if not tasks:
+            return 0
+
+        validas = []
+        falhas = []
+        for task in tasks:
+            if task.payload.get('to') and task.payload.get('subject'):
+                validas.append(task)
+            else:
+                falhas.append((task, 'Payload incompleto: faltam campos obrigatórios'))
+
+        if concurrency is None:
+            concurrency = getattr(settings, 'EMAIL_CONCURRENCY', 1)
+        # A chave pelo id da task evita e-mail duplicado quando um envio que
+        # chegou ao provedor é repetido (timeout, lease vencido)
+        results = get_email_service().send_batch(
+            [{**task.payload, 'idempotency_key': f'task-{task.id}'} for task in validas],
+            concurrency=concurrency
+        ) if validas else []
+
+        enviadas = []
+        for task, result in zip(validas, results):
+            if result['ok']:
+                enviadas.append(task)
+            else:
+                falhas.append((task, result['error'] or 'Falha no envio de e-mail'))
+
+        now = timezone.now()
+        if enviadas:
+            TaskQueue.objects.filter(id__in=[task.id for task in enviadas]).update(
+                status='completed',
+                completed_at=now,
+                progress=100,
+                progress_message='Concluído',
+                locked_by='',
+                locked_until=None
+            )
+            convites = [task.payload['invitation_id'] for task in enviadas if task.payload.get('invitation_id')]
+            if convites:
+                SurveyInvitation.objects.filter(id__in=convites).update(status='sent', sent_at=now)
+
+        definitivas = []
+        for task, erro in falhas:
+            task.progress_message = 'Erro no processamento'
+            if not TaskQueueWorker.schedule_retry(task, erro):
+                definitivas.append(task)
+        TaskQueue.objects.bulk_update(
+            [task for task, _ in falhas], TaskQueueWorker.RETRY_FIELDS + ['progress_message']
+        )
+
+        for task in enviadas:
+            if task.user_id:
+                TaskProcessor._create_completion_notification(task, {'success': True, 'email_sent': True})
+        for task in definitivas:
+            TaskProcessor._create_failure_notification(task, task.error_message)
+
+        logger.info(f"Lote de e-mails: {len(enviadas)} enviados, {len(falhas)} falhas")
+        return len(enviadas)
+
+    @staticmethod
+    def _process_response_ingested(task):
+        """Pós-processamento de uma única resposta (ver process_ingestion_batch)."""
+        from services.response_ingestion_service import ResponseIngestionService
+
+        return ResponseIngestionService.ingest([task.payload['response_id']])
+
+    @staticmethod
+    def process_ingestion_batch(tasks):
+        """
+        Processa juntas as tasks 'response_ingested' já reivindicadas: um
+        ResponseIngestionService.ingest para todas as respostas do lote e
+        um UPDATE para concluir as tasks. Se o lote falhar, todas voltam
+        para a fila com backoff.
+
+        Returns:
+            número de tasks concluídas
+        """
+        from services.response_ingestion_service import ResponseIngestionService
+
+        if not tasks:
+            return 0
+
+        try:
+            with transaction.atomic():
+                ResponseIngestionService.ingest([task.payload['response_id'] for task in tasks])
+        except Exception as e:
+            logger.error(f"Erro ao processar lote de {len(tasks)} respostas: {str(e)}")
+            for task in tasks:
+                task.progress_message = 'Erro no processamento'
+                TaskQueueWorker.schedule_retry(task, str(e))
+            TaskQueue.objects.bulk_update(tasks, TaskQueueWorker.RETRY_FIELDS + ['progress_message'])
+            return 0
+
+        TaskQueue.objects.filter(id__in=[task.id for task in tasks]).update(
+            status='completed',
+            completed_at=timezone.now(),
+            progress=100,
+            progress_message='Concluído',
+            locked_by='',
+            locked_until=None
+        )
+        return len(tasks)
+
     @staticmethod
     def _process_sector_analysis(task):
         """Processa análise de setor por IA."""
@@ -131,7 +290,8 @@ class TaskProcessor:
         logger.info(f"Processando análise IA para setor {setor_id}, campanha {campaign_id}")
 
         # Gerar análise usando service
-        analysis = SectorAnalysisService.gerar_analise(setor_id, campaign_id)
+        with TaskQueueWorker.heartbeat_em_segundo_plano(task):
+            analysis = SectorAnalysisService.gerar_analise(setor_id, campaign_id)
 
         if not analysis:
             raise Exception("Falha ao gerar análise de setor")
@@ -144,23 +304,68 @@ class TaskProcessor:
         """Processa importação de CSV."""
         payload = task.payload
         campaign_id = payload['campaign_id']
-        rows = payload['rows']
+        total = payload.get('rows_count')
 
         campaign = Campaign.objects.get(id=campaign_id)
         crypto_service = CryptoService()
 
-        result = ImportService.process_import(
-            campaign.empresa,
-            campaign,
-            rows,
-            crypto_service
-        )
+        def progresso(lidas, criados):
+            task.progress = min(99, int(lidas * 100 / total)) if total else 0
+            task.progress_message = f'{lidas} de {total or "?"} linhas processadas ({criados} convites)'
+            task.save(update_fields=['progress', 'progress_message'])
+            TaskQueueWorker.heartbeat(task)
+
+        # CSV enviado fica em arquivo (lido em streaming); 'rows' inline é o
+        # formato das tasks enfileiradas antes disso
+        csv_file = payload.get('csv_file')
+        if csv_file:
+            with default_storage.open(csv_file, 'rb') as f:
+                result = ImportService.process_import(
+                    campaign.empresa, campaign, ImportService.iter_csv(f), crypto_service, progresso
+                )
+            # Entrada não é mais necessária; em falha fica para os retries
+            TaskFileStorage.delete_task_file(csv_file)
+        else:
+            result = ImportService.process_import(
+                campaign.empresa, campaign, payload['rows'], crypto_service, progresso
+            )
 
         return {
             'created': result['created'],
+            'updated': result['updated'],
+            'skipped': result['skipped'],
             'errors': result['errors'][:10]  # Limitar erros no payload
         }
 
+    @staticmethod
+    def _process_dispatch_invitations(task):
+        """Processa o disparo dos convites pendentes de uma campanha."""
+        from services.invitation_dispatch_service import InvitationDispatchService
+
+        payload = task.payload
+        campaign = Campaign.objects.select_related('empresa').get(id=payload['campaign_id'])
+
+        def progresso(ultimo_id, processados, total, enviados):
+            # Cursor no payload: um retry continua de onde parou
+            task.payload['ultimo_id'] = ultimo_id
+            task.progress = min(99, int(processados * 100 / total)) if total else 0
+            task.progress_message = f'{processados} de {total} convites processados ({enviados} e-mails enfileirados)'
+            task.save(update_fields=['payload', 'progress', 'progress_message'])
+            TaskQueueWorker.heartbeat(task)
+
+        result = InvitationDispatchService.dispatch(
+            campaign,
+            payload['base_url'],
+            ultimo_id=payload.get('ultimo_id', 0),
+            progress_callback=progresso
+        )
+
+        logger.info(
+            f"Disparo da campanha {campaign.id}: {result['enviados']} e-mails enfileirados, "
+            f"{result['falhas']} falhas"
+        )
+        return result
+
     @staticmethod
     def _process_export_plano_acao(task):
         """Processa exportação de plano de ação."""
@@ -498,6 +703,7 @@ class TaskProcessor:
             'send_email': 'E-mail enviado',
             'generate_sector_analysis': 'Análise de setor gerada',
             'import_csv': 'Importação de dados concluída',
+            'dispatch_invitations': 'Disparo de convites concluído',
             'export_plano_acao': 'Plano de ação exportado',
             'export_plano_acao_rich': 'Plano de ação detalhado exportado',
             'export_checklist_nr1': 'Checklist NR-1 exportado',
@@ -558,6 +764,7 @@ class TaskProcessor:
             'send_email': 'Erro ao enviar e-mail',
             'generate_sector_analysis': 'Erro na análise de setor',
             'import_csv': 'Erro na importação de dados',
+            'dispatch_invitations': 'Erro no disparo de convites',
             'export_plano_acao': 'Erro ao exportar plano de ação',
             'export_plano_acao_rich': 'Erro ao exportar plano de ação detalhado',
             'export_checklist_nr1': 'Erro ao exportar checklist NR-1',
@@ -597,39 +804,424 @@ class TaskProcessor:
 
 
 class TaskQueueWorker:
-    """Worker que processa tarefas pendentes da fila."""
+    """
+    Worker que processa tarefas pendentes da fila.
+
+    Vários workers (processos ou máquinas) podem rodar em paralelo: as tasks
+    são reivindicadas com SELECT ... FOR UPDATE SKIP LOCKED e recebem um
+    lease (locked_by/locked_until). Tasks em 'processing' com lease vencido
+    são de workers que caíram e voltam para a fila em recover_stuck_tasks.
+    """
+
+    # Campos alterados por schedule_retry (para save(update_fields=...))
+    RETRY_FIELDS = ['status', 'error_message', 'locked_by', 'locked_until', 'run_after', 'completed_at']
 
     @staticmethod
-    def process_pending_tasks(limit=10):
+    def worker_id():
+        """Identificador do worker atual (host:pid:thread)."""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"[:100]
+
+    @staticmethod
+    def lease_seconds(task_type=None):
+        """Prazo do lease; TASK_QUEUE_LEASE_SECONDS_BY_TYPE sobrepõe por task_type."""
+        padrao = getattr(settings, 'TASK_QUEUE_LEASE_SECONDS', 900)
+        return getattr(settings, 'TASK_QUEUE_LEASE_SECONDS_BY_TYPE', {}).get(task_type, padrao)
+
+    @staticmethod
+    def schedule_retry(task, error_message):
         """
-        Processa até 'limit' tarefas pendentes da fila.
-        Retorna número de tarefas processadas com sucesso.
+        Reagenda a task após uma falha, sem salvar: com tentativas restantes
+        ela volta para 'pending' com run_after no futuro (backoff exponencial
+        com jitter por task_type, ver services/retry_backoff.py); senão fica
+        'failed'.
+
+        Returns:
+            True se a task foi reagendada, False se falhou de vez
         """
-        pending_tasks = TaskQueue.objects.filter(
-            status='pending'
-        ).order_by('created_at')[:limit]
+        now = timezone.now()
+        task.error_message = error_message
+        task.locked_by = ''
+        task.locked_until = None
+
+        if task.attempts < task.max_attempts:
+            atraso = calcular_atraso(
+                task.task_type, task.attempts, getattr(settings, 'TASK_RETRY_BACKOFF', None)
+            )
+            task.status = 'pending'
+            task.run_after = now + timedelta(seconds=atraso)
+            logger.info(
+                f"Tarefa {task.id} reagendada para {task.run_after:%H:%M:%S} "
+                f"(tentativa {task.attempts + 1}/{task.max_attempts})"
+            )
+            return True
+
+        task.status = 'failed'
+        task.completed_at = now
+        return False
+
+    @staticmethod
+    def _cotas(limit, queues, scheduling, weights):
+        """
+        Quantas tasks reivindicar de cada fila neste ciclo.
+
+        - strict: esgota as filas na ordem informada (a primeira tem
+          prioridade absoluta sobre as seguintes);
+        - weighted: divide o lote proporcionalmente aos pesos (mínimo 1 por
+          fila); vagas não usadas por uma fila vazia vão para as demais.
+        """
+        if not queues:
+            return [(None, limit)]
+
+        if scheduling == 'strict':
+            return [(queue, limit) for queue in queues]
+
+        weights = weights or {}
+        total = sum(weights.get(queue, 1) for queue in queues)
+        return [
+            (queue, max(1, round(limit * weights.get(queue, 1) / total)))
+            for queue in queues
+        ]
+
+    @staticmethod
+    def _limites_por_empresa(empresas):
+        """
+        Máximo de tasks em 'processing' por empresa: TASK_QUEUE_TENANT_CAPS
+        (por empresa_id) ou TASK_QUEUE_TENANT_MAX_CONCURRENCY (0 = sem
+        limite). Tasks de sistema (sem empresa) não têm limite.
+        """
+        padrao = getattr(settings, 'TASK_QUEUE_TENANT_MAX_CONCURRENCY', 0)
+        limites = getattr(settings, 'TASK_QUEUE_TENANT_CAPS', {})
+        return {
+            empresa_id: limites.get(empresa_id, padrao)
+            for empresa_id in empresas
+            if empresa_id is not None
+        }
+
+    @staticmethod
+    def claim_tasks(limit=10, worker_id=None, queues=None, scheduling='strict', weights=None):
+        """
+        Reivindica até 'limit' tarefas pendentes, de forma atômica.
+
+        Linhas bloqueadas por outro worker são puladas (skip_locked), então
+        workers concorrentes nunca recebem a mesma task. Os slots de cada
+        fila são divididos entre as empresas (FairScheduler, com pesos e
+        limites de concorrência por empresa); dentro de cada empresa a ordem
+        é prioridade (maior primeiro) e depois antiguidade. Só entram tasks
+        vencidas (run_after <= agora): retries em backoff ficam de fora, e o
+        índice parcial core_task_q_pending_due_idx cobre a consulta.
+
+        Args:
+            queues: filas atendidas por este worker (None = todas)
+            scheduling: 'strict' ou 'weighted' (ver _cotas)
+            weights: dict fila -> peso, para 'weighted'
+
+        Returns:
+            lista de TaskQueue já em 'processing', com attempts incrementado
+        """
+        worker_id = worker_id or TaskQueueWorker.worker_id()
+        now = timezone.now()
+
+        pendentes = TaskQueue.objects.filter(status='pending', run_after__lte=now)
+        if queues:
+            pendentes = pendentes.filter(queue__in=queues)
+
+        ordem = [F('priority').desc(nulls_last=True), 'created_at']
+
+        with transaction.atomic():
+            # Tasks que já esgotaram as tentativas não são reivindicadas
+            pendentes.filter(attempts__gte=F('max_attempts')).update(
+                status='failed',
+                error_message='Número máximo de tentativas excedido',
+                completed_at=now
+            )
+
+            em_execucao = dict(
+                TaskQueue.objects.filter(status='processing')
+                .values_list('empresa_id').annotate(total=Count('id')).order_by()
+            )
+
+            def reivindicar(queue, quantidade, excluir):
+                candidatas = pendentes if queue is None else pendentes.filter(queue=queue)
+                candidatas = candidatas.exclude(id__in=excluir)
+
+                # Slots divididos entre as empresas com tasks pendentes
+                por_empresa = dict(
+                    candidatas.values_list('empresa_id').annotate(total=Count('id')).order_by()
+                )
+                alocacao = _fair_scheduler.alocar(
+                    quantidade,
+                    por_empresa,
+                    em_execucao=em_execucao,
+                    pesos=getattr(settings, 'TASK_QUEUE_TENANT_WEIGHTS', {}),
+                    limites=TaskQueueWorker._limites_por_empresa(por_empresa),
+                    chave=queue
+                )
+
+                ids = []
+                for empresa_id, slots in alocacao.items():
+                    da_empresa = (
+                        candidatas.filter(empresa__isnull=True) if empresa_id is None
+                        else candidatas.filter(empresa_id=empresa_id)
+                    )
+                    novos = list(
+                        da_empresa.select_for_update(skip_locked=True)
+                        .order_by(*ordem)
+                        .values_list('id', flat=True)[:slots]
+                    )
+                    em_execucao[empresa_id] = em_execucao.get(empresa_id, 0) + len(novos)
+                    ids += novos
+                return ids
+
+            ids = []
+            for queue, cota in TaskQueueWorker._cotas(limit, queues, scheduling, weights):
+                if len(ids) >= limit:
+                    break
+                ids += reivindicar(queue, min(cota, limit - len(ids)), ids)
+
+            # Pesos: vagas que sobraram (filas vazias) vão para as demais filas
+            if scheduling == 'weighted' and queues:
+                for queue in queues:
+                    if len(ids) >= limit:
+                        break
+                    ids += reivindicar(queue, limit - len(ids), ids)
+
+            if not ids:
+                return []
+
+            TaskQueue.objects.filter(id__in=ids).update(
+                status='processing',
+                started_at=now,
+                attempts=F('attempts') + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=TaskQueueWorker.lease_seconds())
+            )
+
+        return list(TaskQueue.objects.filter(id__in=ids).order_by(*ordem))
+
+    @staticmethod
+    def renew_lease(task, worker_id):
+        """
+        Renova o lease antes de iniciar a task. Retorna False se a task não
+        pertence mais a este worker (lease vencido e task reivindicada por outro).
+        """
+        locked_until = timezone.now() + timedelta(seconds=TaskQueueWorker.lease_seconds(task.task_type))
+        renewed = TaskQueue.objects.filter(
+            id=task.id, status='processing', locked_by=worker_id
+        ).update(locked_until=locked_until)
+        task.locked_until = locked_until
+        return renewed == 1
+
+    @staticmethod
+    def renew_leases(tasks, worker_id):
+        """renew_lease em lote; retorna as tasks que ainda pertencem ao worker."""
+        if not tasks:
+            return []
+        segundos = max(TaskQueueWorker.lease_seconds(task.task_type) for task in tasks)
+        locked_until = timezone.now() + timedelta(seconds=segundos)
+        ids = [task.id for task in tasks]
+        TaskQueue.objects.filter(
+            id__in=ids, status='processing', locked_by=worker_id
+        ).update(locked_until=locked_until)
+        proprias = set(
+            TaskQueue.objects.filter(id__in=ids, locked_by=worker_id, locked_until=locked_until)
+            .values_list('id', flat=True)
+        )
+        for task in tasks:
+            task.locked_until = locked_until
+        return [task for task in tasks if task.id in proprias]
+
+    @staticmethod
+    def heartbeat(task):
+        """
+        Prorroga o lease de uma task em andamento, chamado pelos callbacks
+        de progresso de tasks longas (importação, disparo). Só grava quando
+        já passou metade do prazo, então pode ser chamado a cada lote.
+
+        Returns:
+            False se a task não pertence mais a este worker (lease vencido
+            e task reivindicada por outro)
+        """
+        segundos = TaskQueueWorker.lease_seconds(task.task_type)
+        now = timezone.now()
+        if task.locked_until and task.locked_until - now > timedelta(seconds=segundos / 2):
+            return True
+
+        locked_until = now + timedelta(seconds=segundos)
+        renewed = TaskQueue.objects.filter(
+            id=task.id, status='processing', locked_by=task.locked_by
+        ).update(locked_until=locked_until)
+        if not renewed:
+            logger.warning(f"Tarefa {task.id} perdeu o lease durante o processamento")
+            return False
+        task.locked_until = locked_until
+        return True
+
+    @staticmethod
+    @contextmanager
+    def heartbeat_em_segundo_plano(task):
+        """
+        Mantém o lease da task enquanto o bloco roda, para chamadas longas
+        sem progresso intermediário (ex.: a análise por IA): uma thread
+        chama heartbeat a cada quarto do prazo, com conexão própria.
+        """
+        parar = threading.Event()
+        intervalo = TaskQueueWorker.lease_seconds(task.task_type) / 4
+
+        def pulsar():
+            try:
+                while not parar.wait(intervalo):
+                    TaskQueueWorker.heartbeat(task)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=pulsar, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            parar.set()
+            thread.join()
+
+    @staticmethod
+    def process_pending_tasks(limit=10, worker_id=None, queues=None, scheduling='strict', weights=None):
+        """
+        Reivindica e processa até 'limit' tarefas pendentes da fila.
+        Tasks de e-mail do lote são enviadas juntas (process_email_batch) e
+        as de ingestão de respostas também (process_ingestion_batch).
+
+        Returns:
+            (processadas com sucesso, reivindicadas). Os workers decidem se
+            esperam pela reivindicação: um batch cheio de falhas ainda indica
+            que há mais trabalho na fila.
+        """
+        worker_id = worker_id or TaskQueueWorker.worker_id()
 
         processed = 0
-        for task in pending_tasks:
-            # Verificar se já atingiu número máximo de tentativas
-            if task.attempts >= task.max_attempts:
-                task.status = 'failed'
-                task.error_message = 'Número máximo de tentativas excedido'
-                task.save()
-                logger.warning(f"Tarefa {task.id} excedeu máximo de tentativas")
+        tasks = TaskQueueWorker.claim_tasks(
+            limit=limit, worker_id=worker_id, queues=queues, scheduling=scheduling, weights=weights
+        )
+
+        emails = [task for task in tasks if task.task_type in EMAIL_TASK_TYPES]
+        if emails:
+            processed += TaskProcessor.process_email_batch(TaskQueueWorker.renew_leases(emails, worker_id))
+
+        ingestoes = [task for task in tasks if task.task_type == 'response_ingested']
+        if ingestoes:
+            processed += TaskProcessor.process_ingestion_batch(TaskQueueWorker.renew_leases(ingestoes, worker_id))
+
+        for task in tasks:
+            if task.task_type in BATCH_TASK_TYPES:
+                continue
+            if not TaskQueueWorker.renew_lease(task, worker_id):
+                logger.warning(f"Tarefa {task.id} perdeu o lease antes de iniciar; ignorando")
                 continue
 
-            # Processar tarefa
-            success = TaskProcessor.process_task(task)
-            if success:
+            if TaskProcessor.process_task(task, claimed=True):
                 processed += 1
 
-        return processed
+        return processed, len(tasks)
+
+    @staticmethod
+    def recover_stuck_tasks():
+        """
+        Devolve à fila tasks presas em 'processing' cujo lease venceu (worker
+        interrompido no meio). Sem tentativas restantes, a task falha.
+
+        Tasks reivindicadas antes da existência do lease (locked_until nulo)
+        são consideradas presas após o mesmo prazo contado de started_at.
+        """
+        now = timezone.now()
+        expiradas = TaskQueue.objects.filter(status='processing').filter(
+            Q(locked_until__lt=now) |
+            Q(locked_until__isnull=True, started_at__lt=now - timedelta(seconds=TaskQueueWorker.lease_seconds()))
+        )
+
+        failed = expiradas.filter(attempts__gte=F('max_attempts')).update(
+            status='failed',
+            error_message='Worker interrompido durante o processamento',
+            locked_by='',
+            locked_until=None,
+            completed_at=now
+        )
+        recovered = expiradas.filter(attempts__lt=F('max_attempts')).update(
+            status='pending',
+            run_after=now,
+            locked_by='',
+            locked_until=None
+        )
+
+        if failed or recovered:
+            logger.warning(
+                f"Recuperação de tasks presas: {recovered} devolvidas à fila, {failed} marcadas como falhas"
+            )
+        return recovered
+
+    @staticmethod
+    def queue_stats(janela_minutos=60):
+        """
+        Profundidade e espera da fila por empresa × fila, para acompanhar a
+        justiça do escalonamento.
+
+        Returns:
+            list de dicts com empresa_id, empresa, queue, pendentes,
+            em_execucao, espera_atual_s (task pendente mais antiga),
+            iniciadas e espera_media_s (tasks iniciadas na janela)
+        """
+        now = timezone.now()
+        espera = ExpressionWrapper(F('started_at') - F('created_at'), output_field=DurationField())
+
+        linhas = {}
+        for linha in (
+            TaskQueue.objects.filter(status__in=['pending', 'processing'])
+            .values('empresa_id', 'empresa__nome', 'queue')
+            .annotate(
+                pendentes=Count('id', filter=Q(status='pending')),
+                em_execucao=Count('id', filter=Q(status='processing')),
+                mais_antiga=Min('created_at', filter=Q(status='pending')),
+            )
+            .order_by()
+        ):
+            linhas[(linha['empresa_id'], linha['queue'])] = {
+                'empresa_id': linha['empresa_id'],
+                'empresa': linha['empresa__nome'] or '(sistema)',
+                'queue': linha['queue'],
+                'pendentes': linha['pendentes'],
+                'em_execucao': linha['em_execucao'],
+                'espera_atual_s': (
+                    round((now - linha['mais_antiga']).total_seconds(), 1)
+                    if linha['mais_antiga'] else 0
+                ),
+                'iniciadas': 0,
+                'espera_media_s': None,
+            }
+
+        for linha in (
+            TaskQueue.objects.filter(started_at__gte=now - timedelta(minutes=janela_minutos))
+            .values('empresa_id', 'empresa__nome', 'queue')
+            .annotate(iniciadas=Count('id'), espera_media=Avg(espera))
+            .order_by()
+        ):
+            dados = linhas.setdefault((linha['empresa_id'], linha['queue']), {
+                'empresa_id': linha['empresa_id'],
+                'empresa': linha['empresa__nome'] or '(sistema)',
+                'queue': linha['queue'],
+                'pendentes': 0,
+                'em_execucao': 0,
+                'espera_atual_s': 0,
+            })
+            dados['iniciadas'] = linha['iniciadas']
+            dados['espera_media_s'] = (
+                round(linha['espera_media'].total_seconds(), 1) if linha['espera_media'] else None
+            )
+
+        return sorted(linhas.values(), key=lambda d: (d['queue'] or '', -d['pendentes']))
 
     @staticmethod
     def retry_failed_tasks(limit=5):
         """
-        Tenta reprocessar tarefas que falharam mas ainda têm tentativas disponíveis.
+        Devolve à fila tarefas 'failed' que ainda têm tentativas disponíveis
+        (ex.: falhas gravadas antes do backoff automático), agendadas com o
+        mesmo backoff de schedule_retry em vez de voltarem imediatamente.
         """
         failed_tasks = TaskQueue.objects.filter(
             status='failed'
@@ -639,10 +1231,9 @@ class TaskQueueWorker:
 
         retried = 0
         for task in failed_tasks:
-            task.status = 'pending'
-            task.error_message = ''
-            task.save()
+            TaskQueueWorker.schedule_retry(task, task.error_message)
+            task.completed_at = None
+            task.save(update_fields=TaskQueueWorker.RETRY_FIELDS)
             retried += 1
-            logger.info(f"Tarefa {task.id} marcada para retry (tentativa {task.attempts + 1})")
 
         return retried
@@ -0,0 +1,82 @@
+"""
+Espera por novas tasks com LISTEN/NOTIFY do PostgreSQL.
+
+Os pontos de enfileiramento chamam TaskQueue.objects.enqueue/notify, que
+emitem NOTIFY no canal da fila da task. O worker bloqueia em wait() até receber um
+aviso ou até o timeout (polling de segurança), sem consultar a fila enquanto
+está ocioso. Fora do PostgreSQL, ou se a conexão de escuta falhar, wait()
+degrada para um sleep simples.
+"""
+from django.db import connection
+from apps.core.models import DEFAULT_TASK_QUEUE, TASK_QUEUES, channel_for_queue
+import select
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskQueueListener:
+    """
+    Conexão dedicada em LISTEN nos canais das filas atendidas pelo worker.
+    Use uma instância por worker (processo ou thread); a conexão é aberta
+    no primeiro wait().
+    """
+
+    def __init__(self, queues=None):
+        queues = queues or [*TASK_QUEUES, DEFAULT_TASK_QUEUE]
+        self.channels = [channel_for_queue(queue) for queue in queues]
+        self._conn = None
+
+    def _connect(self):
+        if connection.vendor != 'postgresql':
+            return None
+
+        if self._conn is None:
+            conn = connection.get_new_connection(connection.get_connection_params())
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                for channel in self.channels:
+                    cursor.execute(f'LISTEN "{channel}"')
+            self._conn = conn
+        return self._conn
+
+    def wait(self, timeout):
+        """
+        Bloqueia até um NOTIFY chegar ou `timeout` segundos passarem.
+
+        Returns:
+            lista de payloads recebidos (filas com trabalho); vazia no timeout
+        """
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logger.warning(f"LISTEN indisponível, usando polling: {e}")
+            conn = None
+
+        if conn is None:
+            time.sleep(timeout)
+            return []
+
+        try:
+            # Avisos que chegaram enquanto o worker processava
+            conn.poll()
+            if not conn.notifies:
+                if select.select([conn], [], [], timeout) != ([], [], []):
+                    conn.poll()
+
+            payloads = [notify.payload for notify in conn.notifies]
+            conn.notifies.clear()
+            return payloads
+        except Exception as e:
+            logger.warning(f"Conexão de LISTEN perdida, reconectando no próximo ciclo: {e}")
+            self.close()
+            return []
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
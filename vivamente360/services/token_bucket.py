@@ -0,0 +1,143 @@
+"""
+Limitador de taxa token bucket.
+
+O balde enche `rate` fichas por segundo até `capacity` (rajada máxima);
+cada requisição consome uma ficha e espera se o balde estiver vazio. Usado
+pelo ResendEmailService para respeitar o limite de requisições/s do
+provedor mesmo com vários envios em paralelo.
+
+- TokenBucket: estado em memória, compartilhado entre as threads de um
+  processo.
+- RedisTokenBucket: estado no Redis, compartilhado entre todos os
+  processos (e máquinas) que usam a mesma chave.
+
+Módulo sem dependência do Django.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate: fichas por segundo (<= 0 = sem limite)
+            capacity: máximo acumulado (padrão: max(1, rate))
+            clock, sleep: injetáveis em testes
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Consome `tokens` se houver; não bloqueia."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """
+        Consome `tokens`, esperando o necessário. A ficha é reservada antes
+        da espera (o saldo pode ficar negativo), então threads concorrentes
+        são atendidas em ordem de chegada, cada uma esperando a sua vez.
+
+        Returns:
+            segundos esperados
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            espera = max(0.0, -self._tokens / self.rate)
+
+        if espera:
+            self._sleep(espera)
+        return espera
+
+
+class RedisTokenBucket:
+    """
+    Mesmo algoritmo do TokenBucket, com o saldo guardado em um hash do Redis
+    e atualizado por um script Lua (atômico). O relógio é o do servidor
+    Redis, então processos em máquinas diferentes enxergam o mesmo balde.
+    """
+
+    # ARGV: rate, capacity, tokens, bloqueante (1/0). Devolve a espera em
+    # segundos (string: o Redis trunca números Lua para inteiro) ou -1 se
+    # não bloqueante e sem saldo
+    SCRIPT = """
+local agora = redis.call('TIME')
+agora = tonumber(agora[1]) + tonumber(agora[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local pedido = tonumber(ARGV[3])
+local estado = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local saldo = tonumber(estado[1]) or capacity
+local atualizado = tonumber(estado[2]) or agora
+saldo = math.min(capacity, saldo + math.max(0, agora - atualizado) * rate)
+if ARGV[4] == '0' and saldo < pedido then
+    return '-1'
+end
+saldo = saldo - pedido
+redis.call('HSET', KEYS[1], 'tokens', tostring(saldo), 'updated', tostring(agora))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(math.max(0, -saldo / rate))
+"""
+
+    def __init__(self, client, key, rate, capacity=None, sleep=time.sleep):
+        """
+        Args:
+            client: cliente redis-py
+            key: chave do balde (um por limite, p.ex. por provedor)
+            rate: fichas por segundo (<= 0 = sem limite)
+            capacity: máximo acumulado (padrão: max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.key = key
+        self._sleep = sleep
+        self._script = client.register_script(self.SCRIPT)
+
+    def _reservar(self, tokens, bloqueante):
+        return float(self._script(
+            keys=[self.key], args=[self.rate, self.capacity, tokens, 1 if bloqueante else 0]
+        ))
+
+    def try_acquire(self, tokens=1):
+        """Consome `tokens` se houver; não bloqueia."""
+        if self.rate <= 0:
+            return True
+        return self._reservar(tokens, False) >= 0
+
+    def acquire(self, tokens=1):
+        """
+        Consome `tokens`, esperando o necessário (a ficha é reservada no
+        Redis antes da espera, como no TokenBucket).
+
+        Returns:
+            segundos esperados
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        espera = self._reservar(tokens, True)
+        if espera:
+            self._sleep(espera)
+        return espera
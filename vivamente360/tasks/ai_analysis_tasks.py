@@ -1,7 +1,10 @@
+from datetime import timedelta
+from django.db import transaction
 from django.utils import timezone
 from apps.core.models import TaskQueue
 from apps.analytics.models import SectorAnalysis
 from services.sector_analysis_service import SectorAnalysisService
+from services.task_processors import TaskQueueWorker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,20 +13,26 @@ logger = logging.getLogger(__name__)
 def process_sector_analysis_queue():
     """Processa fila de análises de setor por IA"""
 
-    # Buscar próxima task pendente
-    task = TaskQueue.objects.filter(
-        task_type='generate_sector_analysis',
-        status='pending'
-    ).first()
-
-    if not task:
-        return False
-
-    # Marcar como processando
-    task.status = 'processing'
-    task.started_at = timezone.now()
-    task.attempts += 1
-    task.save()
+    with transaction.atomic():
+        # Próxima task pendente e vencida (retries respeitam o backoff)
+        task = TaskQueue.objects.select_for_update(skip_locked=True).filter(
+            task_type='generate_sector_analysis',
+            status='pending',
+            run_after__lte=timezone.now()
+        ).order_by('created_at').first()
+
+        if not task:
+            return False
+
+        # Marcar como processando, com lease deste worker (senão
+        # recover_stuck_tasks a devolveria à fila no meio da análise)
+        now = timezone.now()
+        task.status = 'processing'
+        task.started_at = now
+        task.attempts += 1
+        task.locked_by = TaskQueueWorker.worker_id()
+        task.locked_until = now + timedelta(seconds=TaskQueueWorker.lease_seconds(task.task_type))
+        task.save(update_fields=['status', 'started_at', 'attempts', 'locked_by', 'locked_until'])
 
     try:
         # Extrair parâmetros
@@ -34,34 +43,31 @@ def process_sector_analysis_queue():
         logger.info(f"Processando análise IA para setor {setor_id}, campanha {campaign_id}")
 
         # Gerar análise usando service
-        analysis = SectorAnalysisService.gerar_analise(setor_id, campaign_id)
+        with TaskQueueWorker.heartbeat_em_segundo_plano(task):
+            analysis = SectorAnalysisService.gerar_analise(setor_id, campaign_id)
 
         # Marcar como concluído
         task.status = 'completed'
         task.completed_at = timezone.now()
         task.payload['analysis_id'] = analysis.id
-        task.save()
+        task.locked_by = ''
+        task.locked_until = None
+        task.save(update_fields=['status', 'completed_at', 'payload', 'locked_by', 'locked_until'])
 
         logger.info(f"Análise gerada com sucesso: ID {analysis.id}")
         return True
 
     except Exception as e:
         logger.error(f"Erro ao processar análise: {str(e)}")
-        task.error_message = str(e)
-
-        if task.attempts >= task.max_attempts:
-            task.status = 'failed'
-        else:
-            task.status = 'pending'  # Retry
-
-        task.save()
+        TaskQueueWorker.schedule_retry(task, str(e))
+        task.save(update_fields=TaskQueueWorker.RETRY_FIELDS)
         return False
 
 
 def enqueue_sector_analysis(setor_id, campaign_id, user_id=None):
     """Enfileira análise de setor para processamento em background"""
 
-    task = TaskQueue.objects.create(
+    task = TaskQueue.objects.enqueue(
         task_type='generate_sector_analysis',
         payload={
             'setor_id': setor_id,
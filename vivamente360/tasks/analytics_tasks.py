@@ -1,71 +1,536 @@
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Count, Max, Sum
 from apps.analytics.models import (
     DimTempo, DimEstrutura, DimDemografia, DimDimensaoHSE,
-    FactScoreDimensao, FactIndicadorCampanha
+    FactScoreDimensao, FactIndicadorCampanha, FactRespostaPergunta,
+    CampaignAnalyticsState
 )
+from apps.invitations.models import SurveyInvitation
 from apps.responses.models import SurveyResponse
+from services.question_catalog import QuestionCatalog
 from services.score_service import ScoreService
-from services.risk_service import RiskService
+from decimal import Decimal
+import numpy as np
+import logging
 
+logger = logging.getLogger(__name__)
 
-def rebuild_campaign_analytics(campaign):
-    responses = SurveyResponse.objects.filter(campaign=campaign).select_related(
-        'unidade', 'setor'
+BATCH_SIZE = 2000
+
+CAMPOS_MEDIDAS = [
+    'score_medio', 'probabilidade', 'severidade', 'nivel_risco', 'classificacao', 'cor',
+    'total_respostas', 'soma_score', 'soma_nivel_risco',
+    'qtd_critico', 'qtd_importante', 'qtd_moderado', 'qtd_aceitavel',
+]
+
+
+def _get_or_create_many(model, cache, chaves, lookup, defaults):
+    """
+    Resolve em lote as chaves de dimensão que ainda não estão no cache.
+
+    Args:
+        model: Model da dimensão
+        cache: dict chave -> instância (atualizado in-place)
+        chaves: chaves necessárias para o lote atual
+        lookup: função chave -> dict de campos únicos
+        defaults: função chave -> dict com os demais campos
+    """
+    faltantes = [chave for chave in set(chaves) if chave not in cache]
+    if not faltantes:
+        return
+
+    model.objects.bulk_create(
+        [model(**lookup(chave), **defaults(chave)) for chave in faltantes],
+        ignore_conflicts=True
     )
 
-    for response in responses:
-        dim_tempo, _ = DimTempo.objects.get_or_create(
-            data=response.created_at.date(),
-            defaults={
-                'ano': response.created_at.year,
-                'mes': response.created_at.month,
-                'trimestre': (response.created_at.month - 1) // 3 + 1,
-                'semana_ano': response.created_at.isocalendar()[1],
-                'dia_semana': response.created_at.weekday(),
-                'nome_mes': response.created_at.strftime('%B')
+    campos = list(lookup(faltantes[0]).keys())
+    filtro = {f'{campos[0]}__in': [lookup(chave)[campos[0]] for chave in faltantes]}
+    for instancia in model.objects.filter(**filtro):
+        chave = tuple(getattr(instancia, campo) for campo in campos)
+        chave = chave[0] if len(chave) == 1 else chave
+        cache.setdefault(chave, instancia)
+
+
+class _DimensionCache:
+    """Chaves das dimensões em memória durante o rebuild de uma campanha."""
+
+    def __init__(self, campaign):
+        self.campaign = campaign
+        empresa = campaign.empresa
+
+        self.tempo = {}
+        self.demografia = {
+            (d.faixa_etaria, d.tempo_empresa, d.genero): d
+            for d in DimDemografia.objects.all()
+        }
+        # cargo_id=0 para respostas anônimas (campo removido para proteção de identidade)
+        self.estrutura = {
+            (d.unidade_id, d.setor_id): d
+            for d in DimEstrutura.objects.filter(empresa_id=empresa.id, cargo_id=0)
+        }
+        self.hse = {d.codigo: d for d in DimDimensaoHSE.objects.all()}
+
+        _get_or_create_many(
+            DimDimensaoHSE, self.hse, ScoreService.DIMENSOES.keys(),
+            lookup=lambda codigo: {'codigo': codigo},
+            defaults=lambda codigo: {
+                'nome': codigo.replace('_', ' ').title(),
+                'tipo': 'negativo' if codigo in ScoreService.DIMENSOES_NEGATIVAS else 'positivo'
             }
         )
 
-        # cargo_id=0 para respostas anônimas (campo removido para proteção de identidade)
-        dim_estrutura, _ = DimEstrutura.objects.get_or_create(
-            empresa_id=campaign.empresa.id,
-            empresa_nome=campaign.empresa.nome,
-            unidade_id=response.unidade.id,
-            unidade_nome=response.unidade.nome,
-            setor_id=response.setor.id,
-            setor_nome=response.setor.nome,
-            cargo_id=0,
-            cargo_nome='',
-            cargo_nivel=''
+    def carregar(self, rows):
+        """Garante no cache todas as chaves usadas por um lote de respostas."""
+        datas = [row['created_at'].date() for row in rows]
+
+        self.garantir_datas(datas)
+        _get_or_create_many(
+            DimDemografia, self.demografia,
+            [(row['faixa_etaria'], row['tempo_empresa'], row['genero']) for row in rows],
+            lookup=lambda chave: {'faixa_etaria': chave[0], 'tempo_empresa': chave[1], 'genero': chave[2]},
+            defaults=lambda chave: {}
         )
+        self.garantir_estruturas({
+            (row['unidade_id'], row['setor_id']): (row['unidade__nome'], row['setor__nome'])
+            for row in rows
+        })
+
+        return datas
 
-        dim_demografia, _ = DimDemografia.objects.get_or_create(
-            faixa_etaria=response.faixa_etaria,
-            tempo_empresa=response.tempo_empresa,
-            genero=response.genero
+    def garantir_datas(self, datas):
+        _get_or_create_many(
+            DimTempo, self.tempo, datas,
+            lookup=lambda data: {'data': data},
+            defaults=lambda data: {
+                'ano': data.year,
+                'mes': data.month,
+                'trimestre': (data.month - 1) // 3 + 1,
+                'semana_ano': data.isocalendar()[1],
+                'dia_semana': data.weekday(),
+                'nome_mes': data.strftime('%B')
+            }
         )
 
-        scores = ScoreService.processar_resposta_completa(response.respostas)
+    def garantir_estruturas(self, nomes):
+        """
+        Args:
+            nomes: dict (unidade_id, setor_id) -> (unidade_nome, setor_nome)
+        """
+        empresa = self.campaign.empresa
+        faltantes = [chave for chave in nomes if chave not in self.estrutura]
+        if not faltantes:
+            return
 
-        for dimensao_codigo, data in scores.items():
-            dim_hse, _ = DimDimensaoHSE.objects.get_or_create(
-                codigo=dimensao_codigo,
-                defaults={
-                    'nome': dimensao_codigo.replace('_', ' ').title(),
-                    'tipo': 'negativo' if dimensao_codigo in ScoreService.DIMENSOES_NEGATIVAS else 'positivo'
-                }
+        DimEstrutura.objects.bulk_create([
+            DimEstrutura(
+                empresa_id=empresa.id,
+                empresa_nome=empresa.nome,
+                unidade_id=unidade_id,
+                unidade_nome=nomes[(unidade_id, setor_id)][0],
+                setor_id=setor_id,
+                setor_nome=nomes[(unidade_id, setor_id)][1],
+                cargo_id=0,
+                cargo_nome='',
+                cargo_nivel=''
             )
+            for unidade_id, setor_id in faltantes
+        ], ignore_conflicts=True)
+        for d in DimEstrutura.objects.filter(
+            empresa_id=empresa.id, cargo_id=0, setor_id__in=[s for _, s in faltantes]
+        ):
+            self.estrutura.setdefault((d.unidade_id, d.setor_id), d)
+
+
+class _AcumuladorFatos:
+    """
+    Medidas aditivas por grão (tempo × estrutura × demografia), com uma
+    coluna por dimensão HSE-IT. Scores são somados em centésimos inteiros
+    para que a soma seja exata.
+    """
+
+    # Faixas NR-1 na ordem dos campos qtd_*: crítico, importante, moderado, aceitável
+    FAIXAS_NIVEL = ((13, 16), (9, 12), (5, 8), (0, 4))
+
+    def __init__(self):
+        total_dimensoes = len(ScoreService.DIMENSOES)
+        self.indices = {}
+        self.contagem = np.zeros(0, dtype=np.int64)
+        self.soma_centesimos = np.zeros((0, total_dimensoes), dtype=np.int64)
+        self.soma_niveis = np.zeros((0, total_dimensoes), dtype=np.int64)
+        self.histograma = np.zeros((0, total_dimensoes, len(self.FAIXAS_NIVEL)), dtype=np.int64)
+
+    def _indice(self, chave):
+        indice = self.indices.setdefault(chave, len(self.indices))
+        if indice >= len(self.contagem):
+            capacidade = max(16, 2 * len(self.contagem))
+            for nome in ('contagem', 'soma_centesimos', 'soma_niveis', 'histograma'):
+                atual = getattr(self, nome)
+                ampliado = np.zeros((capacidade,) + atual.shape[1:], dtype=np.int64)
+                ampliado[:len(atual)] = atual
+                setattr(self, nome, ampliado)
+        return indice
+
+    def adicionar_lote(self, chaves, scores, niveis):
+        linhas = np.array([self._indice(chave) for chave in chaves], dtype=np.intp)
+        histograma = np.stack(
+            [(niveis >= minimo) & (niveis <= maximo) for minimo, maximo in self.FAIXAS_NIVEL],
+            axis=2
+        )
+        np.add.at(self.contagem, linhas, 1)
+        np.add.at(self.soma_centesimos, linhas, np.rint(scores * 100).astype(np.int64))
+        np.add.at(self.soma_niveis, linhas, niveis.astype(np.int64))
+        np.add.at(self.histograma, linhas, histograma.astype(np.int64))
+
+    def adicionar_fato(self, chave, j, fato):
+        """Soma as medidas de um fato já gravado (a contagem é somada à parte)."""
+        indice = self._indice(chave)
+        self.soma_centesimos[indice, j] += int(fato.soma_score * 100)
+        self.soma_niveis[indice, j] += fato.soma_nivel_risco
+        self.histograma[indice, j] += [
+            fato.qtd_critico, fato.qtd_importante, fato.qtd_moderado, fato.qtd_aceitavel
+        ]
+
+    def __iter__(self):
+        return iter(self.indices.items())
+
+
+class _AcumuladorPerguntas:
+    """Histograma de valores 0–4 por estrutura × pergunta."""
+
+    VALORES = 5
+
+    def __init__(self):
+        self.histogramas = {}
+
+    @staticmethod
+    def _valor(valor):
+        # Itens ausentes ou inválidos ficam fora do histograma (-1)
+        try:
+            return int(valor)
+        except (ValueError, TypeError):
+            return -1
+
+    def adicionar_lote(self, estruturas, respostas):
+        valores = np.array([
+            [self._valor(r.get(str(i))) for i in range(1, ScoreService.TOTAL_PERGUNTAS + 1)]
+            for r in respostas
+        ], dtype=np.int64).reshape(len(respostas), ScoreService.TOTAL_PERGUNTAS)
+        contagens = (valores[:, :, None] == np.arange(self.VALORES)).astype(np.int64)
+
+        estruturas = np.asarray(estruturas, dtype=np.int64)
+        for estrutura_id in np.unique(estruturas):
+            parcial = contagens[estruturas == estrutura_id].sum(axis=0)
+            atual = self.histogramas.get(int(estrutura_id))
+            self.histogramas[int(estrutura_id)] = parcial if atual is None else atual + parcial
+
+
+def _carregar_lote(cache, acumulador, acumulador_perguntas, rows):
+    """Calcula os scores do lote com o kernel vetorizado e acumula por grão."""
+    datas = cache.carregar(rows)
+
+    respostas = [row['respostas'] or {} for row in rows]
+    scores = ScoreService.score_matrix(respostas)
+    niveis = ScoreService.nivel_matrix(scores)
+
+    chaves = [
+        (
+            cache.tempo[datas[linha]].id,
+            cache.estrutura[(row['unidade_id'], row['setor_id'])].id,
+            cache.demografia[(row['faixa_etaria'], row['tempo_empresa'], row['genero'])].id,
+        )
+        for linha, row in enumerate(rows)
+    ]
+    acumulador.adicionar_lote(chaves, scores, niveis)
+    acumulador_perguntas.adicionar_lote([chave[1] for chave in chaves], respostas)
+
+
+def _preencher_fato(fato, acumulador, indice, j, dimensao_codigo, interpretacoes):
+    """Atualiza medidas e classificação (pela média do grão) de um fato."""
+    contagem = int(acumulador.contagem[indice])
+    centesimos = int(acumulador.soma_centesimos[indice, j])
+    critico, importante, moderado, aceitavel = (int(v) for v in acumulador.histograma[indice, j])
+
+    score_medio = round(centesimos / 100 / contagem, 2)
+    probabilidade = ScoreService.classificar_risco(score_medio, dimensao_codigo)['probabilidade']
+    if probabilidade not in interpretacoes:
+        interpretacoes[probabilidade] = ScoreService.calcular_nivel_risco(probabilidade, 4)
+    nivel = interpretacoes[probabilidade]
+
+    fato.score_medio = score_medio
+    fato.probabilidade = probabilidade
+    fato.severidade = 2
+    fato.nivel_risco = nivel['nivel']
+    fato.classificacao = nivel['interpretacao']
+    fato.cor = nivel['cor']
+    fato.total_respostas = contagem
+    fato.soma_score = Decimal(centesimos).scaleb(-2)
+    fato.soma_nivel_risco = int(acumulador.soma_niveis[indice, j])
+    fato.qtd_critico = critico
+    fato.qtd_importante = importante
+    fato.qtd_moderado = moderado
+    fato.qtd_aceitavel = aceitavel
+
 
-            FactScoreDimensao.objects.create(
-                campaign=campaign,
-                dim_tempo=dim_tempo,
-                dim_estrutura=dim_estrutura,
-                dim_demografia=dim_demografia,
-                dim_hse=dim_hse,
-                score_medio=data['score'],
-                probabilidade=data['probabilidade'],
-                severidade=2,
-                nivel_risco=data['nivel'],
-                classificacao=data['interpretacao'],
-                cor=data['cor'],
-                total_respostas=1
+def _gravar_fatos(campaign, cache, acumulador, incremental, batch_size):
+    """
+    Grava uma linha por grão × dimensão. No modo incremental as linhas já
+    existentes dos grãos tocados são somadas ao acumulador e atualizadas.
+    """
+    dimensoes = list(ScoreService.DIMENSOES.keys())
+    hse_ids = {cache.hse[codigo].id: j for j, codigo in enumerate(dimensoes)}
+
+    existentes = {}
+    if incremental and acumulador.indices:
+        tempos = {chave[0] for chave in acumulador.indices}
+        for fato in FactScoreDimensao.objects.filter(campaign=campaign, dim_tempo_id__in=tempos):
+            chave = (fato.dim_tempo_id, fato.dim_estrutura_id, fato.dim_demografia_id)
+            if chave in acumulador.indices:
+                existentes[chave + (fato.dim_hse_id,)] = fato
+
+        # A contagem do grão é a mesma nas 7 dimensões: soma uma única vez
+        contagens = {}
+        for (tempo, estrutura, demografia, hse_id), fato in existentes.items():
+            chave = (tempo, estrutura, demografia)
+            contagens[chave] = fato.total_respostas
+            acumulador.adicionar_fato(chave, hse_ids[hse_id], fato)
+        for chave, contagem in contagens.items():
+            acumulador.contagem[acumulador.indices[chave]] += contagem
+
+    novos = []
+    atualizados = []
+    interpretacoes = {}
+    for chave, indice in acumulador:
+        for j, dimensao_codigo in enumerate(dimensoes):
+            dim_hse = cache.hse[dimensao_codigo]
+            fato = existentes.get(chave + (dim_hse.id,))
+            if fato is None:
+                fato = FactScoreDimensao(
+                    campaign=campaign,
+                    dim_tempo_id=chave[0],
+                    dim_estrutura_id=chave[1],
+                    dim_demografia_id=chave[2],
+                    dim_hse=dim_hse,
+                )
+                novos.append(fato)
+            else:
+                atualizados.append(fato)
+            _preencher_fato(fato, acumulador, indice, j, dimensao_codigo, interpretacoes)
+
+    FactScoreDimensao.objects.bulk_create(novos, batch_size=batch_size)
+    if atualizados:
+        FactScoreDimensao.objects.bulk_update(atualizados, CAMPOS_MEDIDAS, batch_size=batch_size)
+    return len(novos) + len(atualizados)
+
+
+def _gravar_perguntas(campaign, acumulador, incremental, batch_size):
+    """
+    Grava os histogramas por estrutura × pergunta, somando aos já gravados
+    no modo incremental.
+    """
+    perguntas = {}
+    for pergunta in QuestionCatalog.get().perguntas:
+        perguntas.setdefault(pergunta.numero, pergunta)
+
+    existentes = {}
+    if incremental and acumulador.histogramas:
+        existentes = {
+            (fato.dim_estrutura_id, fato.pergunta_id): fato
+            for fato in FactRespostaPergunta.objects.filter(
+                campaign=campaign, dim_estrutura_id__in=list(acumulador.histogramas)
             )
+        }
+
+    novos = []
+    atualizados = []
+    for estrutura_id, histograma in acumulador.histogramas.items():
+        for numero, pergunta in perguntas.items():
+            if not 1 <= numero <= ScoreService.TOTAL_PERGUNTAS:
+                continue
+            contagens = [int(v) for v in histograma[numero - 1]]
+
+            fato = existentes.get((estrutura_id, pergunta.id))
+            if fato is None:
+                fato = FactRespostaPergunta(
+                    campaign=campaign, dim_estrutura_id=estrutura_id, pergunta=pergunta
+                )
+                novos.append(fato)
+            else:
+                contagens = [
+                    atual + getattr(fato, f'qtd_valor_{valor}')
+                    for valor, atual in enumerate(contagens)
+                ]
+                atualizados.append(fato)
+
+            total = sum(contagens)
+            for valor, quantidade in enumerate(contagens):
+                setattr(fato, f'qtd_valor_{valor}', quantidade)
+            fato.total_respostas = total
+            fato.media = round(sum(v * q for v, q in enumerate(contagens)) / total, 2) if total else 0
+
+    FactRespostaPergunta.objects.bulk_create(novos, batch_size=batch_size)
+    if atualizados:
+        FactRespostaPergunta.objects.bulk_update(
+            atualizados,
+            [f'qtd_valor_{valor}' for valor in range(_AcumuladorPerguntas.VALORES)] + ['media', 'total_respostas'],
+            batch_size=batch_size
+        )
+    return len(novos) + len(atualizados)
+
+
+def _gravar_indicadores(campaign, cache, state):
+    """
+    Recalcula os indicadores por estrutura a partir de FactScoreDimensao
+    (já atualizado) e da contagem de convites. São poucas linhas por
+    campanha, então são sempre substituídas por inteiro.
+    """
+    total_dimensoes = len(ScoreService.DIMENSOES)
+
+    convites = list(
+        SurveyInvitation.objects.filter(campaign=campaign)
+        .values('unidade_id', 'unidade__nome', 'setor_id', 'setor__nome')
+        .annotate(total=Count('id'), ultimo_id=Max('id'))
+        .order_by()
+    )
+    cache.garantir_estruturas({
+        (c['unidade_id'], c['setor_id']): (c['unidade__nome'], c['setor__nome'])
+        for c in convites
+    })
+    convidados = {
+        cache.estrutura[(c['unidade_id'], c['setor_id'])].id: c['total']
+        for c in convites
+    }
+
+    riscos = {
+        linha['dim_estrutura_id']: linha
+        for linha in FactScoreDimensao.objects.filter(campaign=campaign)
+        .values('dim_estrutura_id')
+        .annotate(
+            avaliacoes=Sum('total_respostas'),
+            soma_niveis=Sum('soma_nivel_risco'),
+            critico=Sum('qtd_critico'),
+            importante=Sum('qtd_importante'),
+            moderado=Sum('qtd_moderado'),
+            aceitavel=Sum('qtd_aceitavel'),
+        )
+        .order_by()
+    }
+
+    hoje = timezone.localdate()
+    cache.garantir_datas([hoje])
+
+    indicadores = []
+    for estrutura_id in set(convidados) | set(riscos):
+        risco = riscos.get(estrutura_id, {})
+        total_convidados = convidados.get(estrutura_id, 0)
+        avaliacoes = risco.get('avaliacoes') or 0
+        total_respondidos = avaliacoes // total_dimensoes
+        altos = (risco.get('critico') or 0) + (risco.get('importante') or 0)
+
+        indicadores.append(FactIndicadorCampanha(
+            campaign=campaign,
+            dim_tempo=cache.tempo[hoje],
+            dim_estrutura_id=estrutura_id,
+            total_convidados=total_convidados,
+            total_respondidos=total_respondidos,
+            percentual_adesao=round(total_respondidos / total_convidados * 100, 2) if total_convidados else 0,
+            total_risco_critico=risco.get('critico') or 0,
+            total_risco_importante=risco.get('importante') or 0,
+            total_risco_moderado=risco.get('moderado') or 0,
+            total_risco_aceitavel=risco.get('aceitavel') or 0,
+            percentual_risco_alto=round(altos / avaliacoes * 100, 2) if avaliacoes else 0,
+            igrp_score=round((risco.get('soma_niveis') or 0) / avaliacoes, 2) if avaliacoes else 0,
+            soma_nivel_risco=risco.get('soma_niveis') or 0,
+        ))
+
+    FactIndicadorCampanha.objects.filter(campaign=campaign).delete()
+    FactIndicadorCampanha.objects.bulk_create(indicadores)
+
+    state.last_invitation_id = max((c['ultimo_id'] for c in convites), default=0)
+    return len(indicadores)
+
+
+def rebuild_campaign_analytics(campaign, incremental=False, batch_size=BATCH_SIZE):
+    """
+    Reconstrói os fatos analíticos de uma campanha.
+
+    Os fatos são pré-agregados no grão tempo × estrutura × demografia ×
+    dimensão, com somas, contagem e histograma de níveis NR; assim os
+    seletores leem dezenas de linhas em vez de uma por resposta. No mesmo
+    passo são gravados os histogramas por pergunta (FactRespostaPergunta)
+    e os indicadores por estrutura (FactIndicadorCampanha).
+
+    - Completo (padrão): substitui todos os fatos da campanha, de forma
+      idempotente, dentro de uma única transação.
+    - Incremental: processa apenas respostas ainda não marcadas com
+      analytics_carregada e soma nos grãos existentes (cai para o completo
+      se a campanha ainda não tem rebuild registrado).
+
+    Cada lote carregado é marcado na mesma transação em que os fatos são
+    gravados; por isso uma resposta confirmada fora da ordem dos ids não é
+    perdida pelo incremental.
+
+    Returns:
+        dict com 'respostas' processadas, 'fatos' gravados e 'incremental'
+    """
+    with transaction.atomic():
+        state, _ = CampaignAnalyticsState.objects.select_for_update().get_or_create(campaign=campaign)
+
+        # Sem rebuild anterior registrado não há fatos onde somar o incremental
+        incremental = incremental and state.rebuilt_at is not None
+
+        responses = SurveyResponse.objects.filter(campaign=campaign)
+        if incremental:
+            responses = responses.filter(analytics_carregada=False)
+        else:
+            FactScoreDimensao.objects.filter(campaign=campaign).delete()
+            FactRespostaPergunta.objects.filter(campaign=campaign).delete()
+            state.last_response_id = 0
+            state.last_response_created_at = None
+            state.total_respostas = 0
+
+        rows = responses.order_by('id').values(
+            'id', 'created_at', 'unidade_id', 'unidade__nome', 'setor_id', 'setor__nome',
+            'faixa_etaria', 'tempo_empresa', 'genero', 'respostas'
+        )
+
+        cache = _DimensionCache(campaign)
+        acumulador = _AcumuladorFatos()
+        acumulador_perguntas = _AcumuladorPerguntas()
+        total_respostas = 0
+        lote = []
+
+        def carregar():
+            nonlocal total_respostas
+            _carregar_lote(cache, acumulador, acumulador_perguntas, lote)
+            SurveyResponse.objects.filter(
+                id__in=[row['id'] for row in lote], analytics_carregada=False
+            ).update(analytics_carregada=True)
+            total_respostas += len(lote)
+            state.last_response_id = max(state.last_response_id, lote[-1]['id'])
+            state.last_response_created_at = lote[-1]['created_at']
+
+        for row in rows.iterator(chunk_size=batch_size):
+            lote.append(row)
+            if len(lote) >= batch_size:
+                carregar()
+                lote = []
+
+        if lote:
+            carregar()
+
+        total_fatos = _gravar_fatos(campaign, cache, acumulador, incremental, batch_size)
+        total_fatos += _gravar_perguntas(campaign, acumulador_perguntas, incremental, batch_size)
+        total_fatos += _gravar_indicadores(campaign, cache, state)
+
+        state.total_respostas += total_respostas
+        state.rebuilt_at = timezone.now()
+        state.save()
+
+    logger.info(
+        f"Analytics da campanha {campaign.id} reconstruído "
+        f"({'incremental' if incremental else 'completo'}): "
+        f"{total_respostas} respostas, {total_fatos} fatos"
+    )
+    return {'respostas': total_respostas, 'fatos': total_fatos, 'incremental': incremental}
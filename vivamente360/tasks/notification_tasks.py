@@ -9,15 +9,36 @@ Este módulo contém tasks assíncronas para:
 
 from celery import shared_task
 from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from apps.core.models import TaskQueue
 from services.notification_service import NotificationService
-from services.email_service import get_email_service
+from services.task_processors import TaskProcessor, TaskQueueWorker
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _reivindicar(queryset, limit=None):
+    """
+    Reivindica as tasks do queryset com SELECT ... FOR UPDATE SKIP LOCKED
+    (status 'processing', lease deste worker) e as retorna.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        candidatas = queryset.select_for_update(skip_locked=True).values_list('id', flat=True)
+        ids = list(candidatas[:limit] if limit else candidatas)
+        TaskQueue.objects.filter(id__in=ids).update(
+            status='processing',
+            started_at=now,
+            attempts=F('attempts') + 1,
+            locked_by=TaskQueueWorker.worker_id(),
+            locked_until=now + timedelta(seconds=TaskQueueWorker.lease_seconds())
+        )
+    return list(TaskQueue.objects.filter(id__in=ids))
+
+
 @shared_task(name='process_notification_queue')
 def process_notification_queue(batch_size=10, max_attempts=3):
     """
@@ -58,64 +79,26 @@ def process_notification_queue(batch_size=10, max_attempts=3):
     }
 
     try:
-        # Buscar notificações pendentes
-        pending_tasks = TaskQueue.objects.filter(
+        # Tasks que já esgotaram as tentativas não são reenviadas
+        stats['skipped'] = TaskQueue.objects.filter(
             task_type='send_notification_email',
-            status='pending'
-        ).order_by('created_at')[:batch_size]
-
-        email_service = get_email_service()
-
-        for task in pending_tasks:
-            stats['processed'] += 1
-
-            try:
-                # Verificar número de tentativas
-                if task.attempts >= max_attempts:
-                    task.status = 'failed'
-                    task.error_message = f"Excedeu número máximo de tentativas ({max_attempts})"
-                    task.save()
-                    stats['skipped'] += 1
-                    logger.warning(f"Task #{task.id} excedeu max_attempts")
-                    continue
-
-                # Atualizar status e tentativas
-                task.status = 'processing'
-                task.attempts += 1
-                task.save()
-
-                # Extrair dados do payload
-                payload = task.payload
-                to_email = payload.get('to')
-                subject = payload.get('subject')
-                html_body = payload.get('html_body')
-
-                # Validar dados
-                if not all([to_email, subject, html_body]):
-                    raise ValueError("Payload incompleto: faltam campos obrigatórios")
-
-                # Enviar email
-                success = email_service.send(
-                    to=to_email,
-                    subject=subject,
-                    html_body=html_body
-                )
-
-                if success:
-                    task.status = 'completed'
-                    task.completed_at = timezone.now()
-                    task.save()
-                    stats['success'] += 1
-                    logger.info(f"Task #{task.id} processada com sucesso")
-                else:
-                    raise Exception("EmailService retornou False")
-
-            except Exception as e:
-                task.status = 'failed' if task.attempts >= max_attempts else 'pending'
-                task.error_message = str(e)
-                task.save()
-                stats['failed'] += 1
-                logger.error(f"Erro ao processar Task #{task.id}: {str(e)}", exc_info=True)
+            status='pending',
+            attempts__gte=max_attempts
+        ).update(status='failed', error_message=f"Excedeu número máximo de tentativas ({max_attempts})")
+
+        # Lote enviado com EMAIL_CONCURRENCY requisições em voo; o status de
+        # cada task é gravado em bulk por process_email_batch
+        tasks = _reivindicar(
+            TaskQueue.objects.filter(
+                task_type='send_notification_email',
+                status='pending',
+                run_after__lte=timezone.now()
+            ).order_by('created_at'),
+            batch_size
+        )
+        stats['processed'] = len(tasks)
+        stats['success'] = TaskProcessor.process_email_batch(tasks)
+        stats['failed'] = stats['processed'] - stats['success']
 
         logger.info(f"Processamento de notificações concluído: {stats}")
         return stats
@@ -303,61 +286,31 @@ def check_critical_risks():
 @shared_task(name='send_bulk_notifications')
 def send_bulk_notifications(notification_ids):
     """
-    Envia notificações em lote usando bulk email.
+    Envia notificações em lote pela API de batch do provedor de e-mail.
 
     Args:
         notification_ids (list): Lista de IDs de TaskQueue para processar
 
     Returns:
-        dict: Resultado do envio em lote
+        dict: {'sent': enviados, 'failed': falhas}; o resultado de cada
+        mensagem é gravado na sua task (TaskProcessor.process_email_batch)
 
     Nota:
         Útil para envio de notificações em massa (ex: resultados de campanha).
     """
-    try:
-        tasks = TaskQueue.objects.filter(
-            id__in=notification_ids,
-            task_type='send_notification_email',
-            status='pending'
-        )
-
-        if not tasks.exists():
-            logger.warning("Nenhuma notificação encontrada para envio em lote")
-            return {'sent': 0, 'failed': 0}
-
-        # Preparar lista de emails
-        emails = []
-        for task in tasks:
-            payload = task.payload
-            emails.append({
-                'to': payload.get('to'),
-                'subject': payload.get('subject'),
-                'html_body': payload.get('html_body'),
-            })
-
-            # Marcar como processando
-            task.status = 'processing'
-            task.attempts += 1
-            task.save()
-
-        # Enviar em lote
-        email_service = get_email_service()
-        result = email_service.send_bulk(emails)
-
-        # Atualizar status das tasks
-        success_count = result.get('sent', 0)
-        failed_count = result.get('failed', 0)
-
-        # Simplificação: marcar todas como completed se maioria teve sucesso
-        if success_count > failed_count:
-            tasks.update(status='completed', completed_at=timezone.now())
-        else:
-            tasks.update(status='failed', error_message='Falha no envio em lote')
-
-        logger.info(f"Envio em lote concluído: {result}")
-        return result
-
-    except Exception as e:
-        logger.error(f"Erro no envio em lote: {str(e)}", exc_info=True)
-        tasks.update(status='failed', error_message=str(e))
-        raise
+    # Reivindicar as tasks (outro worker pode estar com alguma delas)
+    tasks = _reivindicar(TaskQueue.objects.filter(
+        id__in=notification_ids,
+        task_type='send_notification_email',
+        status='pending'
+    ))
+
+    if not tasks:
+        logger.warning("Nenhuma notificação encontrada para envio em lote")
+        return {'sent': 0, 'failed': 0}
+
+    sent = TaskProcessor.process_email_batch(tasks)
+
+    result = {'sent': sent, 'failed': len(tasks) - sent}
+    logger.info(f"Envio em lote concluído: {result}")
+    return result
@@ -0,0 +1,43 @@
+"""
+Testes do escalonamento justo entre empresas da fila de tarefas
+"""
+
+import unittest
+from services.fair_scheduler import FairScheduler
+
+
+class TestFairScheduler(unittest.TestCase):
+
+    def test_empresa_grande_nao_monopoliza(self):
+        """Uma empresa com 50k tasks não impede as demais de serem atendidas"""
+        alocacao = FairScheduler().alocar(10, {1: 50000, 2: 3, 3: 100})
+        self.assertEqual(alocacao[2], 3)
+        self.assertGreaterEqual(alocacao[3], 3)
+        self.assertEqual(sum(alocacao.values()), 10)
+
+    def test_rodizio_com_um_slot_por_ciclo(self):
+        """Com um slot por ciclo, as empresas se alternam"""
+        scheduler = FairScheduler()
+        atendidas = [
+            next(iter(scheduler.alocar(1, {1: 100, 2: 100, 3: 100})))
+            for _ in range(6)
+        ]
+        self.assertEqual(sorted(atendidas[:3]), [1, 2, 3])
+        self.assertEqual(sorted(atendidas[3:]), [1, 2, 3])
+
+    def test_pesos(self):
+        """Empresa com peso 3 recebe ~3x mais slots"""
+        alocacao = FairScheduler().alocar(8, {1: 100, 2: 100}, pesos={1: 3})
+        self.assertEqual(alocacao, {1: 6, 2: 2})
+
+    def test_limite_de_concorrencia(self):
+        """O limite considera as tasks já em execução da empresa"""
+        alocacao = FairScheduler().alocar(10, {1: 100, 2: 30}, em_execucao={1: 4}, limites={1: 5})
+        self.assertEqual(alocacao, {1: 1, 2: 9})
+
+    def test_sem_pendentes(self):
+        self.assertEqual(FairScheduler().alocar(10, {}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Testes da importação de convites em lote (ImportService.process_import)
+
+Para executar:
+    python manage.py test tests.test_import_service
+"""
+
+from datetime import date, timedelta
+from django.test import TestCase
+from django.utils import timezone
+from apps.invitations.models import SurveyInvitation
+from apps.structure.models import Cargo, Setor, Unidade
+from apps.surveys.models import Campaign
+from apps.tenants.models import Empresa
+from services.crypto_service import CryptoService
+from services.import_service import ImportService
+
+
+class ImportServiceTestCase(TestCase):
+    """Testes da importação de convites por CSV"""
+
+    def setUp(self):
+        self.empresa = Empresa.objects.create(nome='Empresa Teste', cnpj='12345678901234')
+        self.unidade = Unidade.objects.create(empresa=self.empresa, nome='Matriz')
+        self.setor = Setor.objects.create(unidade=self.unidade, nome='RH')
+        self.cargo = Cargo.objects.create(empresa=self.empresa, nome='Analista')
+        self.campanha = Campaign.objects.create(
+            empresa=self.empresa,
+            nome='Campanha Teste',
+            descricao='Descrição de teste',
+            status='active',
+            data_inicio=date.today(),
+            data_fim=date.today() + timedelta(days=30)
+        )
+        self.crypto = CryptoService()
+
+    def _linha(self, email, unidade='Matriz', setor='RH', cargo='Analista'):
+        return {'unidade': unidade, 'setor': setor, 'cargo': cargo, 'email': email}
+
+    def _importar(self, rows):
+        return ImportService.process_import(self.empresa, self.campanha, rows, self.crypto)
+
+    def _convite(self, email):
+        return SurveyInvitation.objects.get(
+            campaign=self.campanha, email_hash=self.crypto.blind_index(email)
+        )
+
+    def _criar_convite(self, email, status='pending'):
+        return SurveyInvitation.objects.create(
+            empresa=self.empresa,
+            campaign=self.campanha,
+            unidade=self.unidade,
+            setor=self.setor,
+            cargo=self.cargo,
+            email_encrypted=self.crypto.encrypt(email),
+            email_hash=self.crypto.blind_index(email),
+            status=status,
+            expires_at=timezone.now() + timedelta(hours=48)
+        )
+
+    def test_email_repetido_no_arquivo(self):
+        """A segunda ocorrência do e-mail (mesmo com outra caixa) é reportada como erro"""
+        result = self._importar([
+            self._linha('ana@example.com'),
+            self._linha('ANA@example.com'),
+        ])
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], ['Linha 3: e-mail repetido no arquivo'])
+        self.assertEqual(SurveyInvitation.objects.filter(campaign=self.campanha).count(), 1)
+
+    def test_reimportacao_atualiza_convite_pendente(self):
+        """E-mail com convite pendente recebe a estrutura nova, sem novo convite"""
+        self._criar_convite('ana@example.com')
+        outro_setor = Setor.objects.create(unidade=self.unidade, nome='Financeiro')
+
+        result = self._importar([self._linha('ana@example.com', setor='Financeiro')])
+
+        self.assertEqual((result['created'], result['updated'], result['skipped']), (0, 1, 0))
+        self.assertEqual(self._convite('ana@example.com').setor_id, outro_setor.id)
+        self.assertEqual(SurveyInvitation.objects.filter(campaign=self.campanha).count(), 1)
+
+    def test_reimportacao_ignora_convite_nao_pendente(self):
+        """E-mail cujo convite já foi enviado não é alterado"""
+        self._criar_convite('ana@example.com', status='sent')
+
+        result = self._importar([self._linha('ana@example.com', setor='Financeiro')])
+
+        self.assertEqual((result['created'], result['updated'], result['skipped']), (0, 0, 1))
+        self.assertEqual(self._convite('ana@example.com').setor_id, self.setor.id)
+
+    def test_cria_estrutura_faltante(self):
+        """Unidade, Setor e Cargo inexistentes são criados e usados no convite"""
+        result = self._importar([
+            self._linha('ana@example.com', unidade='Filial', setor='Logística', cargo='Motorista'),
+            self._linha('bruno@example.com', unidade='Filial', setor='Logística', cargo='Motorista'),
+        ])
+
+        self.assertEqual(result['created'], 2)
+        unidade = Unidade.objects.get(empresa=self.empresa, nome='Filial')
+        setor = Setor.objects.get(unidade=unidade, nome='Logística')
+        cargo = Cargo.objects.get(empresa=self.empresa, nome='Motorista')
+        convite = self._convite('bruno@example.com')
+        self.assertEqual(
+            (convite.unidade_id, convite.setor_id, convite.cargo_id),
+            (unidade.id, setor.id, cargo.id)
+        )
+
+    def test_campo_obrigatorio_vazio(self):
+        """Linha com campo obrigatório em branco é reportada com o número da linha"""
+        result = self._importar([
+            self._linha('ana@example.com'),
+            self._linha('bruno@example.com', setor='  '),
+            self._linha('', cargo=''),
+        ])
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], [
+            'Linha 3: campos vazios: setor',
+            'Linha 4: campos vazios: cargo, email',
+        ])
@@ -0,0 +1,44 @@
+"""
+Testes da paginação por chave (app_selectors.keyset.lotes_por_id)
+"""
+
+import unittest
+from types import SimpleNamespace
+from app_selectors.keyset import lotes_por_id
+
+
+class QuerysetFalso:
+    """Suporta só o que lotes_por_id usa: filter(id__gt), order_by('id'), only e fatia."""
+
+    def __init__(self, ids):
+        self.ids = sorted(ids)
+        self.campos = None
+
+    def only(self, *campos):
+        self.campos = campos
+        return self
+
+    def filter(self, id__gt):
+        filtrado = QuerysetFalso([i for i in self.ids if i > id__gt])
+        filtrado.campos = self.campos
+        return filtrado
+
+    def order_by(self, campo):
+        return self
+
+    def __getitem__(self, fatia):
+        return [SimpleNamespace(id=i) for i in self.ids[fatia]]
+
+
+class TestLotesPorId(unittest.TestCase):
+
+    def test_lotes_em_ordem_de_id(self):
+        lotes = lotes_por_id(QuerysetFalso([5, 1, 9, 3, 7]), 2)
+        self.assertEqual([[o.id for o in lote] for lote in lotes], [[1, 3], [5, 7], [9]])
+
+    def test_retoma_depois_do_ultimo_id(self):
+        lotes = lotes_por_id(QuerysetFalso([1, 2, 3, 4]), 10, ultimo_id=2)
+        self.assertEqual([[o.id for o in lote] for lote in lotes], [[3, 4]])
+
+    def test_queryset_vazio(self):
+        self.assertEqual(list(lotes_por_id(QuerysetFalso([]), 10)), [])
@@ -0,0 +1,43 @@
+"""
+Testes do backoff exponencial com jitter dos retries da fila de tarefas
+"""
+
+import random
+import unittest
+from services.retry_backoff import DEFAULT_POLICIES, calcular_atraso
+
+
+class TestRetryBackoff(unittest.TestCase):
+
+    def test_atraso_dobra_a_cada_tentativa(self):
+        """Sem jitter (rng no teto), o atraso dobra a cada falha"""
+        class Teto:
+            def uniform(self, a, b):
+                return b
+
+        atrasos = [calcular_atraso('default', tentativa, rng=Teto()) for tentativa in (1, 2, 3)]
+        self.assertEqual(atrasos, [30, 60, 120])
+
+    def test_atraso_limitado_ao_teto_da_politica(self):
+        """O atraso nunca passa do máximo do task_type"""
+        rng = random.Random(1)
+        for tentativa in range(1, 30):
+            atraso = calcular_atraso('send_email', tentativa, rng=rng)
+            self.assertLessEqual(atraso, DEFAULT_POLICIES['send_email']['max'])
+
+    def test_jitter_espalha_retries(self):
+        """Tasks que falham juntas não voltam todas no mesmo instante"""
+        rng = random.Random(7)
+        atrasos = [calcular_atraso('default', 3, rng=rng) for _ in range(100)]
+        self.assertTrue(all(60 <= atraso <= 120 for atraso in atrasos))
+        self.assertGreater(len({round(atraso) for atraso in atrasos}), 20)
+
+    def test_task_type_desconhecido_usa_default(self):
+        """task_type sem política própria cai na política 'default'"""
+        politicas = {'default': {'base': 10, 'max': 10}}
+        atraso = calcular_atraso('qualquer', 5, politicas=politicas, rng=random.Random(0))
+        self.assertTrue(5 <= atraso <= 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Testes de equivalência entre o kernel vetorizado e o caminho escalar do ScoreService
+"""
+
+import random
+import unittest
+from services.score_service import ScoreService
+
+
+class TestScoreMatrixEquivalencia(unittest.TestCase):
+    """Garante que score_matrix/nivel_matrix reproduzem processar_resposta_completa"""
+
+    def _assert_equivalente(self, lista_respostas):
+        scores = ScoreService.score_matrix(lista_respostas)
+        niveis = ScoreService.nivel_matrix(scores)
+
+        self.assertEqual(scores.shape, (len(lista_respostas), len(ScoreService.DIMENSOES)))
+
+        for linha, respostas in enumerate(lista_respostas):
+            escalar = ScoreService.processar_resposta_completa(respostas)
+            for j, dimensao in enumerate(ScoreService.DIMENSOES.keys()):
+                # Igualdade exata (bit a bit), não aproximada
+                self.assertEqual(float(scores[linha, j]), escalar[dimensao]['score'])
+                self.assertEqual(int(niveis[linha, j]), escalar[dimensao]['nivel'])
+
+    def test_respostas_aleatorias(self):
+        """Compara 2000 questionários aleatórios nos dois caminhos"""
+        rng = random.Random(360)
+        lista_respostas = [
+            {str(i): str(rng.randint(0, 4)) for i in range(1, 36)}
+            for _ in range(2000)
+        ]
+        self._assert_equivalente(lista_respostas)
+
+    def test_todas_as_somas_possiveis(self):
+        """Cobre todos os scores possíveis de cada dimensão (soma 0..4×itens)"""
+        lista_respostas = []
+        for itens in ScoreService.DIMENSOES.values():
+            for soma in range(0, 4 * len(itens) + 1):
+                respostas = {}
+                restante = soma
+                for item in itens:
+                    valor = min(4, restante)
+                    respostas[str(item)] = valor
+                    restante -= valor
+                lista_respostas.append(respostas)
+        self._assert_equivalente(lista_respostas)
+
+    def test_valores_ausentes_e_invalidos(self):
+        """Itens ausentes, None ou não numéricos valem 0 em ambos os caminhos"""
+        lista_respostas = [
+            {},
+            {'1': None, '2': 'abc', '3': '', '4': 4},
+            {'3': 4, '6': '4', '9': 3},
+        ]
+        self._assert_equivalente(lista_respostas)
+
+    def test_severidade_customizada(self):
+        """nivel_matrix respeita a severidade informada"""
+        respostas = {str(i): str(i % 5) for i in range(1, 36)}
+        scores = ScoreService.score_matrix([respostas])
+        niveis = ScoreService.nivel_matrix(scores, severidade_base=2)
+        escalar = ScoreService.processar_resposta_completa(respostas, severidade_base=2)
+
+        for j, dimensao in enumerate(ScoreService.DIMENSOES.keys()):
+            self.assertEqual(int(niveis[0, j]), escalar[dimensao]['nivel'])
+
+    def test_lista_vazia(self):
+        """Lista vazia gera matriz [0, 7]"""
+        self.assertEqual(ScoreService.score_matrix([]).shape, (0, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
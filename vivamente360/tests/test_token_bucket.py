@@ -0,0 +1,90 @@
+"""
+Testes do limitador de taxa (token bucket) do envio de e-mails
+"""
+
+import unittest
+from services.token_bucket import RedisTokenBucket, TokenBucket
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.agora += segundos
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_rajada_ate_a_capacidade(self):
+        """Com o balde cheio, `capacity` requisições passam sem esperar"""
+        relogio = RelogioFalso()
+        bucket = TokenBucket(2, capacity=5, clock=relogio, sleep=relogio.sleep)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(5)))
+        self.assertFalse(bucket.try_acquire())
+
+    def test_acquire_espera_a_reposicao(self):
+        """Balde vazio: a próxima ficha chega após 1/rate segundos"""
+        relogio = RelogioFalso()
+        bucket = TokenBucket(4, capacity=1, clock=relogio, sleep=relogio.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.25)
+        self.assertAlmostEqual(relogio.agora, 0.25)
+
+    def test_taxa_sustentada(self):
+        """100 requisições a 10/s levam ~10s após a rajada inicial"""
+        relogio = RelogioFalso()
+        bucket = TokenBucket(10, clock=relogio, sleep=relogio.sleep)
+        for _ in range(100):
+            bucket.acquire()
+        self.assertAlmostEqual(relogio.agora, 9.0, places=5)
+
+    def test_sem_limite(self):
+        """rate 0 desativa o limitador"""
+        bucket = TokenBucket(0)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(1000)))
+        self.assertEqual(bucket.acquire(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class RedisFalso:
+    """Devolve respostas fixas do script e guarda os argumentos de cada chamada."""
+
+    def __init__(self, *respostas):
+        self.respostas = list(respostas)
+        self.chamadas = []
+
+    def register_script(self, script):
+        def executar(keys, args):
+            self.chamadas.append((keys, args))
+            return self.respostas.pop(0)
+        return executar
+
+
+class TestRedisTokenBucket(unittest.TestCase):
+
+    def test_acquire_espera_o_devolvido_pelo_script(self):
+        relogio = RelogioFalso()
+        redis = RedisFalso(b'0', b'0.25')
+        bucket = RedisTokenBucket(redis, 'email', 4, sleep=relogio.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.25)
+        self.assertAlmostEqual(relogio.agora, 0.25)
+        self.assertEqual(redis.chamadas[0], (['email'], [4, 4, 1, 1]))
+
+    def test_try_acquire_sem_saldo(self):
+        bucket = RedisTokenBucket(RedisFalso(b'-1'), 'email', 4)
+        self.assertFalse(bucket.try_acquire())
+
+    def test_sem_limite_nao_consulta_o_redis(self):
+        redis = RedisFalso()
+        bucket = RedisTokenBucket(redis, 'email', 0)
+        self.assertTrue(bucket.try_acquire())
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(redis.chamadas, [])